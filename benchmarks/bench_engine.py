@@ -0,0 +1,592 @@
+"""Engine scaling benchmarks over synthetic worlds.
+
+Generates a seeded region per scale, then measures load time, memory per
+location and the throughput of the hot engine/tool paths.  Results are
+written as JSON so runs can be compared across commits::
+
+    PYTHONPATH=src python benchmarks/bench_engine.py --scales 1000,10000,100000 \\
+        --out bench_results.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import gc
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+from totm.engine import codec
+from totm.engine.generate import write_region
+from totm.engine.graph import WorldGraph
+from totm.engine.loader import stream_load
+from totm.engine.models import NPC, Character, CharacterClass, Journey, Location
+from totm.engine.store import StateEngine
+from totm.tools import schema
+from totm.tools.api import ArbiterTools
+
+
+@dataclass
+class Context:
+    """Inputs shared by every benchmark at one scale."""
+
+    scale: int
+    world_path: Path
+    workdir: Path
+    ops: int
+
+
+def _timed(fn: Callable[[], Any]) -> tuple[float, Any]:
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def _rate(count: int, seconds: float) -> float:
+    return round(count / seconds, 1) if seconds > 0 else float("inf")
+
+
+def _engine(ctx: Context) -> StateEngine:
+    engine = StateEngine(WorldGraph.load(ctx.world_path))
+    hero = Character.create("Bench", CharacterClass.WARRIOR)
+    # Strong enough to pass every generated journey; never dies
+    hero.brawn = hero.brains = hero.faith = hero.speed = 100
+    hero.hp = hero.max_hp = 10**9
+    engine.set_character(hero)
+    engine.set_location(engine.world.all_locations()[0].id)
+    return engine
+
+
+# ---------------------------------------------------------------------------
+# Benchmarks — each returns a flat dict of metrics
+# ---------------------------------------------------------------------------
+
+def bench_load(ctx: Context) -> dict[str, Any]:
+    results: dict[str, Any] = {"file_bytes": ctx.world_path.stat().st_size}
+    for name, loader in (("load", WorldGraph.load), ("stream_load", stream_load)):
+        gc.collect()
+        tracemalloc.start()
+        seconds, graph = _timed(lambda: loader(ctx.world_path))
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results[f"{name}_s"] = round(seconds, 4)
+        results[f"{name}_peak_bytes"] = peak
+        results[f"{name}_bytes_per_location"] = round(current / ctx.scale, 1)
+        del graph
+    return results
+
+
+def _traced_bytes(build: Callable[[], Any]) -> int:
+    """Bytes still allocated by *build*'s result once it returns."""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current
+
+
+def bench_memory(ctx: Context) -> dict[str, Any]:
+    text = ctx.world_path.read_text()
+    counts = json.loads(text)
+    n_npcs = sum(len(loc["npcs"]) for loc in counts["locations"])
+
+    # Each build parses the document itself so that strings and lists kept
+    # alive by the models are counted; the rest of the document is freed.
+    def locations() -> list[Location]:
+        return [Location.from_dict(d) for d in json.loads(text)["locations"]]
+
+    def npcs() -> list[NPC]:
+        return [NPC.from_dict(n) for d in json.loads(text)["locations"] for n in d["npcs"]]
+
+    def journeys() -> list[Journey]:
+        return [Journey.from_dict(d) for d in json.loads(text)["journeys"]]
+
+    results: dict[str, Any] = {}
+    for name, count, build in (
+        # Location figures include the location's own NPCs and lists
+        ("location", len(counts["locations"]), locations),
+        ("npc", n_npcs, npcs),
+        ("journey", len(counts["journeys"]), journeys),
+        # The whole graph, indexes included, per location
+        ("graph", ctx.scale, lambda: WorldGraph.load(ctx.world_path)),
+    ):
+        # Bytes each is numerically MB per million objects
+        results[f"{name}_bytes_each"] = round(_traced_bytes(build) / max(count, 1), 1)
+    return results
+
+
+def bench_exits(ctx: Context) -> dict[str, Any]:
+    graph = WorldGraph.load(ctx.world_path)
+    ids = [loc.id for loc in graph.all_locations()]
+    n = len(ids)
+    results: dict[str, Any] = {}
+    for label in ("exits_per_s", "frozen_exits_per_s"):
+        if label.startswith("frozen"):
+            graph.freeze()
+        seconds, _ = _timed(lambda: [graph.exits(ids[i % n]) for i in range(ctx.ops)])
+        results[label] = _rate(ctx.ops, seconds)
+    return results
+
+
+def bench_traverse(ctx: Context) -> dict[str, Any]:
+    engine = _engine(ctx)
+    world = engine.world
+
+    def walk() -> None:
+        for _ in range(ctx.ops):
+            engine.traverse(world.exits(engine.current_location_id)[0].id)
+
+    seconds, _ = _timed(walk)
+    return {"traverse_per_s": _rate(ctx.ops, seconds)}
+
+
+def bench_interact(ctx: Context) -> dict[str, Any]:
+    engine = _engine(ctx)
+    targets = [(loc.id, npc.id) for loc in engine.world.all_locations() for npc in loc.npcs]
+    if not targets:
+        return {"interact_per_s": None}
+
+    def talk() -> None:
+        n = len(targets)
+        for i in range(ctx.ops):
+            loc_id, npc_id = targets[i % n]
+            engine._current_location_id = loc_id
+            engine.interact(npc_id, "talk")
+
+    seconds, _ = _timed(talk)
+    return {"interact_per_s": _rate(ctx.ops, seconds)}
+
+
+def bench_tools(ctx: Context) -> dict[str, Any]:
+    tools = ArbiterTools(_engine(ctx))
+    results: dict[str, Any] = {}
+    for name, call in (("get_location", tools.get_location), ("get_exits", tools.get_exits)):
+        seconds, _ = _timed(lambda: [call() for _ in range(ctx.ops)])
+        results[f"{name}_per_s"] = _rate(ctx.ops, seconds)
+    return results
+
+
+def bench_npc_bulk(ctx: Context) -> dict[str, Any]:
+    try:
+        from totm.engine.npc_table import NPCTable
+    except ImportError:
+        return {"npc_bulk": None}
+    graph = WorldGraph.load(ctx.world_path)
+    npcs = [n for loc in graph.all_locations() for n in loc.npcs]
+
+    def loop_heal() -> None:
+        for n in npcs:
+            if not n.hostile:
+                n.hp += 1
+
+    loop_s, _ = _timed(loop_heal)
+    loop_count_s, _ = _timed(lambda: sum(1 for n in npcs if n.hostile))
+    attach_s, table = _timed(lambda: NPCTable.attach(graph))
+    table_s, _ = _timed(lambda: table.heal(1, where=~table.hostile))
+    table_count_s, _ = _timed(table.count_hostile)
+    return {
+        "npcs": len(npcs),
+        "npc_attach_s": round(attach_s, 4),
+        "npc_heal_loop_s": round(loop_s, 5),
+        "npc_heal_table_s": round(table_s, 5),
+        "npc_count_hostile_loop_s": round(loop_count_s, 5),
+        "npc_count_hostile_table_s": round(table_count_s, 5),
+    }
+
+
+def bench_save(ctx: Context) -> dict[str, Any]:
+    engine = _engine(ctx)
+    path = ctx.workdir / "save.json"
+    repeats = 3
+    seconds, _ = _timed(lambda: [engine.save(path) for _ in range(repeats)])
+    return {
+        "save_s": round(seconds / repeats, 4),
+        "save_bytes": path.stat().st_size,
+    }
+
+
+def _asdict_save(engine: StateEngine, path: Path) -> None:
+    """``StateEngine.save`` as it was before the codec: asdict + json indent=2."""
+    def location(loc: Location) -> dict[str, Any]:
+        d = dataclasses.asdict(loc)
+        d["npcs"] = [dataclasses.asdict(n) for n in loc.npcs]
+        return d
+
+    char = dataclasses.asdict(engine.character)
+    char["char_class"] = engine.character.char_class.value
+    state = {
+        "world": {
+            "region": engine.world.region,
+            "locations": [location(loc) for loc in engine.world.all_locations()],
+            "journeys": [dataclasses.asdict(j) for j in engine.world.all_journeys()],
+        },
+        "character": char,
+        "current_location_id": engine.current_location_id,
+    }
+    path.write_text(json.dumps(state, indent=2))
+
+
+def _tool_results(tools: ArbiterTools) -> dict[str, Any]:
+    """One schema object per ArbiterTools result type, rebuilt from live calls."""
+    world = tools._engine.world
+    here = tools._engine.current_location
+    npc = next((n.id for loc in world.all_locations() for n in loc.npcs), "nobody")
+    exits = tools.get_exits()
+    route = tools.plan_route(world.exits(exits["location_id"])[0].to_id)
+    return {
+        "get_location": schema.LocationInfo(**tools.get_location()),
+        "get_exits": schema.ExitsResult(
+            exits["location_id"], exits["location_name"],
+            [schema.ExitInfo(**e) for e in exits["exits"]],
+        ),
+        "plan_route": schema.RouteResult(**route | {
+            "steps": [schema.RouteStepInfo(**st) for st in route["steps"]],
+        }),
+        "get_neighborhood": schema.NeighborhoodResult(**tools.get_neighborhood()),
+        "locate": schema.LocateResult(**tools.locate(npc)),
+        "get_character": schema.CharacterInfo(**tools.get_character()),
+        "traverse": schema.TraverseToolResult(**tools.traverse(exits["exits"][0]["journey_id"])),
+        "interact": schema.InteractToolResult(
+            True, npc, npc, "talk", "brains", 0, 0, False, 5, "10/10", "Hello."),
+        "error": schema.ToolError(tool="x", message=f"Nothing at {here.id}."),
+    }
+
+
+def bench_codec(ctx: Context) -> dict[str, Any]:
+    engine = _engine(ctx)
+    path = ctx.workdir / "save.json"
+    results: dict[str, Any] = {"json_backend": codec.backend().name}
+    repeats = 3
+    for label, save in (("asdict", _asdict_save), ("codec", StateEngine.save)):
+        seconds, _ = _timed(lambda: [save(engine, path) for _ in range(repeats)])
+        results[f"save_{label}_s"] = round(seconds / repeats, 4)
+
+    for name, obj in _tool_results(ArbiterTools(engine)).items():
+        for label, encode in (
+            ("asdict", lambda: json.dumps(dataclasses.asdict(obj))),
+            ("codec", lambda: codec.dumps(obj.to_dict())),
+        ):
+            seconds, _ = _timed(lambda: [encode() for _ in range(ctx.ops)])
+            results[f"{name}_{label}_per_s"] = _rate(ctx.ops, seconds)
+    return results
+
+
+def bench_journal(ctx: Context) -> dict[str, Any]:
+    from totm.engine.journal import Journal
+
+    engine = _engine(ctx)
+    world = engine.world
+    directory = ctx.workdir / f"journal_{ctx.scale}"
+    journal = Journal.create(engine, directory, snapshot_every=10**9)
+    repeats = min(ctx.ops, 2000)
+
+    def turn_and_sync() -> None:
+        for _ in range(repeats):
+            engine.traverse(world.exits(engine.current_location_id)[0].id)
+            journal.sync()
+
+    seconds, _ = _timed(turn_and_sync)
+    snapshot_s, _ = _timed(journal.compact)
+    journal.close()
+    return {
+        "journal_turn_and_sync_ms": round(seconds / repeats * 1000, 4),
+        "journal_snapshot_s": round(snapshot_s, 4),
+    }
+
+
+def bench_incremental(ctx: Context) -> dict[str, Any]:
+    engine = _engine(ctx)
+    world = engine.world
+    path = ctx.workdir / f"incremental_{ctx.scale}.json"
+    engine.save(path)
+    turns = min(ctx.ops, 100)
+
+    def play() -> None:
+        for _ in range(turns):
+            engine.traverse(world.exits(engine.current_location_id)[0].id)
+
+    play()
+    seconds, target = _timed(lambda: engine.save_incremental(path))
+    return {
+        "incremental_turns": turns,
+        "incremental_save_s": round(seconds, 5),
+        "incremental_bytes": target.stat().st_size,
+        "full_save_bytes": path.stat().st_size,
+    }
+
+
+def bench_autosave(ctx: Context) -> dict[str, Any]:
+    """Game-thread cost of a save per turn: write-behind vs synchronous."""
+    from totm.engine.autosave import AutoSaver
+
+    engine = _engine(ctx)
+    world = engine.world
+    saver = AutoSaver(engine, ctx.workdir / f"autosave_{ctx.scale}.json", every_turns=1)
+    saver.start()
+    saver.flush()
+    turns = min(ctx.ops, 200)
+    worst = 0.0
+    total = 0.0
+    for _ in range(turns):
+        engine.traverse(world.exits(engine.current_location_id)[0].id)
+        start = time.perf_counter()
+        saver.turn()
+        took = time.perf_counter() - start
+        total += took
+        worst = max(worst, took)
+    saver.close()
+    sync_s, _ = _timed(lambda: engine.save_incremental(ctx.workdir / f"sync_{ctx.scale}.json"))
+    return {
+        "autosave_turn_ms": round(total / turns * 1000, 4),
+        "autosave_worst_turn_ms": round(worst * 1000, 4),
+        "autosave_writes": saver.saves,
+        "autosave_coalesced": saver.coalesced,
+        "sync_full_save_s": round(sync_s, 4),
+    }
+
+
+def bench_odds(ctx: Context) -> dict[str, Any]:
+    """Whole-world odds tables: one NumPy pass vs the scalar planner step."""
+    from totm.engine.analytics import class_profiles, journey_odds
+    from totm.engine.routing import RoutePlanner
+
+    world = WorldGraph.load(ctx.world_path)
+    profiles = class_profiles()
+    journeys = world.all_journeys()
+    planner = RoutePlanner(world)
+    vector_s, _ = _timed(lambda: journey_odds(world, profiles))
+    scalar_s, _ = _timed(lambda: [
+        planner._step(j, profile) for profile in profiles.values() for j in journeys
+    ])
+    return {
+        "odds_cells": len(journeys) * len(profiles),
+        "odds_vectorized_s": round(vector_s, 4),
+        "odds_scalar_s": round(scalar_s, 4),
+    }
+
+
+def bench_batch(ctx: Context) -> dict[str, Any]:
+    """Scripted walk plus talks: single calls vs one columnar batch."""
+    world = WorldGraph.load(ctx.world_path)
+    start = world.all_locations()[0].id
+    # A walk along first exits; rolls are pinned to the maximum so it never stalls
+    actions: list[tuple[str, ...]] = []
+    loc_id = start
+    while len(actions) < ctx.ops:
+        location = world.get_location(loc_id)
+        if location is not None and location.npcs:
+            actions.append(("interact", location.npcs[0].id, "talk"))
+        journey = world.exits(loc_id)[0]
+        actions.append(("traverse", journey.id))
+        loc_id = journey.to_id
+    actions = actions[:ctx.ops]
+
+    def fresh() -> StateEngine:
+        engine = StateEngine(world, rng=_MaxRoll())  # type: ignore[arg-type]
+        hero = Character.create("Bench", CharacterClass.WARRIOR)
+        hero.brawn = hero.brains = hero.faith = hero.speed = 100
+        engine.set_character(hero)
+        engine.set_location(start)
+        return engine
+
+    def single() -> None:
+        engine = fresh()
+        for action in actions:
+            if action[0] == "traverse":
+                engine.traverse(action[1])
+            else:
+                engine.interact(action[1], action[2])
+
+    single_s, _ = _timed(single)
+    engine = fresh()
+    batch_s, result = _timed(lambda: engine.apply_actions(actions))
+    return {
+        "actions_single_per_s": _rate(len(actions), single_s),
+        "actions_batch_per_s": _rate(len(actions), batch_s),
+        "batch_successes": result.successes,
+    }
+
+
+def bench_lookahead(ctx: Context) -> dict[str, Any]:
+    """Fork cost, and every exit of a location forecast inline vs on a process pool."""
+    from totm.engine.lookahead import lookahead
+
+    engine = _engine(ctx)
+    engine.character.brawn = engine.character.speed = 4
+    fork_s, _ = _timed(lambda: [engine.fork(i) for i in range(ctx.ops)])
+    candidates = [("traverse", j.id) for j in engine.world.exits(engine.current_location_id)]
+    rollouts = max(1, ctx.ops // len(candidates))
+    inline_s, _ = _timed(lambda: lookahead(engine, candidates, rollouts=rollouts, seed=0, processes=0))
+    pool_s, _ = _timed(lambda: lookahead(engine, candidates, rollouts=rollouts, seed=0))
+    return {
+        "fork_per_s": _rate(ctx.ops, fork_s),
+        "lookahead_rollouts": rollouts * len(candidates),
+        "lookahead_inline_s": round(inline_s, 4),
+        "lookahead_pool_s": round(pool_s, 4),
+    }
+
+
+def bench_undo(ctx: Context) -> dict[str, Any]:
+    """Recording cost per traverse, and rewinding 100 turns vs reloading a save."""
+    from totm.engine.undo import UndoLog
+
+    def walk(engine: StateEngine, turns: int) -> None:
+        for _ in range(turns):
+            if engine.undo_log is not None:
+                engine.undo_log.mark()
+            engine.traverse(engine.world.exits(engine.current_location_id)[0].id)
+
+    plain = _engine(ctx)
+    plain_s, _ = _timed(lambda: walk(plain, ctx.ops))
+    engine = _engine(ctx)
+    UndoLog(engine, limit=1000, spill=ctx.workdir / "undo.log")
+    logged_s, _ = _timed(lambda: walk(engine, ctx.ops))
+    rewind_s, _ = _timed(lambda: engine.rewind(100))
+    engine.save(ctx.workdir / "undo_save.json")
+    reload_s, _ = _timed(lambda: StateEngine.load(ctx.workdir / "undo_save.json"))
+    engine.undo_log.close()  # type: ignore[union-attr]
+    return {
+        "traverse_per_s": _rate(ctx.ops, plain_s),
+        "traverse_undo_per_s": _rate(ctx.ops, logged_s),
+        "rewind_100_s": round(rewind_s, 6),
+        "reload_save_s": round(reload_s, 4),
+    }
+
+
+def bench_threads(ctx: Context, threads: int = 4) -> dict[str, Any]:
+    """Traverses on *threads* independent engines: one thread vs one thread per engine."""
+    import threading
+
+    base = _engine(ctx)
+    engines = [base.fork(seed=i) for i in range(threads)]
+    per_engine = max(1, ctx.ops // threads)
+
+    def walk(engine: StateEngine) -> None:
+        for _ in range(per_engine):
+            engine.traverse(engine.world.exits(engine.current_location_id)[0].id)
+
+    def sequential() -> None:
+        for engine in engines:
+            walk(engine)
+
+    def concurrent() -> None:
+        workers = [threading.Thread(target=walk, args=(engine,)) for engine in engines]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+    sequential_s, _ = _timed(sequential)
+    concurrent_s, _ = _timed(concurrent)
+    total = per_engine * threads
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", lambda: True)
+    return {
+        "threads": threads,
+        "gil": is_gil_enabled(),
+        "sequential_per_s": _rate(total, sequential_s),
+        "threaded_per_s": _rate(total, concurrent_s),
+    }
+
+
+class _MaxRoll:
+    def randint(self, a: int, b: int) -> int:
+        return b
+
+
+BENCHMARKS: dict[str, Callable[[Context], dict[str, Any]]] = {
+    "load": bench_load,
+    "memory": bench_memory,
+    "exits": bench_exits,
+    "traverse": bench_traverse,
+    "interact": bench_interact,
+    "npc_bulk": bench_npc_bulk,
+    "tools": bench_tools,
+    "save": bench_save,
+    "codec": bench_codec,
+    "journal": bench_journal,
+    "incremental": bench_incremental,
+    "autosave": bench_autosave,
+    "odds": bench_odds,
+    "batch": bench_batch,
+    "lookahead": bench_lookahead,
+    "undo": bench_undo,
+    "threads": bench_threads,
+}
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+            cwd=Path(__file__).resolve().parent,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def run(scales: list[int], *, names: list[str], ops: int, seed: int) -> dict[str, Any]:
+    report: dict[str, Any] = {
+        "meta": {
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "seed": seed,
+            "ops": ops,
+        },
+        "results": [],
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        for scale in scales:
+            world_path = write_region(workdir / f"region_{scale}.json", scale, seed=seed)
+            ctx = Context(scale=scale, world_path=world_path, workdir=workdir, ops=ops)
+            row: dict[str, Any] = {"scale": scale}
+            for name in names:
+                print(f"[{scale:>8}] {name}...", file=sys.stderr)
+                row.update(BENCHMARKS[name](ctx))
+            report["results"].append(row)
+    return report
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the TOTM engine on synthetic worlds.")
+    parser.add_argument("--scales", default="1000,10000", help="Comma-separated location counts")
+    parser.add_argument("--bench", default=",".join(BENCHMARKS), help="Comma-separated benchmark names")
+    parser.add_argument("--ops", type=int, default=20000, help="Operations per throughput benchmark")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", type=Path, help="Write JSON results here (default: stdout)")
+    args = parser.parse_args(argv)
+
+    names = [n.strip() for n in args.bench.split(",") if n.strip()]
+    unknown = [n for n in names if n not in BENCHMARKS]
+    if unknown:
+        parser.error(f"Unknown benchmark(s): {', '.join(unknown)}")
+    scales = [int(float(s)) for s in args.scales.split(",")]
+
+    report = run(scales, names=names, ops=args.ops, seed=args.seed)
+    text = json.dumps(report, indent=2)
+    if args.out:
+        args.out.write_text(text)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
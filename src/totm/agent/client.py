@@ -6,7 +6,9 @@ from typing import Any, Callable
 import litellm
 
 from totm.agent.config import ConfigLoader, AgentConfig
+from totm.engine import codec
 from totm.tools.api import ArbiterTools
+from totm.tools.replay import SessionRecorder
 
 # Logging setup
 logger = logging.getLogger(__name__)
@@ -18,7 +20,13 @@ class GMAgent:
     User Input -> LLM -> Tool Calls -> Tool Execution -> LLM -> Response.
     """
 
-    def __init__(self, tools: ArbiterTools, agent_name: str = "gm_agent") -> None:
+    def __init__(
+        self,
+        tools: ArbiterTools,
+        agent_name: str = "gm_agent",
+        recorder: SessionRecorder | None = None,
+    ) -> None:
+        """*recorder*, if given, records every tool call for offline replay."""
         self.tools = tools
         self.config = ConfigLoader().get_agent_config(agent_name)
         self.history: list[dict[str, Any]] = []
@@ -32,6 +40,8 @@ class GMAgent:
         # Prepare tool definitions for LiteLLM
         self.tool_definitions = self._generate_tool_definitions()
         self.tool_map = self._generate_tool_map()
+        if recorder is not None:
+            self.tool_map = recorder.wrap(self.tool_map)
 
     def send(self, user_input: str) -> str:
         """Send a message to the agent and get the final response."""
@@ -66,7 +76,7 @@ class GMAgent:
                         "role": "tool",
                         "tool_call_id": tool_call.id,
                         "name": function_name,
-                        "content": json.dumps(result)
+                        "content": codec.dumps_str(result)
                     })
                 # Loop again to let LLM see results and continue
             else:
@@ -96,8 +106,12 @@ class GMAgent:
         return {
             "get_location": self.tools.get_location,
             "get_exits": self.tools.get_exits,
+            "plan_route": self.tools.plan_route,
+            "locate": self.tools.locate,
+            "get_neighborhood": self.tools.get_neighborhood,
             "traverse": self.tools.traverse,
             "interact": self.tools.interact,
+            "rewind": self.tools.rewind,
             "get_character": self.tools.get_character,
             "update_character": self.tools.update_character,
         }
@@ -117,10 +131,51 @@ class GMAgent:
                 "type": "function",
                 "function": {
                     "name": "get_exits",
-                    "description": "Get a list of available paths/exits from the current location.",
+                    "description": "Get a list of available paths/exits from the current location, with the character's success chance and expected damage per attempt.",
                     "parameters": {"type": "object", "properties": {}}
                 }
             },
+            {
+                "type": "function",
+                "function": {
+                    "name": "plan_route",
+                    "description": "Plan the safest path from the current location to a destination location, with per-step success odds.",
+                    "parameters": {
+                        "type": "object",
+                        "properties": {
+                            "destination_id": {"type": "string", "description": "The ID of the destination location."}
+                        },
+                        "required": ["destination_id"]
+                    }
+                }
+            },
+            {
+                "type": "function",
+                "function": {
+                    "name": "locate",
+                    "description": "Find which location(s) hold an NPC or item anywhere in the world.",
+                    "parameters": {
+                        "type": "object",
+                        "properties": {
+                            "target_id": {"type": "string", "description": "ID of the NPC or item to find."}
+                        },
+                        "required": ["target_id"]
+                    }
+                }
+            },
+            {
+                "type": "function",
+                "function": {
+                    "name": "get_neighborhood",
+                    "description": "Get every location, path and NPC within k moves of the current location in one call.",
+                    "parameters": {
+                        "type": "object",
+                        "properties": {
+                            "k": {"type": "integer", "description": "How many moves out to look (0-3, default 2)."}
+                        }
+                    }
+                }
+            },
             {
                 "type": "function",
                 "function": {
@@ -150,6 +205,19 @@ class GMAgent:
                     }
                 }
             },
+            {
+                "type": "function",
+                "function": {
+                    "name": "rewind",
+                    "description": "Retcon: take back the last turns (moves, fights) when the player or a moderator asks.",
+                    "parameters": {
+                        "type": "object",
+                        "properties": {
+                            "turns": {"type": "integer", "description": "How many turns to take back (default 1)."}
+                        }
+                    }
+                }
+            },
             {
                 "type": "function",
                 "function": {
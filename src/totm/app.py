@@ -6,7 +6,9 @@ from pathlib import Path
 # Add src to path if running directly
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from totm.engine.autosave import AutoSaver
 from totm.engine.store import StateEngine
+from totm.engine.undo import UndoLog
 from totm.engine.graph import WorldGraph
 from totm.tools.api import ArbiterTools
 from totm.ui.console import Console
@@ -19,6 +21,7 @@ def main() -> None:
     # Start with an empty engine; New Game / Load Game will populate it.
     world = WorldGraph(region="Empty") 
     engine = StateEngine(world)
+    UndoLog(engine, limit=2000)
     tools = ArbiterTools(engine)
     
     # Initialize Agent (if configured in agents.json/env)
@@ -30,7 +33,8 @@ def main() -> None:
         agent = None
     
     # Launch UI
-    console = Console(engine, tools, agent)
+    autosaver = AutoSaver(engine, Path("save.json"), every_turns=5)
+    console = Console(engine, tools, agent, autosaver)
     console.run()
 
 
@@ -0,0 +1,210 @@
+"""Exact traverse odds for every journey of a world, vectorized with NumPy.
+
+``StateEngine.traverse`` rolls ``randint(1, stat)`` and succeeds when the
+roll reaches the journey's difficulty; a miss deals ``difficulty - roll``
+damage.  The odds are therefore closed-form (see
+:func:`~totm.engine.store.success_probability` and
+:func:`~totm.engine.store.expected_damage`).  :func:`journey_odds`
+evaluates them for every journey × stat block of a world in one array
+pass — by default one stat block per class in ``_CLASS_DEFAULTS`` — for
+balancing::
+
+    python -m totm.engine.analytics src/totm/engine/worlds/well.json
+    python -m totm.engine.analytics world.json --stats 6,6,6,6 --top 20
+
+NumPy is optional; :func:`journey_odds` raises ``ImportError`` without it.
+The per-exit hint the GM sees in ``get_exits`` uses the scalar formulas and
+needs no NumPy.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from totm.engine.models import _CLASS_DEFAULTS
+from totm.engine.risks import STAT_NAMES
+from totm.engine.routing import StatProfile
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None  # type: ignore[assignment]
+
+if TYPE_CHECKING:
+    from totm.engine.graph import WorldGraph
+
+# Stat index for journeys whose risks name no stat: use the primary stat
+PRIMARY = -1
+
+
+def class_profiles() -> dict[str, StatProfile]:
+    """The default stat block of every character class, keyed by class name."""
+    return {
+        cls.value: tuple(stats[name] for name in STAT_NAMES)  # type: ignore[misc]
+        for cls, stats in _CLASS_DEFAULTS.items()
+    }
+
+
+def odds(stat_value: Any, difficulty: Any) -> tuple[Any, Any, Any]:
+    """Success probability, expected damage and maximum damage of one attempt.
+
+    Array version of ``success_probability`` / ``expected_damage``;
+    arguments broadcast against each other.
+    """
+    stat_value = np.asarray(stat_value, dtype=np.int64)
+    difficulty = np.asarray(difficulty, dtype=np.int64)
+    sides = np.maximum(stat_value, 1)
+    passing = sides - np.maximum(difficulty, 1) + 1
+    success = np.clip(passing / sides, 0.0, 1.0)
+    failing = np.minimum(difficulty - 1, sides)  # rolls 1..failing miss
+    hit = failing > 0
+    expected = np.where(hit, (failing * difficulty - failing * (failing + 1) // 2) / sides, 0.0)
+    # The worst miss is a roll of 1
+    worst = np.where(hit, difficulty - 1, 0)
+    return success, expected, worst
+
+
+@dataclass
+class OddsTable:
+    """Per-attempt odds for each journey (rows) and stat block (columns)."""
+
+    journey_ids: list[str]
+    labels: list[str]
+    difficulty: Any
+    # Index into STAT_NAMES of the stat each attempt rolls
+    stat: Any
+    stat_value: Any
+    success: Any
+    expected_damage: Any
+    max_damage: Any
+
+    def lookup(self, journey_id: str, label: str) -> dict[str, Any]:
+        """The odds of *journey_id* for the stat block *label*."""
+        if label not in self.labels:
+            raise ValueError(f"No stat block '{label}'. Valid: {', '.join(self.labels)}.")
+        try:
+            i = self.journey_ids.index(journey_id)
+        except ValueError:
+            raise ValueError(f"Journey '{journey_id}' not in table") from None
+        return self._entry(i, self.labels.index(label))
+
+    def _entry(self, i: int, j: int) -> dict[str, Any]:
+        return {
+            "journey_id": self.journey_ids[i],
+            "difficulty": int(self.difficulty[i]),
+            "stat_used": STAT_NAMES[self.stat[i, j]],
+            "stat_value": int(self.stat_value[i, j]),
+            "success_chance": float(self.success[i, j]),
+            "expected_damage": float(self.expected_damage[i, j]),
+            "max_damage": int(self.max_damage[i, j]),
+        }
+
+    def summary(self, top: int = 5) -> list[dict[str, Any]]:
+        """Per stat block: mean odds, impassable journeys and the hardest ones."""
+        rows = []
+        for j, label in enumerate(self.labels):
+            success = self.success[:, j]
+            hardest = np.argsort(success, kind="stable")[:top]
+            rows.append({
+                "label": label,
+                "journeys": len(self.journey_ids),
+                "mean_success": float(success.mean()) if len(success) else 0.0,
+                "impassable": int((success == 0.0).sum()),
+                "mean_expected_damage": float(self.expected_damage[:, j].mean()) if len(success) else 0.0,
+                "max_damage": int(self.max_damage[:, j].max()) if len(success) else 0,
+                "hardest": [self._entry(int(i), j) for i in hardest],
+            })
+        return rows
+
+
+def journey_odds(world: WorldGraph, profiles: dict[str, StatProfile] | None = None) -> OddsTable:
+    """Odds of every journey of *world* for each stat block (default: every class).
+
+    Picks the stat exactly as ``StateEngine`` does — the one the world
+    resolved for the journey's risks, else the first highest stat — and
+    evaluates the odds in one array pass.
+    """
+    if np is None:
+        raise ImportError("journey_odds requires numpy (pip install numpy)")
+    if profiles is None:
+        profiles = class_profiles()
+    labels = list(profiles)
+    blocks = np.array([profiles[label] for label in labels], dtype=np.int64).reshape(len(labels), 4)
+
+    journeys = world.all_journeys()
+    stat_index = {name: i for i, name in enumerate(STAT_NAMES)}
+    stat_index[None] = PRIMARY  # type: ignore[index]
+    risk_stat = np.fromiter(
+        (stat_index[world.journey_stat(j)] for j in journeys), dtype=np.int8, count=len(journeys),
+    )
+    difficulty = np.fromiter((j.difficulty for j in journeys), dtype=np.int64, count=len(journeys))
+
+    primary = blocks.argmax(axis=1)  # first highest wins ties, like primary_stat
+    stat = np.where(risk_stat[:, None] == PRIMARY, primary[None, :], risk_stat[:, None])
+    stat_value = blocks[np.arange(len(labels))[None, :], stat]
+    success, expected, worst = odds(stat_value, difficulty[:, None])
+    return OddsTable(
+        journey_ids=[j.id for j in journeys],
+        labels=labels,
+        difficulty=difficulty,
+        stat=stat,
+        stat_value=stat_value,
+        success=success,
+        expected_damage=expected,
+        max_damage=worst,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Balancing report CLI
+# ---------------------------------------------------------------------------
+
+def _parse_stats(text: str) -> StatProfile:
+    values = tuple(int(v) for v in text.split(","))
+    if len(values) != 4:
+        raise argparse.ArgumentTypeError("--stats takes brawn,brains,faith,speed")
+    return values  # type: ignore[return-value]
+
+
+def main(argv: list[str] | None = None) -> None:
+    from totm.engine import codec
+    from totm.engine.binary import open_world
+    from totm.engine.graph import WorldGraph
+
+    parser = argparse.ArgumentParser(description="Traverse odds for every journey of a world.")
+    parser.add_argument("world", type=Path, help="World file (.json or .totm)")
+    parser.add_argument("--stats", type=_parse_stats, action="append", default=[],
+                        help="Extra stat block brawn,brains,faith,speed (repeatable)")
+    parser.add_argument("--top", type=int, default=5, help="Hardest journeys listed per stat block")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args(argv)
+
+    profiles = class_profiles()
+    for block in args.stats:
+        profiles[",".join(map(str, block))] = block
+    world = open_world(args.world) if args.world.suffix == ".totm" else WorldGraph.load(args.world)
+    report = journey_odds(world, profiles).summary(args.top)  # type: ignore[arg-type]
+
+    if args.json:
+        sys.stdout.write(codec.dumps_str(report, pretty=True) + "\n")
+        return
+    for row in report:
+        print(
+            f"{row['label']:>12}: {row['journeys']} journeys, "
+            f"mean success {row['mean_success']:.1%}, "
+            f"{row['impassable']} impassable, "
+            f"mean damage {row['mean_expected_damage']:.2f}, max {row['max_damage']}"
+        )
+        for hard in row["hardest"]:
+            print(
+                f"{'':>14}{hard['journey_id']}: {hard['success_chance']:.1%} on "
+                f"{hard['stat_used']} {hard['stat_value']} vs {hard['difficulty']}"
+            )
+
+
+if __name__ == "__main__":
+    main()
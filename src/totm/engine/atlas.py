@@ -0,0 +1,260 @@
+"""WorldAtlas — many region files, loaded lazily and evicted when cold.
+
+Each region file is an ordinary ``WorldGraph`` document.  It may also carry a
+top-level ``portals`` array: Journeys whose ``to_id`` names a location in the
+region given by ``to_region``.  A region's graph is only read from disk when a
+character first enters it, and unoccupied regions are evicted least recently
+used first once the configured memory budget is exceeded.
+
+The atlas may be shared by engines on several threads.  Engines in the same
+region share its graph, so they should share a lock as well (the *lock*
+argument of :class:`StateEngine`).
+"""
+
+from __future__ import annotations
+
+import threading
+import weakref
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+from totm.engine.graph import WorldGraph
+from totm.engine.loader import read_region, stream_load
+from totm.engine.models import Journey
+from totm.engine.store import StateEngine, TraverseResult
+
+
+@dataclass
+class Portal:
+    """A Journey leading out of its region into ``to_region``."""
+
+    journey: Journey
+    to_region: str
+
+    def to_dict(self) -> dict[str, Any]:
+        d = self.journey.to_dict()
+        d["to_region"] = self.to_region
+        return d
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Portal:
+        data = dict(data)
+        to_region = data.pop("to_region")
+        return cls(journey=Journey.from_dict(data), to_region=to_region)
+
+
+@dataclass
+class _LoadedRegion:
+    graph: WorldGraph
+    portals: dict[str, Portal]
+    cost: int
+
+
+class WorldAtlas:
+    """Index of region files with lazy loading and LRU eviction.
+
+    *memory_budget* is in bytes and is compared against the on-disk size of
+    the loaded regions, a cheap proxy for their in-memory footprint.
+    Regions currently occupied by a character are never evicted; a
+    character occupies its region until its engine moves on or
+    :meth:`leave` is called for it.  Evicted regions are simply dropped —
+    pass *on_evict* to persist their state.
+    """
+
+    def __init__(
+        self,
+        regions: dict[str, Path],
+        *,
+        memory_budget: int | None = None,
+        on_evict: Callable[[str, WorldGraph], None] | None = None,
+    ) -> None:
+        self._paths = dict(regions)
+        self.memory_budget = memory_budget
+        self._on_evict = on_evict
+        self._loaded: OrderedDict[str, _LoadedRegion] = OrderedDict()
+        self._occupancy: Counter[str] = Counter()
+        # Region each engine entered and hasn't left
+        self._occupants: weakref.WeakKeyDictionary[StateEngine, str] = weakref.WeakKeyDictionary()
+        # Guards _loaded, _occupancy and _occupants; taken after an engine's lock, never before
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_directory(cls, directory: Path, **kwargs: Any) -> WorldAtlas:
+        """Index every ``*.json`` region file in *directory* by region name.
+
+        Each file is read only up to its ``region`` key, stepping over
+        earlier values without decoding them (see :func:`read_region`).
+        """
+        regions: dict[str, Path] = {}
+        for path in sorted(directory.glob("*.json")):
+            name = read_region(path)
+            if name is None:
+                raise ValueError(f"Region file '{path}' has no 'region' key")
+            if name in regions:
+                raise ValueError(f"Region '{name}' defined in both '{regions[name]}' and '{path}'")
+            regions[name] = path
+        return cls(regions, **kwargs)
+
+    # -- Queries ---------------------------------------------------------
+
+    def regions(self) -> list[str]:
+        return list(self._paths)
+
+    def loaded_regions(self) -> list[str]:
+        """Loaded region names, least recently used first."""
+        with self._lock:
+            return list(self._loaded)
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._loaded
+
+    @property
+    def memory_used(self) -> int:
+        with self._lock:
+            return sum(r.cost for r in self._loaded.values())
+
+    def region(self, name: str) -> WorldGraph:
+        """Return the graph for *name*, loading it from disk if needed."""
+        with self._lock:
+            return self._get(name).graph
+
+    def portals(self, name: str, location_id: str | None = None) -> list[Portal]:
+        """Return the portals of region *name*, optionally only those leaving *location_id*."""
+        with self._lock:
+            portals = self._get(name).portals.values()
+        if location_id is None:
+            return list(portals)
+        return [p for p in portals if p.journey.from_id == location_id]
+
+    # -- Movement --------------------------------------------------------
+
+    def enter(self, engine: StateEngine, region: str, location_id: str) -> None:
+        """Place *engine*'s character at *location_id* in *region*.
+
+        Raises ``ValueError`` for an unknown region or location, leaving the
+        engine where it was.
+        """
+        with engine.lock, self._lock:
+            graph = self._get(region).graph
+            if graph.get_location(location_id) is None:
+                raise ValueError(f"Location '{location_id}' not in region '{region}'")
+            previous_world = engine.world
+            engine.world = graph
+            try:
+                engine.set_location(location_id)
+            except BaseException:
+                engine.world = previous_world
+                raise
+            if graph is not previous_world:
+                self._forget_history(engine)
+            self._move(engine, region)
+
+    def cross(self, engine: StateEngine, journey_id: str) -> TraverseResult:
+        """Attempt a portal journey out of the engine's current region.
+
+        The stat check is the ordinary traverse rule.  The destination region
+        is loaded and checked before the roll, so a crossing either moves the
+        character, world and occupancy together or changes none of them.
+        """
+        with engine.lock, self._lock:
+            current = self._region_of(engine.world)
+            portal = self._get(current).portals.get(journey_id) if current else None
+            if portal is None:
+                return TraverseResult(
+                    success=False,
+                    journey_id=journey_id,
+                    from_id="",
+                    to_id="",
+                    message=f"Portal '{journey_id}' does not exist.",
+                )
+            graph = self._get(portal.to_region).graph
+            if graph.get_location(portal.journey.to_id) is None:
+                raise ValueError(
+                    f"Portal '{journey_id}' leads to unknown location "
+                    f"'{portal.journey.to_id}' in region '{portal.to_region}'"
+                )
+            # Adjudicated against the region being left (its risk stats apply)
+            result = engine._traverse(portal.journey)
+            if result.success:
+                engine.world = graph
+                self._forget_history(engine)
+                self._move(engine, portal.to_region)
+            return result
+
+    def leave(self, engine: StateEngine) -> None:
+        """Take *engine*'s character out of the atlas (session ended, world replaced).
+
+        Its region no longer counts as occupied by it and may be evicted.
+        Engines that aren't in the atlas are ignored.
+        """
+        with engine.lock, self._lock:
+            region = self._occupants.pop(engine, None)
+            if region is not None:
+                self._vacate(region)
+                self._evict()
+
+    # -- Internals -------------------------------------------------------
+
+    def _region_of(self, graph: WorldGraph) -> str | None:
+        loaded = self._loaded.get(graph.region)
+        return graph.region if loaded is not None and loaded.graph is graph else None
+
+    @staticmethod
+    def _forget_history(engine: StateEngine) -> None:
+        # Undo entries name locations of the region left behind
+        if engine.undo_log is not None:
+            engine.undo_log.clear()
+
+    def _move(self, engine: StateEngine, region: str) -> None:
+        previous = self._occupants.get(engine)
+        self._occupants[engine] = region
+        self._occupancy[region] += 1
+        if previous is not None:
+            self._vacate(previous)
+        self._evict()
+
+    def _vacate(self, region: str) -> None:
+        self._occupancy[region] -= 1
+        if self._occupancy[region] <= 0:
+            del self._occupancy[region]
+
+    def _get(self, name: str) -> _LoadedRegion:
+        loaded = self._loaded.get(name)
+        if loaded is not None:
+            self._loaded.move_to_end(name)
+            return loaded
+        path = self._paths.get(name)
+        if path is None:
+            raise ValueError(f"Region '{name}' not in atlas")
+
+        extras: dict[str, Any] = {}
+        graph = stream_load(path, extras=extras)
+        portals = {}
+        for data in extras.get("portals", []):
+            portal = Portal.from_dict(data)
+            if graph.get_location(portal.journey.from_id) is None:
+                raise ValueError(
+                    f"Portal '{portal.journey.id}' leaves unknown location "
+                    f"'{portal.journey.from_id}'"
+                )
+            portals[portal.journey.id] = portal
+        loaded = _LoadedRegion(graph=graph, portals=portals, cost=path.stat().st_size)
+        self._loaded[name] = loaded
+        self._evict(keep=name)
+        return loaded
+
+    def _evict(self, keep: str | None = None) -> None:
+        if self.memory_budget is None:
+            return
+        used = self.memory_used
+        for name in list(self._loaded):
+            if used <= self.memory_budget:
+                break
+            if name == keep or self._occupancy[name] > 0:
+                continue
+            region = self._loaded.pop(name)
+            used -= region.cost
+            if self._on_evict is not None:
+                self._on_evict(name, region.graph)
@@ -0,0 +1,192 @@
+"""AutoSaver — write-behind saves that keep disk I/O off the game thread.
+
+The game thread only captures a :class:`Snapshot` of what changed, which
+costs time proportional to the change rather than the world.  A background
+thread serializes it, writes it to a temp file, fsyncs and renames it into
+place (see :class:`SaveChain`), and every *max_patches* patches folds the
+chain into a new base from the files on disk.
+
+Saves requested while the writer is still busy are coalesced: changes keep
+accumulating in the engine and one capture covers all of them.  The writer
+takes that capture itself as soon as it is free, so the last request is
+saved even if no further turn comes; with *interval* it also saves
+uncaptured turns on a timer.  Captures happen under the engine's lock —
+in :meth:`turn`, :meth:`request` or :meth:`flush` on the game thread, or
+on the writer between writes — and only the writer touches the disk::
+
+    saver = AutoSaver(engine, Path("save.json"), every_turns=5)
+    saver.start()
+    ...
+    saver.turn()      # after each player action
+    ...
+    saver.close()     # on quit: waits for the last save
+
+Don't mix an AutoSaver with ``StateEngine.save`` / ``save_incremental`` on
+the same engine — each capture is counted as saved, so the other writer's
+patch chain would miss it.
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from pathlib import Path
+
+from totm.engine.store import MAX_PATCHES, SaveChain, Snapshot, StateEngine
+
+
+class AutoSaver:
+    """Background saves of *engine* to *path* every *every_turns* turns and/or *interval* seconds."""
+
+    def __init__(
+        self,
+        engine: StateEngine,
+        path: Path,
+        *,
+        every_turns: int | None = 1,
+        interval: float | None = None,
+        max_patches: int = MAX_PATCHES,
+    ) -> None:
+        if every_turns is not None and every_turns < 1:
+            raise ValueError("every_turns must be at least 1")
+        if interval is not None and interval <= 0:
+            raise ValueError("interval must be positive")
+        self.engine = engine
+        self.path = path
+        self.every_turns = every_turns
+        self.interval = interval
+        self.max_patches = max_patches
+        self.saves = 0
+        self.coalesced = 0
+        # Set by the writer thread when a write fails; raised by flush()
+        self.error: BaseException | None = None
+
+        self._chain = SaveChain(path)
+        self._queue: queue.SimpleQueue[Snapshot | None] = queue.SimpleQueue()
+        self._idle = threading.Event()
+        self._idle.set()
+        self._pending = False
+        self._full = False
+        # Set by the writer after a failed write: the chain may be missing changes
+        self._rebase = False
+        self._turns = 0
+        self._last = time.monotonic()
+        self._thread: threading.Thread | None = None
+
+    # -- Game thread -----------------------------------------------------
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self) -> None:
+        """Start the writer thread and queue a full base save."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="totm-autosave", daemon=True)
+        self._thread.start()
+        self.request(full=True)
+
+    def turn(self) -> None:
+        """Count one player turn; saves when the turn count or interval is due."""
+        with self.engine.lock:
+            self._turns += 1
+            due = (self.every_turns is not None and self._turns >= self.every_turns) or (
+                self.interval is not None and time.monotonic() - self._last >= self.interval
+            )
+            if due:
+                self.request()
+            else:
+                self._capture()
+
+    def request(self, full: bool = False) -> None:
+        """Ask for a save now; never blocks on the disk."""
+        with self.engine.lock:
+            if self._pending:
+                self.coalesced += 1
+            self._pending = True
+            self._full |= full
+            self._capture()
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Wait until every requested save is on disk; False if *timeout* ran out.
+
+        Re-raises the first error the writer hit since the last flush.
+        """
+        done = self._idle.wait(timeout)
+        while done:
+            with self.engine.lock:
+                if not self._pending and self._idle.is_set():
+                    break
+                self._capture()
+            done = self._idle.wait(timeout)
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+        return done
+
+    def close(self, timeout: float | None = None) -> None:
+        """Flush and stop the writer thread."""
+        if self._thread is None:
+            return
+        try:
+            self.flush(timeout)
+        finally:
+            self._queue.put(None)
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _capture(self) -> None:
+        """Hand a snapshot to the writer if one is pending and the writer is free.
+
+        Called with the engine's lock held, which also guards the fields here.
+        """
+        if not self._pending or not self._idle.is_set() or self._thread is None:
+            return
+        snapshot = self.engine.snapshot(full=self._full or self._rebase)
+        self._pending = self._full = self._rebase = False
+        self._turns = 0
+        self._last = time.monotonic()
+        self._idle.clear()
+        self._queue.put(snapshot)
+
+    # -- Writer thread ---------------------------------------------------
+
+    def _run(self) -> None:
+        while True:
+            try:
+                snapshot = self._queue.get(timeout=self._until_due())
+            except queue.Empty:
+                # The interval ran out with turns played since the last capture
+                with self.engine.lock:
+                    if self._turns:
+                        self._pending = True
+                        self._capture()
+                    else:
+                        self._last = time.monotonic()
+                continue
+            if snapshot is None:
+                return
+            try:
+                self._chain.write(snapshot)
+                if self._chain.patches >= self.max_patches:
+                    self._chain.fold()
+                self.saves += 1
+            except Exception as exc:
+                if self.error is None:
+                    self.error = exc
+                self._rebase = True
+            finally:
+                # Set before taking the engine's lock, so a flush() holding it
+                # can capture instead of waiting for us
+                self._idle.set()
+            # Don't leave a save requested during the write for the next turn
+            with self.engine.lock:
+                self._capture()
+
+    def _until_due(self) -> float | None:
+        """Seconds until the interval save is due, or None without an interval."""
+        if self.interval is None:
+            return None
+        return max(self.interval - (time.monotonic() - self._last), 0.0)
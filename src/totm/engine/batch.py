@@ -0,0 +1,158 @@
+"""Batch adjudication — many actions per call, results as columns.
+
+Bots, NPC-driven agents and load generators issue actions by the hundred
+thousand; building a :class:`TraverseResult` with its message string for
+each one costs more than the adjudication itself.  The batch API skips
+that: an action is a plain tuple::
+
+    ("traverse", journey_id)
+    ("interact", npc_id, "attack" | "talk")
+
+and a batch comes back as a :class:`BatchResult` — one typed array per
+field, one row per action, in input order::
+
+    result = engine.apply_actions([("traverse", "j_gate"), ("interact", "npc_rat", "attack")])
+    result.outcome[0] == Outcome.SUCCESS
+
+Rules, rolls, ``roll_log`` and the journal are exactly those of
+``StateEngine.traverse`` / ``interact`` — a batch is the same sequence of
+single calls without the result objects.  :func:`apply_actions` runs one
+pass over actions addressed to many engines; ``SessionManager.apply_actions``
+does the same by session id.
+"""
+
+from __future__ import annotations
+
+from array import array
+from enum import IntEnum
+from typing import TYPE_CHECKING, Any, Iterable, Union
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None  # type: ignore[assignment]
+
+if TYPE_CHECKING:
+    from totm.engine.store import StateEngine
+
+Action = Union[tuple[str, str], tuple[str, str, str]]
+# One action's (kind, outcome, roll, damage, hp, npc_hp)
+Row = tuple[int, int, int, int, int, int]
+
+# Values of the ``kind`` column
+TRAVERSE = 0
+INTERACT = 1
+
+
+class Outcome(IntEnum):
+    """What became of one action; the ``outcome`` column holds these."""
+
+    SUCCESS = 0
+    # The check was rolled and missed (traverse only)
+    FAILED = 1
+    NO_CHARACTER = 2
+    WRONG_ORIGIN = 3
+    UNKNOWN_JOURNEY = 4
+    NO_LOCATION = 5
+    UNKNOWN_NPC = 6
+    UNKNOWN_ACTION = 7
+
+
+class BatchResult:
+    """Outcomes of a batch of actions, stored column-wise.
+
+    ``roll`` is the traverse roll, or the attack roll (= damage dealt);
+    ``damage`` is what the character took; ``hp`` and ``npc_hp`` are the
+    character's and the attacked NPC's hit points afterwards, ``-1`` where
+    they don't apply.  ``session`` indexes :attr:`sessions`, the engines
+    or session ids the batch addressed, in order of first appearance.
+    """
+
+    __slots__ = ("kind", "outcome", "roll", "damage", "hp", "npc_hp", "session", "sessions")
+
+    COLUMNS = ("kind", "outcome", "roll", "damage", "hp", "npc_hp", "session")
+
+    def __init__(self) -> None:
+        self.kind = array("b")
+        self.outcome = array("b")
+        self.roll = array("I")
+        self.damage = array("i")
+        self.hp = array("i")
+        self.npc_hp = array("i")
+        self.session = array("I")
+        self.sessions: list[Any] = []
+
+    @classmethod
+    def from_rows(
+        cls, rows: list[Row], sessions: list[Any], session: list[int] | None = None,
+    ) -> BatchResult:
+        """Columns from *rows*; *session* defaults to all rows addressing ``sessions[0]``."""
+        result = cls()
+        result.sessions = sessions
+        if rows:
+            for name, values in zip(cls.COLUMNS, zip(*rows)):
+                getattr(result, name).extend(values)
+        if session is None:
+            result.session = array("I", [0]) * len(rows)
+        else:
+            result.session.extend(session)
+        return result
+
+    def __len__(self) -> int:
+        return len(self.kind)
+
+    @property
+    def successes(self) -> int:
+        return self.outcome.count(Outcome.SUCCESS)
+
+    def counts(self) -> dict[str, int]:
+        """Number of rows per outcome, for the outcomes that occurred."""
+        return {o.name.lower(): n for o in Outcome if (n := self.outcome.count(o))}
+
+    def row(self, i: int) -> dict[str, Any]:
+        """Row *i* as a dict, for debugging and tests."""
+        return {
+            "kind": "traverse" if self.kind[i] == TRAVERSE else "interact",
+            "outcome": Outcome(self.outcome[i]).name.lower(),
+            "roll": self.roll[i],
+            "damage": self.damage[i],
+            "hp": self.hp[i],
+            "npc_hp": self.npc_hp[i],
+            "session": self.session[i],
+        }
+
+    def to_dict(self) -> dict[str, list[int]]:
+        return {name: getattr(self, name).tolist() for name in self.COLUMNS}
+
+    def to_numpy(self) -> dict[str, Any]:
+        """The columns as NumPy arrays sharing this result's memory.
+
+        The result can't grow while the arrays are alive.
+        """
+        if np is None:
+            raise ImportError("BatchResult.to_numpy requires numpy (pip install numpy)")
+        columns = {}
+        for name in self.COLUMNS:
+            column = getattr(self, name)
+            columns[name] = np.frombuffer(column, dtype=column.typecode)
+        return columns
+
+
+def apply_actions(actions: Iterable[tuple[StateEngine, Action]]) -> BatchResult:
+    """Run ``(engine, action)`` pairs in one pass; rows come back in input order.
+
+    Actions for different engines may interleave freely; each engine sees
+    its own actions in order.
+    """
+    engines: list[StateEngine] = []
+    index: dict[int, int] = {}
+    rows: list[Row] = []
+    session: list[int] = []
+    for engine, action in actions:
+        i = index.get(id(engine))
+        if i is None:
+            i = index[id(engine)] = len(engines)
+            engines.append(engine)
+        rows.append(engine._adjudicate_locked(action))
+        session.append(i)
+    return BatchResult.from_rows(rows, engines, session)
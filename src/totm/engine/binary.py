@@ -0,0 +1,387 @@
+"""Compiled binary world format, readable in place through ``mmap``.
+
+Layout (little-endian, every section 8-byte aligned)::
+
+    header        magic, version, counts, region string, section offsets
+    str_offsets   u64[n_strings + 1]   byte ranges into str_blob
+    str_blob      UTF-8 text, every distinct string stored once
+    locations     (id, name, description, gm_guide,
+                   npc_start, npc_count, item_start, item_count)  u32 each
+    npcs          (id, name, description) u32, hp i32, hostile u8
+    items         u32 string index per inventory entry
+    journeys      (id, from, to, direction, duration) u32, difficulty i32,
+                  (risk_start, risk_count, description) u32
+    risks         u32 string index per risk entry
+    out_offsets   u32[n_locations + 1]  CSR of outgoing journey indices
+    out_targets   u32[n_journeys]
+    in_offsets    u32[n_locations + 1]  CSR of incoming journey indices
+    in_targets    u32[n_journeys]
+    loc_sorted    u32[n_locations]     location indices ordered by id bytes
+    journey_sorted u32[n_journeys]     journey indices ordered by id bytes
+
+Nothing is decoded when a file is opened; :class:`MappedWorld` builds
+``Location`` and ``Journey`` objects on demand from the mapped pages, so many
+processes can share one page-cached copy of a large world.
+"""
+
+from __future__ import annotations
+
+import mmap
+import struct
+from pathlib import Path
+from typing import Any, Iterator
+
+from totm.engine.graph import WorldGraph, risk_keywords
+from totm.engine.models import Journey, Location, NPC
+from totm.engine.risks import DEFAULT_MATCHER, DEFAULT_RISK_STATS
+
+MAGIC = b"TOTM"
+FORMAT_VERSION = 1
+
+_SECTIONS = (
+    "str_offsets", "str_blob", "locations", "npcs", "items", "journeys", "risks",
+    "out_offsets", "out_targets", "in_offsets", "in_targets",
+    "loc_sorted", "journey_sorted",
+)
+# magic, version, reserved, n_strings, n_locations, n_npcs, n_items,
+# n_journeys, n_risks, region, then one u64 offset per section
+_HEADER = struct.Struct("<4sHH7I" + "Q" * len(_SECTIONS))
+_LOCATION = struct.Struct("<8I")
+_NPC = struct.Struct("<3Ii?3x")
+_JOURNEY = struct.Struct("<5Ii3I")
+_U32 = struct.Struct("<I")
+_U64 = struct.Struct("<Q")
+
+
+# ---------------------------------------------------------------------------
+# Writer
+# ---------------------------------------------------------------------------
+
+class _StringTable:
+    def __init__(self) -> None:
+        self.index: dict[str, int] = {}
+        self.encoded: list[bytes] = []
+
+    def add(self, text: str) -> int:
+        i = self.index.get(text)
+        if i is None:
+            i = self.index[text] = len(self.encoded)
+            self.encoded.append(text.encode("utf-8"))
+        return i
+
+
+def _csr(n: int, edges: list[list[int]]) -> tuple[bytes, bytes]:
+    offsets = [0]
+    targets: list[int] = []
+    for i in range(n):
+        targets.extend(edges[i])
+        offsets.append(len(targets))
+    return struct.pack(f"<{len(offsets)}I", *offsets), struct.pack(f"<{len(targets)}I", *targets)
+
+
+def compile_world(graph: WorldGraph, path: Path) -> None:
+    """Write *graph* to *path* in the binary format.
+
+    The format has no room for a custom risk table; worlds with one must
+    stay JSON.
+    """
+    if graph.risk_stats != DEFAULT_RISK_STATS:
+        raise ValueError(f"World '{graph.region}' has custom risk_stats, which compiled worlds cannot store")
+    strings = _StringTable()
+    region = strings.add(graph.region)
+
+    locations = graph.all_locations()
+    loc_index = {loc.id: i for i, loc in enumerate(locations)}
+    loc_rows, npc_rows, item_rows = bytearray(), bytearray(), bytearray()
+    n_npcs = n_items = 0
+    for loc in locations:
+        loc_rows += _LOCATION.pack(
+            strings.add(loc.id), strings.add(loc.name), strings.add(loc.description),
+            strings.add(loc.gm_guide), n_npcs, len(loc.npcs), n_items, len(loc.inventory),
+        )
+        for npc in loc.npcs:
+            npc_rows += _NPC.pack(
+                strings.add(npc.id), strings.add(npc.name), strings.add(npc.description),
+                npc.hp, npc.hostile,
+            )
+        for item in loc.inventory:
+            item_rows += _U32.pack(strings.add(item))
+        n_npcs += len(loc.npcs)
+        n_items += len(loc.inventory)
+
+    journeys = graph.all_journeys()
+    journey_index = {j.id: i for i, j in enumerate(journeys)}
+    journey_rows, risk_rows = bytearray(), bytearray()
+    n_risks = 0
+    for j in journeys:
+        journey_rows += _JOURNEY.pack(
+            strings.add(j.id), loc_index[j.from_id], loc_index[j.to_id],
+            strings.add(j.direction), strings.add(j.duration), j.difficulty,
+            n_risks, len(j.risks), strings.add(j.description),
+        )
+        for risk in j.risks:
+            risk_rows += _U32.pack(strings.add(risk))
+        n_risks += len(j.risks)
+
+    # Edge lists keep the graph's per-location order
+    out_edges = [[journey_index[j.id] for j in graph.exits(loc.id)] for loc in locations]
+    in_edges = [[journey_index[j.id] for j in graph.incoming(loc.id)] for loc in locations]
+    out_offsets, out_targets = _csr(len(locations), out_edges)
+    in_offsets, in_targets = _csr(len(locations), in_edges)
+
+    enc = strings.encoded
+    loc_sorted = sorted(range(len(locations)), key=lambda i: enc[strings.index[locations[i].id]])
+    journey_sorted = sorted(range(len(journeys)), key=lambda i: enc[strings.index[journeys[i].id]])
+
+    str_offsets = [0]
+    for b in enc:
+        str_offsets.append(str_offsets[-1] + len(b))
+
+    sections = {
+        "str_offsets": struct.pack(f"<{len(str_offsets)}Q", *str_offsets),
+        "str_blob": b"".join(enc),
+        "locations": bytes(loc_rows),
+        "npcs": bytes(npc_rows),
+        "items": bytes(item_rows),
+        "journeys": bytes(journey_rows),
+        "risks": bytes(risk_rows),
+        "out_offsets": out_offsets,
+        "out_targets": out_targets,
+        "in_offsets": in_offsets,
+        "in_targets": in_targets,
+        "loc_sorted": struct.pack(f"<{len(loc_sorted)}I", *loc_sorted),
+        "journey_sorted": struct.pack(f"<{len(journey_sorted)}I", *journey_sorted),
+    }
+
+    offsets: list[int] = []
+    pos = _HEADER.size
+    body = bytearray()
+    for name in _SECTIONS:
+        pad = -pos % 8
+        body += b"\0" * pad
+        pos += pad
+        offsets.append(pos)
+        body += sections[name]
+        pos += len(sections[name])
+
+    header = _HEADER.pack(
+        MAGIC, FORMAT_VERSION, 0, len(enc), len(locations), n_npcs, n_items,
+        len(journeys), n_risks, region, *offsets,
+    )
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(header + body)
+
+
+# ---------------------------------------------------------------------------
+# Reader
+# ---------------------------------------------------------------------------
+
+class MappedWorld:
+    """Read-only, ``WorldGraph``-compatible view over a compiled world file.
+
+    Queries decode only the records they touch.  Objects returned by
+    :meth:`get_location` / :meth:`get_journey` are fresh copies, so changes to
+    them are not written back; use :meth:`to_graph` for a mutable graph.
+    """
+
+    frozen = True
+    version = 0
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        with path.open("rb") as fp:
+            self._buf = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        header = _HEADER.unpack_from(self._buf, 0)
+        magic, version = header[0], header[1]
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"'{path}' is not a compiled TOTM world")
+        if version != FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"Unsupported world format version {version} in '{path}'")
+        (self._n_strings, self._n_locations, self._n_npcs, self._n_items,
+         self._n_journeys, self._n_risks, region) = header[3:10]
+        self._off = dict(zip(_SECTIONS, header[10:]))
+        self.region = self._str(region)
+        self._journey_stats: dict[str, str | None] = {}
+
+    # -- Lifecycle -------------------------------------------------------
+
+    def close(self) -> None:
+        self._buf.close()
+
+    def __enter__(self) -> MappedWorld:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    # -- Raw access ------------------------------------------------------
+
+    def _u32(self, section: str, i: int) -> int:
+        return _U32.unpack_from(self._buf, self._off[section] + 4 * i)[0]
+
+    def _raw(self, i: int) -> bytes:
+        base = self._off["str_offsets"] + 8 * i
+        start, end = _U64.unpack_from(self._buf, base)[0], _U64.unpack_from(self._buf, base + 8)[0]
+        blob = self._off["str_blob"]
+        return self._buf[blob + start:blob + end]
+
+    def _str(self, i: int) -> str:
+        return self._raw(i).decode("utf-8")
+
+    def _find(self, sorted_section: str, record: struct.Struct, section: str,
+              count: int, key: str) -> int | None:
+        """Binary-search *sorted_section* for the record whose id is *key*."""
+        target = key.encode("utf-8")
+        lo, hi = 0, count
+        base = self._off[section]
+        while lo < hi:
+            mid = (lo + hi) // 2
+            idx = self._u32(sorted_section, mid)
+            found = self._raw(record.unpack_from(self._buf, base + record.size * idx)[0])
+            if found < target:
+                lo = mid + 1
+            elif found > target:
+                hi = mid
+            else:
+                return idx
+        return None
+
+    def _edge_range(self, offsets: str, i: int) -> range:
+        return range(self._u32(offsets, i), self._u32(offsets, i + 1))
+
+    # -- Records ---------------------------------------------------------
+
+    def _location(self, i: int) -> Location:
+        (id_, name, desc, guide, npc_start, npc_count,
+         item_start, item_count) = _LOCATION.unpack_from(self._buf, self._off["locations"] + _LOCATION.size * i)
+        npcs = []
+        for n in range(npc_start, npc_start + npc_count):
+            nid, nname, ndesc, hp, hostile = _NPC.unpack_from(self._buf, self._off["npcs"] + _NPC.size * n)
+            npcs.append(NPC(id=self._str(nid), name=self._str(nname), hp=hp,
+                            hostile=hostile, description=self._str(ndesc)))
+        return Location(
+            id=self._str(id_),
+            name=self._str(name),
+            description=self._str(desc),
+            npcs=npcs,
+            inventory=[self._str(self._u32("items", k)) for k in range(item_start, item_start + item_count)],
+            gm_guide=self._str(guide),
+        )
+
+    def _journey(self, i: int) -> Journey:
+        (id_, from_i, to_i, direction, duration, difficulty,
+         risk_start, risk_count, desc) = _JOURNEY.unpack_from(self._buf, self._off["journeys"] + _JOURNEY.size * i)
+        return Journey(
+            id=self._str(id_),
+            from_id=self._location_id(from_i),
+            to_id=self._location_id(to_i),
+            direction=self._str(direction),
+            duration=self._str(duration),
+            difficulty=difficulty,
+            risks=[self._str(self._u32("risks", k)) for k in range(risk_start, risk_start + risk_count)],
+            description=self._str(desc),
+        )
+
+    def _location_id(self, i: int) -> str:
+        return self._str(_LOCATION.unpack_from(self._buf, self._off["locations"] + _LOCATION.size * i)[0])
+
+    def _location_index(self, location_id: str) -> int | None:
+        return self._find("loc_sorted", _LOCATION, "locations", self._n_locations, location_id)
+
+    # -- WorldGraph-compatible queries -----------------------------------
+
+    def add_listener(self, listener: Any) -> None:
+        """No-op: a mapped world never changes."""
+
+    def remove_listener(self, listener: Any) -> None:
+        """No-op: a mapped world never changes."""
+
+    def get_location(self, location_id: str) -> Location | None:
+        i = self._location_index(location_id)
+        return None if i is None else self._location(i)
+
+    def all_locations(self) -> list[Location]:
+        return list(self.iter_locations())
+
+    def iter_locations(self) -> Iterator[Location]:
+        for i in range(self._n_locations):
+            yield self._location(i)
+
+    def get_journey(self, journey_id: str) -> Journey | None:
+        i = self._find("journey_sorted", _JOURNEY, "journeys", self._n_journeys, journey_id)
+        return None if i is None else self._journey(i)
+
+    def all_journeys(self) -> list[Journey]:
+        return [self._journey(i) for i in range(self._n_journeys)]
+
+    def exits(self, location_id: str) -> list[Journey]:
+        i = self._location_index(location_id)
+        if i is None:
+            return []
+        return [self._journey(self._u32("out_targets", k)) for k in self._edge_range("out_offsets", i)]
+
+    def incoming(self, location_id: str) -> list[Journey]:
+        i = self._location_index(location_id)
+        if i is None:
+            return []
+        return [self._journey(self._u32("in_targets", k)) for k in self._edge_range("in_offsets", i)]
+
+    def neighbors(self, location_id: str) -> list[Location]:
+        i = self._location_index(location_id)
+        if i is None:
+            return []
+        result = []
+        for k in self._edge_range("out_offsets", i):
+            j = self._u32("out_targets", k)
+            to_i = _JOURNEY.unpack_from(self._buf, self._off["journeys"] + _JOURNEY.size * j)[2]
+            result.append(self._location(to_i))
+        return result
+
+    neighborhood = WorldGraph.neighborhood
+
+    # -- Index queries (linear scans; the file carries no secondary indexes)
+
+    def locate_npc(self, npc_id: str) -> Location | None:
+        return next((loc for loc in self.iter_locations()
+                     if any(n.id == npc_id for n in loc.npcs)), None)
+
+    def locations_with_item(self, item: str) -> list[Location]:
+        return [loc for loc in self.iter_locations() if item in loc.inventory]
+
+    def journeys_with_risk(self, keyword: str) -> list[Journey]:
+        # Same keys as WorldGraph's risk index, so both backends agree
+        keyword = keyword.lower()
+        return [j for j in self.all_journeys()
+                if any(keyword in risk_keywords(r) for r in j.risks)]
+
+    @property
+    def risk_stats(self) -> dict[str, str]:
+        return dict(DEFAULT_RISK_STATS)
+
+    def journey_stat(self, journey: Journey) -> str | None:
+        # Journeys are decoded fresh on every read, so memoize by id
+        try:
+            return self._journey_stats[journey.id]
+        except KeyError:
+            stat = self._journey_stats[journey.id] = DEFAULT_MATCHER.match(journey.risks)
+            return stat
+
+    # -- Conversion ------------------------------------------------------
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "region": self.region,
+            "locations": [loc.to_dict() for loc in self.iter_locations()],
+            "journeys": [j.to_dict() for j in self.all_journeys()],
+        }
+
+    def to_graph(self) -> WorldGraph:
+        """Decode the whole file into a mutable :class:`WorldGraph`."""
+        return WorldGraph.from_dict(self.to_dict())
+
+
+def open_world(path: Path) -> MappedWorld:
+    """Map a compiled world file; see :class:`MappedWorld`."""
+    return MappedWorld(path)
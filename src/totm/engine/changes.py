@@ -0,0 +1,56 @@
+"""ChangeTracker — which parts of a world changed since the last save.
+
+Follows a world through :meth:`WorldGraph.add_listener`, so every mutation
+path (graph methods, session overlays, bulk NPC updates) is seen.  NPC
+changes are tracked through the location that holds the NPC.
+"""
+
+from __future__ import annotations
+
+from totm.engine.graph import WorldGraph
+from totm.engine.models import Journey, Location
+
+
+class ChangeTracker:
+    """Ids of locations and journeys added, changed or removed since :meth:`clear`."""
+
+    def __init__(self, world: WorldGraph) -> None:
+        self.world = world
+        self.locations: set[str] = set()
+        self.removed_locations: set[str] = set()
+        self.journeys: set[str] = set()
+        self.removed_journeys: set[str] = set()
+        # Whether the risk keyword table was replaced
+        self.risk_stats = False
+        world.add_listener(self._on_change)
+
+    def close(self) -> None:
+        """Stop following the world."""
+        self.world.remove_listener(self._on_change)
+
+    def clear(self) -> None:
+        self.locations.clear()
+        self.removed_locations.clear()
+        self.journeys.clear()
+        self.removed_journeys.clear()
+        self.risk_stats = False
+
+    def __bool__(self) -> bool:
+        return bool(self.locations or self.removed_locations
+                    or self.journeys or self.removed_journeys or self.risk_stats)
+
+    def _on_change(self, event: str, subject: Location | Journey | None) -> None:
+        if event in ("add_location", "update_location"):
+            self.locations.add(subject.id)
+            self.removed_locations.discard(subject.id)
+        elif event == "remove_location":
+            self.locations.discard(subject.id)
+            self.removed_locations.add(subject.id)
+        elif event == "add_journey":
+            self.journeys.add(subject.id)
+            self.removed_journeys.discard(subject.id)
+        elif event == "remove_journey":
+            self.journeys.discard(subject.id)
+            self.removed_journeys.add(subject.id)
+        elif event == "set_risk_stats":
+            self.risk_stats = True
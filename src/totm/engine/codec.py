@@ -0,0 +1,154 @@
+"""JSON codec with pluggable backends.
+
+Saves, world files and tool results all go through :func:`dumps` /
+:func:`loads`.  The fastest installed backend is used — ``orjson``, then
+``msgspec`` — falling back to the standard library's :mod:`json`.  Neither
+accelerator is a dependency; install one to speed up saves::
+
+    pip install orjson
+
+The backend can be pinned with :func:`use_backend` or the
+``TOTM_JSON_BACKEND`` environment variable.  Per-model encoding lives in
+each model's ``to_dict`` / ``from_dict``; this module only turns plain
+dicts and lists into bytes and back.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+
+@dataclass(frozen=True)
+class Backend:
+    """A JSON implementation: ``dumps(obj, pretty) -> bytes`` and ``loads``."""
+
+    name: str
+    dumps: Callable[[Any, bool], bytes]
+    loads: Callable[[bytes | str], Any]
+
+
+def _stdlib() -> Backend:
+    compact = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+    pretty = json.JSONEncoder(ensure_ascii=False, indent=2)
+
+    def dumps(obj: Any, indent: bool) -> bytes:
+        return (pretty if indent else compact).encode(obj).encode()
+
+    return Backend("json", dumps, json.loads)
+
+
+def _orjson() -> Backend:
+    import orjson
+
+    def dumps(obj: Any, indent: bool) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+
+    return Backend("orjson", dumps, orjson.loads)
+
+
+def _msgspec() -> Backend:
+    import msgspec
+
+    encoder = msgspec.json.Encoder()
+    decoder = msgspec.json.Decoder()
+
+    def dumps(obj: Any, indent: bool) -> bytes:
+        raw = encoder.encode(obj)
+        return msgspec.json.format(raw, indent=2) if indent else raw
+
+    return Backend("msgspec", dumps, decoder.decode)
+
+
+# Preference order for automatic selection
+BACKENDS: dict[str, Callable[[], Backend]] = {
+    "orjson": _orjson,
+    "msgspec": _msgspec,
+    "json": _stdlib,
+}
+
+_backend: Backend | None = None
+
+
+def available_backends() -> list[str]:
+    """Names of the backends that can be imported here, fastest first."""
+    names = []
+    for name, factory in BACKENDS.items():
+        try:
+            factory()
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+def use_backend(name: str | None = None) -> Backend:
+    """Select the backend *name*, or the fastest available one if omitted.
+
+    Raises ``ValueError`` for an unknown name and ``ImportError`` if the
+    named backend is not installed.
+    """
+    global _backend
+    if name is None:
+        _backend = BACKENDS[available_backends()[0]]()
+    elif name in BACKENDS:
+        _backend = BACKENDS[name]()
+    else:
+        raise ValueError(f"Unknown JSON backend '{name}'. Valid: {', '.join(BACKENDS)}.")
+    return _backend
+
+
+def backend() -> Backend:
+    """The backend in use, chosen on first call."""
+    if _backend is None:
+        return use_backend(os.environ.get("TOTM_JSON_BACKEND") or None)
+    return _backend
+
+
+# -- Encoding / decoding ----------------------------------------------------
+
+def dumps(obj: Any, *, pretty: bool = False) -> bytes:
+    """Encode plain JSON data as UTF-8 bytes; *pretty* indents by two spaces."""
+    return backend().dumps(obj, pretty)
+
+
+def dumps_str(obj: Any, *, pretty: bool = False) -> str:
+    return dumps(obj, pretty=pretty).decode()
+
+
+def loads(data: bytes | str) -> Any:
+    return backend().loads(data)
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    """Replace *path* with *data* so readers see the old file or the new one, never half.
+
+    Writes a uniquely named sibling temp file, fsyncs it and renames it over
+    *path*, so concurrent writers (an autosave and an explicit save) never
+    share a temp file; the last rename wins.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, name = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".", suffix=".tmp")
+    tmp = Path(name)
+    try:
+        with os.fdopen(fd, "wb") as fp:
+            fp.write(data)
+            fp.flush()
+            os.fsync(fp.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def write_json(path: Path, obj: Any, *, pretty: bool = False) -> None:
+    """Encode *obj* and atomically replace *path* with it."""
+    write_atomic(path, dumps(obj, pretty=pretty))
+
+
+def read_json(path: Path) -> Any:
+    return loads(path.read_bytes())
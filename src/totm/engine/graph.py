@@ -2,12 +2,104 @@
 
 from __future__ import annotations
 
-import json
+import re
+from array import array
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
-from totm.engine.models import Location, Journey
+from totm.engine import codec
+from totm.engine.models import Location, Journey, NPC
+from totm.engine.risks import DEFAULT_MATCHER, RiskMatcher
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+# listener(event, subject) — event is "add_location", "remove_location",
+# "add_journey" or "remove_journey" for structural changes,
+# "update_location" when a location's NPCs or items change, or
+# "set_risk_stats" when the risk table is replaced; subject is the Location
+# or Journey (None for "set_risk_stats")
+GraphListener = Callable[[str, "Location | Journey | None"], None]
+
+
+@dataclass
+class Neighborhood:
+    """The k-hop subgraph around a location, as returned by ``neighborhood()``."""
+
+    center_id: str
+    k: int
+    locations: list[Location]
+    journeys: list[Journey]
+    # location_id -> hop distance from the center
+    depth: dict[str, int]
+
+
+def risk_keywords(risk: str) -> set[str]:
+    """Index keys for a risk: the whole lowered phrase plus each word."""
+    lowered = risk.lower()
+    return {lowered, *_WORD.findall(lowered)}
+
+
+class _CSRAdjacency:
+    """Compact, read-only adjacency built by :meth:`WorldGraph.freeze`.
+
+    Location and journey ids are interned to dense integers.  The outgoing
+    edges of location ``i`` are ``out_targets[out_offsets[i]:out_offsets[i + 1]]``,
+    each entry being a journey index into ``journeys``; incoming edges are
+    stored the same way in ``in_offsets``/``in_targets``.
+    """
+
+    __slots__ = ("loc_ids", "loc_index", "journeys", "dest",
+                 "out_offsets", "out_targets", "in_offsets", "in_targets")
+
+    def __init__(self, locations: dict[str, Location], journeys: dict[str, Journey],
+                 adj: dict[str, dict[str, None]], radj: dict[str, dict[str, None]]) -> None:
+        self.loc_ids: list[str] = list(locations)
+        self.loc_index: dict[str, int] = {lid: i for i, lid in enumerate(self.loc_ids)}
+        journey_index = {jid: i for i, jid in enumerate(journeys)}
+        self.journeys: list[Journey] = list(journeys.values())
+        # Destination location index per journey index
+        self.dest = array("I", (self.loc_index[j.to_id] for j in self.journeys))
+        self.out_offsets, self.out_targets = self._pack(adj, journey_index)
+        self.in_offsets, self.in_targets = self._pack(radj, journey_index)
+
+    def _pack(self, adj: dict[str, dict[str, None]],
+              journey_index: dict[str, int]) -> tuple[array, array]:
+        offsets = array("I", [0])
+        targets = array("I")
+        for lid in self.loc_ids:
+            targets.extend(journey_index[jid] for jid in adj.get(lid, ()))
+            offsets.append(len(targets))
+        return offsets, targets
+
+    def _edges(self, offsets: array, targets: array, location_id: str) -> array:
+        i = self.loc_index.get(location_id)
+        if i is None:
+            return array("I")
+        return targets[offsets[i]:offsets[i + 1]]
+
+    def exits(self, location_id: str) -> list[Journey]:
+        journeys = self.journeys
+        return [journeys[t] for t in self._edges(self.out_offsets, self.out_targets, location_id)]
+
+    def incoming(self, location_id: str) -> list[Journey]:
+        journeys = self.journeys
+        return [journeys[t] for t in self._edges(self.in_offsets, self.in_targets, location_id)]
+
+    def neighbor_ids(self, location_id: str) -> list[str]:
+        loc_ids, dest = self.loc_ids, self.dest
+        return [loc_ids[dest[t]] for t in self._edges(self.out_offsets, self.out_targets, location_id)]
+
+    def _unpack(self, offsets: array, targets: array) -> dict[str, dict[str, None]]:
+        journeys = self.journeys
+        return {
+            lid: {journeys[t].id: None for t in targets[offsets[i]:offsets[i + 1]]}
+            for i, lid in enumerate(self.loc_ids)
+        }
+
+    def to_adj(self) -> tuple[dict[str, dict[str, None]], dict[str, dict[str, None]]]:
+        return (self._unpack(self.out_offsets, self.out_targets),
+                self._unpack(self.in_offsets, self.in_targets))
 
 
 @dataclass
@@ -17,19 +109,112 @@ class WorldGraph:
     Nodes are :class:`Location` instances, edges are :class:`Journey` instances.
     The graph is region-scoped: each WorldGraph represents a single named
     region (e.g. "Dark Forest").
+
+    A graph can be :meth:`freeze`-d once authoring is done, which swaps the
+    per-location journey lists for a compact CSR adjacency; :meth:`thaw`
+    restores the mutable form.
+
+    Secondary indexes (NPC -> location, item -> locations, risk keyword ->
+    journeys) are kept current as long as NPCs and items are changed through
+    the graph's methods rather than by editing ``Location`` lists directly.
     """
 
     region: str
     _locations: dict[str, Location] = field(default_factory=dict)
     _journeys: dict[str, Journey] = field(default_factory=dict)
-    # Adjacency: location_id -> list of journey_ids originating there
-    _adj: dict[str, list[str]] = field(default_factory=dict)
+    # Adjacency: location_id -> ordered set of journey_ids originating there
+    _adj: dict[str, dict[str, None]] = field(default_factory=dict)
+    # Reverse adjacency: location_id -> ordered set of journey_ids arriving there
+    _radj: dict[str, dict[str, None]] = field(default_factory=dict)
+    # Frozen adjacency; replaces _adj while the graph is frozen
+    _csr: _CSRAdjacency | None = field(default=None, repr=False, compare=False)
+    # Secondary indexes: npc_id -> location_id, item -> {location_id: count},
+    # risk keyword -> ordered set of journey_ids
+    _npc_index: dict[str, str] = field(default_factory=dict, repr=False, compare=False)
+    _item_index: dict[str, dict[str, int]] = field(default_factory=dict, repr=False, compare=False)
+    _risk_index: dict[str, dict[str, None]] = field(default_factory=dict, repr=False, compare=False)
+    # Risk keyword table, and the stat it resolves each journey's risks to
+    _risks: RiskMatcher = field(default=DEFAULT_MATCHER, repr=False, compare=False)
+    _journey_stats: dict[str, str | None] = field(default_factory=dict, repr=False, compare=False)
+    # Bumped on every mutation; listeners are told what changed
+    _version: int = field(default=0, repr=False, compare=False)
+    # Derived indexes that maintain themselves incrementally
+    _listeners: list[GraphListener] = field(default_factory=list, repr=False, compare=False)
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def add_listener(self, listener: GraphListener) -> None:
+        """Call *listener* after every mutation made through the graph."""
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: GraphListener) -> None:
+        self._listeners.remove(listener)
+
+    def _notify(self, event: str, subject: Location | Journey | None) -> None:
+        for listener in self._listeners:
+            listener(event, subject)
+
+    # -- Freezing --------------------------------------------------------
+
+    @property
+    def frozen(self) -> bool:
+        return self._csr is not None
+
+    def freeze(self) -> None:
+        """Compact the adjacency into CSR arrays and reject further mutation."""
+        if self._csr is not None:
+            return
+        self._csr = _CSRAdjacency(self._locations, self._journeys, self._adj, self._radj)
+        self._adj = {}
+        self._radj = {}
+
+    def thaw(self) -> None:
+        """Restore the mutable adjacency so locations/journeys can be added."""
+        if self._csr is None:
+            return
+        self._adj, self._radj = self._csr.to_adj()
+        self._csr = None
+
+    def _check_mutable(self) -> None:
+        if self._csr is not None:
+            raise RuntimeError(
+                f"WorldGraph '{self.region}' is frozen; call thaw() before mutating"
+            )
 
     # -- Locations -------------------------------------------------------
 
     def add_location(self, location: Location) -> None:
+        self._check_mutable()
+        previous = self._locations.get(location.id)
+        if previous is not None:
+            self._unindex_location(previous)
         self._locations[location.id] = location
-        self._adj.setdefault(location.id, [])
+        self._index_location(location)
+        self._adj.setdefault(location.id, {})
+        self._radj.setdefault(location.id, {})
+        self._version += 1
+        self._notify("add_location", location)
+
+    def remove_location(self, location_id: str) -> Location:
+        """Remove a Location together with every Journey entering or leaving it.
+
+        Cost is proportional to the location's degree, not the world size.
+        """
+        self._check_mutable()
+        if location_id not in self._locations:
+            raise ValueError(f"Location '{location_id}' not in graph")
+        for jid in list(self._adj[location_id]) + list(self._radj[location_id]):
+            if jid in self._journeys:
+                self.remove_journey(jid)
+        del self._adj[location_id]
+        del self._radj[location_id]
+        self._version += 1
+        location = self._locations.pop(location_id)
+        self._unindex_location(location)
+        self._notify("remove_location", location)
+        return location
 
     def get_location(self, location_id: str) -> Location | None:
         return self._locations.get(location_id)
@@ -40,6 +225,7 @@ class WorldGraph:
     # -- Journeys --------------------------------------------------------
 
     def add_journey(self, journey: Journey) -> None:
+        self._check_mutable()
         if journey.from_id not in self._locations:
             raise ValueError(
                 f"Origin location '{journey.from_id}' not in graph"
@@ -48,37 +234,245 @@ class WorldGraph:
             raise ValueError(
                 f"Destination location '{journey.to_id}' not in graph"
             )
+        previous = self._journeys.get(journey.id)
+        if previous is not None:
+            self._unlink(previous)
+            self._notify("remove_journey", previous)
         self._journeys[journey.id] = journey
-        self._adj[journey.from_id].append(journey.id)
+        self._journey_stats[journey.id] = self._risks.match(journey.risks)
+        self._adj[journey.from_id][journey.id] = None
+        self._radj[journey.to_id][journey.id] = None
+        for keyword in self._journey_keywords(journey):
+            self._risk_index.setdefault(keyword, {})[journey.id] = None
+        self._version += 1
+        self._notify("add_journey", journey)
+
+    def remove_journey(self, journey_id: str) -> Journey:
+        """Remove a Journey in O(1), e.g. when a bridge collapses."""
+        self._check_mutable()
+        journey = self._journeys.pop(journey_id, None)
+        if journey is None:
+            raise ValueError(f"Journey '{journey_id}' not in graph")
+        del self._journey_stats[journey_id]
+        self._unlink(journey)
+        self._version += 1
+        self._notify("remove_journey", journey)
+        return journey
+
+    def _unlink(self, journey: Journey) -> None:
+        self._adj[journey.from_id].pop(journey.id, None)
+        self._radj[journey.to_id].pop(journey.id, None)
+        for keyword in self._journey_keywords(journey):
+            ids = self._risk_index.get(keyword)
+            if ids is not None:
+                ids.pop(journey.id, None)
+                if not ids:
+                    del self._risk_index[keyword]
+
+    @staticmethod
+    def _journey_keywords(journey: Journey) -> set[str]:
+        keywords: set[str] = set()
+        for risk in journey.risks:
+            keywords |= risk_keywords(risk)
+        return keywords
 
     def get_journey(self, journey_id: str) -> Journey | None:
         return self._journeys.get(journey_id)
 
+    # -- Risk stats ------------------------------------------------------
+
+    @property
+    def risk_stats(self) -> dict[str, str]:
+        """The risk keyword -> stat table traverse checks use in this world."""
+        return dict(self._risks.table)
+
+    def set_risk_stats(self, table: dict[str, str]) -> None:
+        """Replace the risk keyword table and re-resolve every journey."""
+        self._check_mutable()
+        self._risks = RiskMatcher(table)
+        match = self._risks.match
+        self._journey_stats = {jid: match(j.risks) for jid, j in self._journeys.items()}
+        self._version += 1
+        self._notify("set_risk_stats", None)
+
+    def journey_stat(self, journey: Journey) -> str | None:
+        """The stat *journey*'s risks call for, or None for the primary stat.
+
+        Resolved when the journey was added; journeys from elsewhere (e.g.
+        portals into another region) are matched on the spot.
+        """
+        if self._journeys.get(journey.id) is journey:
+            return self._journey_stats[journey.id]
+        return self._risks.match(journey.risks)
+
+    def all_journeys(self) -> list[Journey]:
+        return list(self._journeys.values())
+
     def exits(self, location_id: str) -> list[Journey]:
         """Return all outgoing Journeys from *location_id*."""
-        journey_ids = self._adj.get(location_id, [])
+        if self._csr is not None:
+            return self._csr.exits(location_id)
+        journey_ids = self._adj.get(location_id, ())
+        return [self._journeys[jid] for jid in journey_ids if jid in self._journeys]
+
+    def incoming(self, location_id: str) -> list[Journey]:
+        """Return all Journeys arriving at *location_id*."""
+        if self._csr is not None:
+            return self._csr.incoming(location_id)
+        journey_ids = self._radj.get(location_id, ())
         return [self._journeys[jid] for jid in journey_ids if jid in self._journeys]
 
     def neighbors(self, location_id: str) -> list[Location]:
         """Return the destination Locations reachable from *location_id*."""
+        if self._csr is not None:
+            return [self._locations[lid] for lid in self._csr.neighbor_ids(location_id)]
         return [
             self._locations[j.to_id]
             for j in self.exits(location_id)
             if j.to_id in self._locations
         ]
 
+    def neighborhood(self, location_id: str, k: int) -> Neighborhood:
+        """Return every location within *k* hops of *location_id* (breadth-first).
+
+        ``journeys`` holds the exits of every location closer than *k* hops,
+        i.e. everything the character could attempt within *k* moves.
+        """
+        if self.get_location(location_id) is None:
+            raise ValueError(f"Location '{location_id}' not in graph")
+        depth = {location_id: 0}
+        journeys: list[Journey] = []
+        frontier = [location_id]
+        for d in range(1, k + 1):
+            nxt = []
+            for lid in frontier:
+                for j in self.exits(lid):
+                    journeys.append(j)
+                    if j.to_id not in depth:
+                        depth[j.to_id] = d
+                        nxt.append(j.to_id)
+            frontier = nxt
+        return Neighborhood(
+            center_id=location_id,
+            k=k,
+            locations=[self.get_location(lid) for lid in depth],  # type: ignore[misc]
+            journeys=journeys,
+            depth=depth,
+        )
+
+    # -- NPCs and items -------------------------------------------------
+
+    def update_npc(self, location_id: str, npc_id: str, **changes: Any) -> NPC:
+        """Apply field *changes* to an NPC at *location_id* and return it."""
+        npc = self._find_npc(location_id, npc_id)
+        for name, value in changes.items():
+            setattr(npc, name, value)
+        self._version += 1
+        self._notify("update_location", self._locations[location_id])
+        return npc
+
+    def move_npc(self, npc_id: str, to_location_id: str) -> NPC:
+        """Move an NPC from wherever it is to *to_location_id*."""
+        from_id = self._npc_index.get(npc_id)
+        if from_id is None:
+            raise ValueError(f"NPC '{npc_id}' not in graph")
+        dest = self._locations.get(to_location_id)
+        if dest is None:
+            raise ValueError(f"Location '{to_location_id}' not in graph")
+        src = self._locations[from_id]
+        npc = self._find_npc(from_id, npc_id)
+        src.npcs.remove(npc)
+        dest.npcs.append(npc)
+        self._npc_index[npc_id] = to_location_id
+        self._version += 1
+        self._notify("update_location", src)
+        self._notify("update_location", dest)
+        return npc
+
+    def add_item(self, location_id: str, item: str) -> None:
+        loc = self._locations.get(location_id)
+        if loc is None:
+            raise ValueError(f"Location '{location_id}' not in graph")
+        loc.inventory.append(item)
+        self._index_item(item, location_id)
+        self._version += 1
+        self._notify("update_location", loc)
+
+    def remove_item(self, location_id: str, item: str) -> None:
+        loc = self._locations.get(location_id)
+        if loc is None or item not in loc.inventory:
+            raise ValueError(f"Item '{item}' not at location '{location_id}'")
+        loc.inventory.remove(item)
+        self._unindex_item(item, location_id)
+        self._version += 1
+        self._notify("update_location", loc)
+
+    def _find_npc(self, location_id: str, npc_id: str) -> NPC:
+        loc = self._locations.get(location_id)
+        npc = None if loc is None else next((n for n in loc.npcs if n.id == npc_id), None)
+        if npc is None:
+            raise ValueError(f"NPC '{npc_id}' not at location '{location_id}'")
+        return npc
+
+    # -- Index queries ---------------------------------------------------
+
+    def locate_npc(self, npc_id: str) -> Location | None:
+        """Return the Location an NPC is in, in O(1)."""
+        location_id = self._npc_index.get(npc_id)
+        return None if location_id is None else self._locations[location_id]
+
+    def locations_with_item(self, item: str) -> list[Location]:
+        """Return every Location whose inventory holds *item*."""
+        return [self._locations[lid] for lid in self._item_index.get(item, ())]
+
+    def journeys_with_risk(self, keyword: str) -> list[Journey]:
+        """Return Journeys with a risk matching *keyword* (a word or whole phrase, any case)."""
+        return [self._journeys[jid] for jid in self._risk_index.get(keyword.lower(), ())]
+
+    def _index_location(self, location: Location) -> None:
+        for npc in location.npcs:
+            self._npc_index[npc.id] = location.id
+        for item in location.inventory:
+            self._index_item(item, location.id)
+
+    def _unindex_location(self, location: Location) -> None:
+        for npc in location.npcs:
+            if self._npc_index.get(npc.id) == location.id:
+                del self._npc_index[npc.id]
+        for item in location.inventory:
+            self._unindex_item(item, location.id)
+
+    def _index_item(self, item: str, location_id: str) -> None:
+        counts = self._item_index.setdefault(item, {})
+        counts[location_id] = counts.get(location_id, 0) + 1
+
+    def _unindex_item(self, item: str, location_id: str) -> None:
+        counts = self._item_index.get(item)
+        if counts is None or location_id not in counts:
+            return
+        counts[location_id] -= 1
+        if counts[location_id] <= 0:
+            del counts[location_id]
+            if not counts:
+                del self._item_index[item]
+
     # -- Serialization ---------------------------------------------------
 
     def to_dict(self) -> dict[str, Any]:
-        return {
+        data: dict[str, Any] = {
             "region": self.region,
             "locations": [loc.to_dict() for loc in self._locations.values()],
             "journeys": [j.to_dict() for j in self._journeys.values()],
         }
+        if self._risks is not DEFAULT_MATCHER:
+            data["risk_stats"] = self.risk_stats
+        return data
 
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> WorldGraph:
         graph = cls(region=data["region"])
+        if "risk_stats" in data:
+            graph.set_risk_stats(data["risk_stats"])
         for loc_data in data.get("locations", []):
             graph.add_location(Location.from_dict(loc_data))
         for j_data in data.get("journeys", []):
@@ -86,9 +480,8 @@ class WorldGraph:
         return graph
 
     def save(self, path: Path) -> None:
-        path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text(json.dumps(self.to_dict(), indent=2))
+        codec.write_json(path, self.to_dict(), pretty=True)
 
     @classmethod
     def load(cls, path: Path) -> WorldGraph:
-        return cls.from_dict(json.loads(path.read_text()))
+        return cls.from_dict(codec.read_json(path))
@@ -0,0 +1,152 @@
+"""Event-sourced game journal — O(change) saves.
+
+``StateEngine.save`` rewrites the whole world.  In journal mode the engine
+instead appends one small JSON line per state change (``set_character``,
+``set_location``, ``traverse``, ``attack``) to ``journal.log``; making the
+game durable is then a flush of the few bytes written since the last one.
+Every *snapshot_every* records the full state is written to
+``snapshot.json`` and the log is truncated.
+
+Loading reads the snapshot and re-applies the log on top.  Records carry
+the state each change produced rather than the command that caused it, so
+nothing is re-adjudicated.  They also carry the sides of any dice rolled,
+which lets the loader advance the RNG to where the session left it.
+
+Each record has a sequence number and the snapshot notes the last one it
+includes, so a crash between writing a snapshot and truncating the log,
+or in the middle of a log line, loses nothing that was synced.
+
+Replacing ``engine.world`` (New Game, region crossings) is not a journaled
+change; call :meth:`Journal.compact` afterwards.
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Any
+
+from totm.engine import codec
+from totm.engine.models import Character
+from totm.engine.store import StateEngine
+
+SNAPSHOT_NAME = "snapshot.json"
+LOG_NAME = "journal.log"
+
+
+class Journal:
+    """Append-only change log plus periodic snapshot for one engine."""
+
+    def __init__(
+        self,
+        engine: StateEngine,
+        directory: Path,
+        *,
+        seq: int = 0,
+        snapshot_every: int = 1000,
+        durable: bool = False,
+    ) -> None:
+        self.engine = engine
+        self.directory = directory
+        self.snapshot_every = snapshot_every
+        # fsync after every record rather than only on sync()
+        self.durable = durable
+        self.seq = seq
+        self._since_snapshot = 0
+        self._log = (directory / LOG_NAME).open("ab")
+        engine.journal = self
+
+    @classmethod
+    def create(cls, engine: StateEngine, directory: Path, **kwargs: Any) -> Journal:
+        """Start journaling *engine* into *directory* from a fresh snapshot."""
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / LOG_NAME).write_bytes(b"")
+        journal = cls(engine, directory, **kwargs)
+        journal.compact()
+        return journal
+
+    @classmethod
+    def load(cls, directory: Path, **kwargs: Any) -> StateEngine:
+        """Rebuild the engine journaled in *directory*; it keeps journaling there."""
+        snapshot = codec.read_json(directory / SNAPSHOT_NAME)
+        engine = StateEngine.from_state(snapshot["state"])
+        seq = snapshot["seq"]
+
+        log_path = directory / LOG_NAME
+        raw = log_path.read_bytes() if log_path.exists() else b""
+        good = 0
+        for line in raw.splitlines(keepends=True):
+            if not line.endswith(b"\n"):
+                break  # torn write at the tail
+            try:
+                record = codec.loads(line)
+            except ValueError:
+                break
+            good += len(line)
+            if record["seq"] <= seq:
+                continue  # already in the snapshot
+            _apply(engine, record)
+            seq = record["seq"]
+        if good < len(raw):
+            with log_path.open("r+b") as fp:
+                fp.truncate(good)
+
+        cls(engine, directory, seq=seq, **kwargs)
+        return engine
+
+    # -- Writing ---------------------------------------------------------
+
+    def append(self, op: str, fields: dict[str, Any]) -> None:
+        self.seq += 1
+        self._log.write(codec.dumps({"seq": self.seq, "op": op, **fields}) + b"\n")
+        if self.durable:
+            self.sync()
+        self._since_snapshot += 1
+        if self._since_snapshot >= self.snapshot_every:
+            self.compact()
+
+    def sync(self) -> None:
+        """Make every record appended so far durable."""
+        self._log.flush()
+        os.fsync(self._log.fileno())
+
+    def compact(self) -> None:
+        """Write a full snapshot and empty the log."""
+        state = {"seq": self.seq, "state": self.engine.to_state()}
+        codec.write_atomic(self.directory / SNAPSHOT_NAME, codec.dumps(state))
+        self._log.seek(0)
+        self._log.truncate()
+        self._since_snapshot = 0
+
+    def close(self) -> None:
+        """Sync, stop journaling and release the log file."""
+        if self._log.closed:
+            return
+        self.sync()
+        self._log.close()
+        if self.engine.journal is self:
+            self.engine.journal = None
+
+
+def _apply(engine: StateEngine, record: dict[str, Any]) -> None:
+    """Re-apply one journal record to *engine* (which must not be journaling)."""
+    op = record["op"]
+    if op == "set_character":
+        data = record["character"]
+        engine.set_character(Character.from_dict(data) if data else None)  # type: ignore[arg-type]
+    elif op == "set_location":
+        if record["location"] is None:
+            engine._current_location_id = None  # undone back to before the first location
+        else:
+            engine.set_location(record["location"])
+    elif op == "traverse":
+        engine.set_location(record["location"])
+        engine.character.hp = record["hp"]  # type: ignore[union-attr]
+    elif op == "attack":
+        engine.world.update_npc(record["location"], record["npc"], hp=record["npc_hp"])
+        engine.character.hp = record["hp"]  # type: ignore[union-attr]
+    else:
+        raise ValueError(f"Unknown journal record '{op}'")
+    # Advance the RNG past the rolls this change made
+    for sides in record.get("dice", ()):
+        engine._rng.randint(1, sides)
@@ -0,0 +1,232 @@
+"""Streaming region loader — builds a WorldGraph without reading the whole file.
+
+``WorldGraph.load`` holds the raw text and the fully decoded document in
+memory before the first Location exists.  The loader here reads the file in
+chunks and decodes the ``locations`` and ``journeys`` arrays one element at
+a time, so peak memory stays close to the size of the finished graph.
+"""
+
+from __future__ import annotations
+
+import codecs
+import json
+import re
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Iterator
+
+from totm.engine.graph import WorldGraph
+from totm.engine.models import Journey, Location
+
+# progress(bytes_read, total_bytes)
+ProgressCallback = Callable[[int, int], None]
+
+# Top-level arrays that are decoded element by element
+_STREAMED_KEYS = {"locations": "location", "journeys": "journey"}
+
+_WHITESPACE = " \t\n\r"
+
+# What skip() looks for outside strings, inside strings, and after a scalar
+_STRUCTURAL = re.compile(r'[\[\]{}"]')
+_STRING_END = re.compile(r'["\\]')
+_SCALAR_END = re.compile(r"[\s,\]}]")
+
+
+class _JSONStream:
+    """Minimal incremental reader over a binary JSON file."""
+
+    def __init__(self, fp: BinaryIO, total: int, chunk_size: int,
+                 progress: ProgressCallback | None) -> None:
+        self._fp = fp
+        self._total = total
+        self._chunk_size = chunk_size
+        self._progress = progress
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._buf = ""
+        self._pos = 0
+        self._read = 0
+        self._eof = False
+
+    def _fill(self, size: int | None = None) -> None:
+        raw = self._fp.read(size or self._chunk_size)
+        self._read += len(raw)
+        self._eof = not raw
+        self._buf = self._buf[self._pos:] + self._decoder.decode(raw, final=self._eof)
+        self._pos = 0
+        if self._progress is not None and raw:
+            self._progress(self._read, self._total)
+
+    def _skip_ws(self) -> None:
+        while True:
+            buf, pos = self._buf, self._pos
+            while pos < len(buf) and buf[pos] in _WHITESPACE:
+                pos += 1
+            self._pos = pos
+            if pos < len(buf) or self._eof:
+                return
+            self._fill()
+
+    def peek(self) -> str:
+        self._skip_ws()
+        return self._buf[self._pos] if self._pos < len(self._buf) else ""
+
+    def expect(self, chars: str) -> str:
+        ch = self.peek()
+        if not ch or ch not in chars:
+            raise json.JSONDecodeError(
+                f"Expected one of {chars!r}", self._buf, self._pos,
+            )
+        self._pos += 1
+        return ch
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value, reading more input as needed."""
+        self._skip_ws()
+        while True:
+            try:
+                obj, end = self._json.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            else:
+                # A number cut at the buffer edge decodes "successfully"
+                if end < len(self._buf) or self._eof:
+                    self._pos = end
+                    return obj
+            # Grow geometrically so one large value is not re-parsed per chunk
+            self._fill(max(self._chunk_size, len(self._buf) - self._pos))
+
+    def skip(self) -> None:
+        """Step over the next JSON value without decoding it.
+
+        Only brackets and string boundaries are looked at; what the value
+        holds is not validated.
+        """
+        if self.peek() not in '[{"':
+            while (match := _SCALAR_END.search(self._buf, self._pos)) is None and not self._eof:
+                self._pos = len(self._buf)
+                self._fill()
+            self._pos = match.start() if match else len(self._buf)
+            return
+        depth = 0
+        in_string = False
+        while True:
+            match = (_STRING_END if in_string else _STRUCTURAL).search(self._buf, self._pos)
+            if match is None:
+                if self._eof:
+                    raise json.JSONDecodeError("Unterminated value", self._buf, self._pos)
+                self._pos = len(self._buf)
+                self._fill()
+                continue
+            ch = match.group()
+            self._pos = match.end()
+            if ch == "\\":
+                # The escaped character may not have been read yet
+                if self._pos >= len(self._buf):
+                    self._fill()
+                self._pos += 1
+            elif ch == '"':
+                in_string = not in_string
+                if not in_string and depth == 0:
+                    return
+            elif ch in "[{":
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    return
+
+
+def iter_region(
+    path: Path,
+    *,
+    chunk_size: int = 1 << 16,
+    progress: ProgressCallback | None = None,
+) -> Iterator[tuple[str, Any]]:
+    """Yield ``(kind, value)`` pairs from a region file as they are decoded.
+
+    Elements of the ``locations`` and ``journeys`` arrays are yielded one at a
+    time as ``("location", dict)`` and ``("journey", dict)``; every other
+    top-level key is yielded whole as ``(key, value)``.
+    """
+    total = path.stat().st_size
+    with path.open("rb") as fp:
+        stream = _JSONStream(fp, total, chunk_size, progress)
+        stream.expect("{")
+        if stream.peek() == "}":
+            return
+        while True:
+            key = stream.value()
+            stream.expect(":")
+            kind = _STREAMED_KEYS.get(key)
+            if kind is None:
+                yield key, stream.value()
+            else:
+                stream.expect("[")
+                if stream.peek() == "]":
+                    stream.expect("]")
+                else:
+                    while True:
+                        yield kind, stream.value()
+                        if stream.expect(",]") == "]":
+                            break
+            if stream.expect(",}") == "}":
+                return
+
+
+def read_region(path: Path, *, chunk_size: int = 1 << 16) -> str | None:
+    """The ``region`` of a region file, or None if it has none.
+
+    Reading stops at the ``region`` key; values before it are stepped over
+    without being decoded, so the cost is small wherever the key is and
+    smallest when it comes first.
+    """
+    with path.open("rb") as fp:
+        stream = _JSONStream(fp, path.stat().st_size, chunk_size, None)
+        stream.expect("{")
+        if stream.peek() == "}":
+            return None
+        while True:
+            key = stream.value()
+            stream.expect(":")
+            if key == "region":
+                return stream.value()
+            stream.skip()
+            if stream.expect(",}") == "}":
+                return None
+
+
+def stream_load(
+    path: Path,
+    *,
+    chunk_size: int = 1 << 16,
+    progress: ProgressCallback | None = None,
+    extras: dict[str, Any] | None = None,
+) -> WorldGraph:
+    """Build a :class:`WorldGraph` from *path*, one Location/Journey at a time.
+
+    Keys may appear in any order; journeys read before their endpoints are
+    held back and added once all locations are known.  Top-level keys the
+    graph does not use are stored in *extras* when given.
+    """
+    graph = WorldGraph(region="")
+    pending: list[Journey] = []
+    for kind, value in iter_region(path, chunk_size=chunk_size, progress=progress):
+        if kind == "location":
+            graph.add_location(Location.from_dict(value))
+        elif kind == "journey":
+            journey = Journey.from_dict(value)
+            if (graph.get_location(journey.from_id) is None
+                    or graph.get_location(journey.to_id) is None):
+                pending.append(journey)
+            else:
+                graph.add_journey(journey)
+        elif kind == "region":
+            graph.region = value
+        elif kind == "risk_stats":
+            graph.set_risk_stats(value)
+        elif extras is not None:
+            extras[kind] = value
+    for journey in pending:
+        graph.add_journey(journey)
+    return graph
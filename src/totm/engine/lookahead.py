@@ -0,0 +1,209 @@
+"""What-if lookahead — outcome distributions of candidate actions, by simulation.
+
+Before narrating, the GM may want to know how each exit or attack is likely
+to go.  :func:`lookahead` plays every candidate on *rollouts* forks of the
+engine (see ``StateEngine.fork``) and tallies how they ended::
+
+    forecasts = lookahead(engine, [("traverse", "j_down"), ("interact", "npc_rat", "attack")],
+                          rollouts=500)
+    forecasts[0].success_rate, forecasts[0].damage
+
+A candidate is one batch action (see :mod:`totm.engine.batch`) or a
+sequence of them played in order.  Every candidate is played against the
+same rollout seeds, so differences between candidates come from the
+candidates, not the dice; a given *seed* gives the same forecasts whatever
+the number of processes.
+
+The real engine is never touched.  Rollouts run on a process pool of
+*processes* workers (0 runs them in this process).  Where the ``fork``
+start method is safe — no other threads running — workers inherit the
+forked game instead of receiving a copy of the world; otherwise each worker
+gets it once, as ``to_state`` data.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import random
+import threading
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Sequence, Union
+
+from totm.engine.batch import Action, Outcome
+from totm.engine.store import StateEngine
+
+Candidate = Union[Action, Sequence[Action]]
+
+# One rollout: (outcome, damage taken, hp, location id, npc defeated)
+_Rollout = tuple[int, int, int, str, bool]
+
+# The game every worker plays from; see _run_pool
+_BASE: StateEngine | None = None
+
+
+@dataclass
+class Forecast:
+    """How one candidate ended across its rollouts.
+
+    ``outcomes`` counts the first non-successful outcome of each rollout
+    (``"success"`` if every action succeeded); ``damage`` and ``locations``
+    are histograms of total damage taken and of where the character ended.
+    """
+
+    plan: list[Action]
+    rollouts: int
+    outcomes: dict[str, int] = field(default_factory=dict)
+    damage: dict[int, int] = field(default_factory=dict)
+    locations: dict[str, int] = field(default_factory=dict)
+    # Rollouts that left the character at 0 hp
+    deaths: int = 0
+    # Rollouts in which an attacked NPC went from above 0 hp to 0
+    defeated: int = 0
+    mean_hp: float = 0.0
+
+    @property
+    def success_rate(self) -> float:
+        return self.outcomes.get("success", 0) / self.rollouts if self.rollouts else 0.0
+
+    @property
+    def mean_damage(self) -> float:
+        if not self.rollouts:
+            return 0.0
+        return sum(d * n for d, n in self.damage.items()) / self.rollouts
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "plan": [list(action) for action in self.plan],
+            "rollouts": self.rollouts,
+            "success_rate": self.success_rate,
+            "outcomes": self.outcomes,
+            "mean_damage": self.mean_damage,
+            "damage": {str(d): n for d, n in sorted(self.damage.items())},
+            "locations": self.locations,
+            "deaths": self.deaths,
+            "defeated": self.defeated,
+            "mean_hp": self.mean_hp,
+        }
+
+
+def lookahead(
+    engine: StateEngine,
+    candidates: Sequence[Candidate],
+    *,
+    rollouts: int = 200,
+    seed: int | None = None,
+    processes: int | None = None,
+) -> list[Forecast]:
+    """Forecast each of *candidates* over *rollouts* simulated plays, in order.
+
+    *processes* defaults to the CPU count; 0 simulates in this process.
+    """
+    if rollouts < 1:
+        raise ValueError("rollouts must be at least 1")
+    if processes is not None and processes < 0:
+        raise ValueError("processes must not be negative")
+    plans = [_plan(candidate) for candidate in candidates]
+    rng = random.Random(seed)
+    seeds = [rng.getrandbits(63) for _ in range(rollouts)]
+    base = engine.fork()
+
+    if processes is None:
+        processes = os.cpu_count() or 1
+    if processes == 0 or not plans:
+        played = [_play(base, plan, seeds) for plan in plans]
+    else:
+        played = _run_pool(base, plans, seeds, processes)
+    return [_summarize(plan, records) for plan, records in zip(plans, played)]
+
+
+def _plan(candidate: Candidate) -> list[Action]:
+    if not candidate:
+        raise ValueError("Empty lookahead candidate")
+    if isinstance(candidate[0], str):
+        return [tuple(candidate)]  # type: ignore[list-item]
+    return [tuple(action) for action in candidate]  # type: ignore[misc]
+
+
+def _play(base: StateEngine, plan: list[Action], seeds: list[int]) -> list[_Rollout]:
+    """Play *plan* on a fresh fork of *base* per seed."""
+    # NPCs the plan attacks that are still standing; only they can be defeated
+    attacked = dict.fromkeys(a[1] for a in plan if a[0] == "interact" and a[2] == "attack")
+    standing = [npc_id for npc_id in attacked if (_npc_hp(base, npc_id) or 0) > 0]
+    records = []
+    for seed in seeds:
+        sim = base.fork(seed)
+        result = sim.apply_actions(plan)
+        outcome = next((o for o in result.outcome if o != Outcome.SUCCESS), Outcome.SUCCESS)
+        hp = sim.character.hp if sim.character is not None else -1
+        defeated = any(_npc_hp(sim, npc_id) == 0 for npc_id in standing)
+        records.append((outcome, sum(result.damage), hp, sim.current_location_id or "", defeated))
+    return records
+
+
+def _npc_hp(engine: StateEngine, npc_id: str) -> int | None:
+    loc = engine.world.locate_npc(npc_id)
+    if loc is None:
+        return None
+    return next(n.hp for n in loc.npcs if n.id == npc_id)
+
+
+def _summarize(plan: list[Action], records: list[_Rollout]) -> Forecast:
+    outcomes = Counter(Outcome(r[0]).name.lower() for r in records)
+    return Forecast(
+        plan=plan,
+        rollouts=len(records),
+        outcomes=dict(outcomes.most_common()),
+        damage=dict(sorted(Counter(r[1] for r in records).items())),
+        locations=dict(Counter(r[3] for r in records).most_common()),
+        deaths=sum(1 for r in records if r[2] == 0),
+        defeated=sum(1 for r in records if r[4]),
+        mean_hp=sum(r[2] for r in records) / len(records),
+    )
+
+
+# ---------------------------------------------------------------------------
+# Process pool
+# ---------------------------------------------------------------------------
+
+def _run_pool(
+    base: StateEngine, plans: list[list[Action]], seeds: list[int], processes: int,
+) -> list[list[_Rollout]]:
+    """Spread (plan, seed chunk) tasks over *processes* workers; results per plan."""
+    global _BASE
+    chunk = -(-len(seeds) * len(plans) // processes)  # ceil: about one task per worker
+    chunk = max(1, min(chunk, len(seeds)))
+    tasks = [(i, seeds[j:j + chunk]) for i in range(len(plans)) for j in range(0, len(seeds), chunk)]
+
+    if "fork" in multiprocessing.get_all_start_methods() and threading.active_count() == 1:
+        context = multiprocessing.get_context("fork")
+        initargs: tuple[Any, ...] = (None,)
+        _BASE = base
+    else:
+        context = multiprocessing.get_context("spawn")
+        initargs = (base.to_state(),)
+    try:
+        with ProcessPoolExecutor(
+            max_workers=min(processes, len(tasks)), mp_context=context,
+            initializer=_init_worker, initargs=initargs,
+        ) as pool:
+            futures = [pool.submit(_work, plans[i], chunk_seeds) for i, chunk_seeds in tasks]
+            played: list[list[_Rollout]] = [[] for _ in plans]
+            for (i, _), future in zip(tasks, futures):
+                played[i].extend(future.result())
+    finally:
+        _BASE = None
+    return played
+
+
+def _init_worker(state: dict[str, Any] | None) -> None:
+    global _BASE
+    if state is not None:
+        _BASE = StateEngine.from_state(state)
+
+
+def _work(plan: list[Action], seeds: list[int]) -> list[_Rollout]:
+    assert _BASE is not None, "lookahead worker was not initialized"
+    return _play(_BASE, plan, seeds)
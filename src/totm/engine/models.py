@@ -1,13 +1,21 @@
-"""Core data models for TOTM: Characters, Locations, Journeys, NPCs."""
+"""Core data models for TOTM: Characters, Locations, Journeys, NPCs.
+
+The models are slotted dataclasses: a world holds one object per location,
+journey and NPC, and a per-instance ``__dict__`` roughly doubles each one.
+``from_dict`` interns ids and other short, heavily repeated strings so a
+loaded world shares one copy of each instead of one per JSON occurrence.
+"""
 
 from __future__ import annotations
 
-import json
-from dataclasses import dataclass, field, asdict
+import sys
+from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
 from typing import Any
 
+from totm.engine import codec
+
 
 # ---------------------------------------------------------------------------
 # Character
@@ -31,7 +39,7 @@ _CLASS_DEFAULTS: dict[CharacterClass, dict[str, int]] = {
 }
 
 
-@dataclass
+@dataclass(slots=True)
 class Character:
     """A player character with class-based stats."""
 
@@ -67,22 +75,40 @@ class Character:
     # -- Serialization ---------------------------------------------------
 
     def to_dict(self) -> dict[str, Any]:
-        d = asdict(self)
-        d["char_class"] = self.char_class.value
-        return d
+        return {
+            "name": self.name,
+            "char_class": self.char_class.value,
+            "brawn": self.brawn,
+            "brains": self.brains,
+            "faith": self.faith,
+            "speed": self.speed,
+            "hp": self.hp,
+            "max_hp": self.max_hp,
+            "xp": self.xp,
+            "inventory": list(self.inventory),
+        }
 
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> Character:
-        data = dict(data)  # shallow copy
-        data["char_class"] = CharacterClass(data["char_class"])
-        return cls(**data)
+        return cls(
+            name=data["name"],
+            char_class=CharacterClass(data["char_class"]),
+            brawn=data.get("brawn", 0),
+            brains=data.get("brains", 0),
+            faith=data.get("faith", 0),
+            speed=data.get("speed", 0),
+            hp=data.get("hp", 0),
+            max_hp=data.get("max_hp", 0),
+            xp=data.get("xp", 0),
+            inventory=list(data.get("inventory", ())),
+        )
 
     def to_json(self) -> str:
-        return json.dumps(self.to_dict(), indent=2)
+        return codec.dumps_str(self.to_dict(), pretty=True)
 
     @classmethod
     def from_json(cls, raw: str) -> Character:
-        return cls.from_dict(json.loads(raw))
+        return cls.from_dict(codec.loads(raw))
 
     # -- Queries ---------------------------------------------------------
 
@@ -91,18 +117,25 @@ class Character:
         return self.hp > 0
 
     def primary_stat(self) -> tuple[str, int]:
-        """Return the name and value of the character's highest stat."""
-        stats = {"brawn": self.brawn, "brains": self.brains,
-                 "faith": self.faith, "speed": self.speed}
-        name = max(stats, key=stats.get)  # type: ignore[arg-type]
-        return name, stats[name]
+        """Return the name and value of the character's highest stat.
+
+        Ties go to the first stat in brawn, brains, faith, speed order.
+        """
+        name, value = "brawn", self.brawn
+        if self.brains > value:
+            name, value = "brains", self.brains
+        if self.faith > value:
+            name, value = "faith", self.faith
+        if self.speed > value:
+            name, value = "speed", self.speed
+        return name, value
 
 
 # ---------------------------------------------------------------------------
 # NPC
 # ---------------------------------------------------------------------------
 
-@dataclass
+@dataclass(slots=True)
 class NPC:
     """A non-player character inhabiting a Location."""
 
@@ -113,18 +146,30 @@ class NPC:
     description: str = ""
 
     def to_dict(self) -> dict[str, Any]:
-        return asdict(self)
+        return {
+            "id": self.id,
+            "name": self.name,
+            "hp": self.hp,
+            "hostile": self.hostile,
+            "description": self.description,
+        }
 
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> NPC:
-        return cls(**data)
+        return cls(
+            id=sys.intern(data["id"]),
+            name=data["name"],
+            hp=data.get("hp", 10),
+            hostile=data.get("hostile", False),
+            description=data.get("description", ""),
+        )
 
 
 # ---------------------------------------------------------------------------
 # Location (Graph Node)
 # ---------------------------------------------------------------------------
 
-@dataclass
+@dataclass(slots=True)
 class Location:
     """A node in the world graph."""
 
@@ -136,22 +181,32 @@ class Location:
     gm_guide: str = ""
 
     def to_dict(self) -> dict[str, Any]:
-        d = asdict(self)
-        d["npcs"] = [npc.to_dict() for npc in self.npcs]
-        return d
+        return {
+            "id": self.id,
+            "name": self.name,
+            "description": self.description,
+            "npcs": [npc.to_dict() for npc in self.npcs],
+            "inventory": list(self.inventory),
+            "gm_guide": self.gm_guide,
+        }
 
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> Location:
-        data = dict(data)
-        data["npcs"] = [NPC.from_dict(n) for n in data.get("npcs", [])]
-        return cls(**data)
+        return cls(
+            id=sys.intern(data["id"]),
+            name=data["name"],
+            description=data.get("description", ""),
+            npcs=[NPC.from_dict(n) for n in data.get("npcs", ())],
+            inventory=[sys.intern(item) for item in data.get("inventory", ())],
+            gm_guide=data.get("gm_guide", ""),
+        )
 
 
 # ---------------------------------------------------------------------------
 # Journey (Graph Edge)
 # ---------------------------------------------------------------------------
 
-@dataclass
+@dataclass(slots=True)
 class Journey:
     """A directed edge between two Locations."""
 
@@ -165,8 +220,27 @@ class Journey:
     description: str = ""
 
     def to_dict(self) -> dict[str, Any]:
-        return asdict(self)
+        return {
+            "id": self.id,
+            "from_id": self.from_id,
+            "to_id": self.to_id,
+            "direction": self.direction,
+            "duration": self.duration,
+            "difficulty": self.difficulty,
+            "risks": list(self.risks),
+            "description": self.description,
+        }
 
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> Journey:
-        return cls(**data)
+        intern = sys.intern
+        return cls(
+            id=intern(data["id"]),
+            from_id=intern(data["from_id"]),
+            to_id=intern(data["to_id"]),
+            direction=intern(data.get("direction", "")),
+            duration=intern(data.get("duration", "")),
+            difficulty=data.get("difficulty", 1),
+            risks=[intern(r) for r in data.get("risks", ())],
+            description=data.get("description", ""),
+        )
@@ -0,0 +1,100 @@
+"""NeighborhoodCache — memoized k-hop neighborhoods for the GM.
+
+The GM rebuilds its picture of the local area with a burst of
+``get_location`` / ``get_exits`` calls every turn, although the area rarely
+changes between turns.  :class:`NeighborhoodCache` keeps the most recently
+used neighborhoods, keyed by ``(location, k)``, and follows the graph
+through its listeners.
+
+Structural changes (and a new risk table) retire every entry.  Content
+changes (an NPC wounded, an item picked up) arrive as ``"update_location"``
+events and drop only the entries whose neighborhood contains that location.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Any, Callable
+
+from totm.engine.graph import Neighborhood, WorldGraph
+from totm.engine.models import Journey, Location
+
+# (location_id, k)
+_Key = tuple[str, int]
+
+
+class NeighborhoodCache:
+    """Bounded LRU of :meth:`WorldGraph.neighborhood` results.
+
+    *summarize*, if given, is applied to each :class:`Neighborhood` before it
+    is cached, so callers can memoize their own rendering of it.
+    """
+
+    def __init__(
+        self,
+        world: WorldGraph,
+        maxsize: int = 256,
+        summarize: Callable[[Neighborhood], Any] | None = None,
+    ) -> None:
+        self.world = world
+        self.maxsize = maxsize
+        self._summarize = summarize
+        self._entries: OrderedDict[_Key, tuple[Any, tuple[str, ...]]] = OrderedDict()
+        # location_id -> keys of the entries whose neighborhood contains it
+        self._by_member: dict[str, set[_Key]] = {}
+        self.hits = 0
+        self.misses = 0
+        world.add_listener(self._on_change)
+
+    def close(self) -> None:
+        """Stop following the graph."""
+        self.world.remove_listener(self._on_change)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, location_id: str, k: int) -> Any:
+        """Return the (summarized) neighborhood of *location_id* within *k* hops."""
+        key = (location_id, k)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+        self.misses += 1
+        hood = self.world.neighborhood(location_id, k)
+        value = self._summarize(hood) if self._summarize else hood
+        members = tuple(hood.depth)
+        self._entries[key] = (value, members)
+        for lid in members:
+            self._by_member.setdefault(lid, set()).add(key)
+        while len(self._entries) > self.maxsize:
+            self._drop(next(iter(self._entries)))
+        return value
+
+    def invalidate(self, location_id: str | None = None) -> None:
+        """Drop entries containing *location_id*, or everything if omitted."""
+        if location_id is None:
+            self._entries.clear()
+            self._by_member.clear()
+            return
+        for key in list(self._by_member.get(location_id, ())):
+            self._drop(key)
+
+    # -- Maintenance -----------------------------------------------------
+
+    def _drop(self, key: _Key) -> None:
+        _, members = self._entries.pop(key)
+        for lid in members:
+            keys = self._by_member.get(lid)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_member[lid]
+
+    def _on_change(self, event: str, subject: Location | Journey | None) -> None:
+        if event == "update_location":
+            self.invalidate(subject.id)
+        else:
+            self.invalidate()
@@ -0,0 +1,424 @@
+"""NPCTable — an optional columnar (struct-of-arrays) NPC store.
+
+World-wide NPC operations — regenerating hit points overnight, counting
+hostiles per area — are Python loops over ``NPC`` objects when NPCs live
+in per-location lists.  :meth:`NPCTable.attach` moves every NPC of a
+:class:`WorldGraph` into NumPy columns (``hp``, ``hostile``, ``location``)
+and replaces each ``Location.npcs`` with a list-like view over its rows, so
+bulk updates run vectorized while the engine keeps reading and updating
+individual NPCs exactly as before::
+
+    table = NPCTable.attach(world)
+    table.heal(2, where=~table.hostile)     # every friendly NPC, one call
+    table.hostile_counts()                  # per location, aligned with location_ids
+
+NumPy is optional; constructing a table without it raises ``ImportError``.
+NPC ids, names and descriptions stay Python strings — ids are the same
+interned objects the graph's NPC index already holds.
+"""
+
+from __future__ import annotations
+
+from collections.abc import MutableSequence
+from typing import TYPE_CHECKING, Any, overload
+
+from totm.engine.models import Journey, Location, NPC
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None  # type: ignore[assignment]
+
+if TYPE_CHECKING:
+    from totm.engine.graph import WorldGraph
+
+# Location column value for rows no longer in the world
+DETACHED = -1
+
+
+class NPCTable:
+    """Columnar storage for every NPC of one world.
+
+    Rows are never reused; an NPC removed from the world keeps its row with
+    ``location == DETACHED``.  The ``hp``, ``hostile`` and ``location``
+    properties are NumPy views and may be written directly, but only the
+    bulk methods (:meth:`heal`, :meth:`damage`, :meth:`set_hostile`) notify
+    graph listeners such as caches.
+    """
+
+    def __init__(self, capacity: int = 1024) -> None:
+        if np is None:
+            raise ImportError("NPCTable requires numpy (pip install numpy)")
+        self.world: WorldGraph | None = None
+        self._n = 0
+        self._hp = np.zeros(capacity, dtype=np.int32)
+        self._hostile = np.zeros(capacity, dtype=np.bool_)
+        self._location = np.full(capacity, DETACHED, dtype=np.int32)
+        self._ids: list[str] = []
+        self._names: list[str] = []
+        self._descriptions: list[str] = []
+        self.location_ids: list[str] = []
+        self._loc_index: dict[str, int] = {}
+        # location index -> rows of the NPCs there, in list order; a range
+        # until the location's NPC list is first changed
+        self._members: list[range | list[int]] = []
+
+    @classmethod
+    def attach(cls, world: WorldGraph) -> NPCTable:
+        """Move *world*'s NPCs into a new table and follow the graph."""
+        locations = world.all_locations()
+        npcs = [npc for loc in locations for npc in loc.npcs]
+        counts = [len(loc.npcs) for loc in locations]
+        n = len(npcs)
+
+        table = cls(capacity=max(n, 16))
+        table.world = world
+        table._n = n
+        table._hp[:n] = [npc.hp for npc in npcs]
+        table._hostile[:n] = [npc.hostile for npc in npcs]
+        table._location[:n] = np.repeat(np.arange(len(locations), dtype=np.int32), counts)
+        table._ids = [npc.id for npc in npcs]
+        table._names = [npc.name for npc in npcs]
+        table._descriptions = [npc.description for npc in npcs]
+        table.location_ids = [loc.id for loc in locations]
+        table._loc_index = {lid: idx for idx, lid in enumerate(table.location_ids)}
+        start = 0
+        for idx, (loc, count) in enumerate(zip(locations, counts)):
+            table._members.append(range(start, start + count))
+            start += count
+            loc.npcs = NPCList(table, idx)
+        world.add_listener(table._on_change)
+        return table
+
+    def detach(self) -> None:
+        """Give every location a plain list of ``NPC`` objects back and stop following."""
+        if self.world is None:
+            return
+        self.world.remove_listener(self._on_change)
+        for loc in self.world.all_locations():
+            if isinstance(loc.npcs, NPCList) and loc.npcs._table is self:
+                loc.npcs = loc.npcs.to_list()
+        self.world = None
+
+    # -- Columns ---------------------------------------------------------
+
+    def __len__(self) -> int:
+        return self._n
+
+    @property
+    def hp(self) -> Any:
+        return self._hp[:self._n]
+
+    @property
+    def hostile(self) -> Any:
+        return self._hostile[:self._n]
+
+    @property
+    def location(self) -> Any:
+        """Index into ``location_ids`` per row, ``DETACHED`` if gone."""
+        return self._location[:self._n]
+
+    @property
+    def ids(self) -> list[str]:
+        return self._ids
+
+    @property
+    def live(self) -> Any:
+        """Mask of rows still in the world."""
+        return self.location != DETACHED
+
+    def row(self, npc_id: str) -> int:
+        """Row of the live NPC *npc_id*."""
+        loc = self.world.locate_npc(npc_id) if self.world is not None else None
+        candidates = (self._members[self._loc_index[loc.id]] if loc is not None
+                      else range(self._n))
+        for r in candidates:
+            if self._ids[r] == npc_id and self._location[r] != DETACHED:
+                return r
+        raise ValueError(f"NPC '{npc_id}' not in table")
+
+    def view(self, row: int) -> NPCView:
+        return NPCView(self, row)
+
+    # -- Bulk operations -------------------------------------------------
+
+    def _mask(self, where: Any) -> Any:
+        live = self.live
+        return live if where is None else live & np.asarray(where, dtype=np.bool_)
+
+    def heal(self, amount: int, *, where: Any = None, cap: int | None = None) -> int:
+        """Add *amount* hp to the selected live NPCs, at most up to *cap*.
+
+        NPCs already above *cap* keep their hp.  Returns the number of NPCs
+        selected.
+        """
+        mask = self._mask(where)
+        hp = self.hp
+        if cap is None:
+            hp[mask] += amount
+        else:
+            current = hp[mask]
+            hp[mask] = np.maximum(np.minimum(current + amount, cap), current)
+        self._changed(mask)
+        return int(mask.sum())
+
+    def damage(self, amount: int, *, where: Any = None) -> int:
+        """Subtract *amount* hp (floored at 0) from the selected live NPCs."""
+        mask = self._mask(where)
+        hp = self.hp
+        hp[mask] = np.maximum(hp[mask] - amount, 0)
+        self._changed(mask)
+        return int(mask.sum())
+
+    def set_hostile(self, value: bool, *, where: Any = None) -> int:
+        mask = self._mask(where)
+        self.hostile[mask] = value
+        self._changed(mask)
+        return int(mask.sum())
+
+    def count_hostile(self, *, where: Any = None) -> int:
+        return int((self._mask(where) & self.hostile).sum())
+
+    def hostile_counts(self) -> Any:
+        """Live hostile NPCs per location, aligned with ``location_ids``."""
+        mask = self.live & self.hostile
+        return np.bincount(self.location[mask], minlength=len(self.location_ids))
+
+    def at(self, location_id: str) -> Any:
+        """Mask of the NPCs at *location_id*."""
+        idx = self._loc_index.get(location_id)
+        if idx is None:
+            return np.zeros(self._n, dtype=np.bool_)
+        return self.location == idx
+
+    def _changed(self, mask: Any) -> None:
+        if self.world is None:
+            return
+        self.world._version += 1
+        listeners = [fn for fn in self.world._listeners if fn != self._on_change]
+        if not listeners:
+            return
+        for idx in np.unique(self.location[mask]):
+            loc = self.world.get_location(self.location_ids[idx])
+            if loc is not None:
+                for fn in listeners:
+                    fn("update_location", loc)
+
+    # -- Rows ------------------------------------------------------------
+
+    def _append(self, npc: NPC, loc: int) -> int:
+        if self._n == len(self._hp):
+            size = 2 * len(self._hp)
+            self._hp = np.resize(self._hp, size)
+            self._hostile = np.resize(self._hostile, size)
+            self._location = np.resize(self._location, size)
+        r = self._n
+        self._hp[r] = npc.hp
+        self._hostile[r] = npc.hostile
+        self._location[r] = loc
+        self._ids.append(npc.id)
+        self._names.append(npc.name)
+        self._descriptions.append(npc.description)
+        self._n += 1
+        return r
+
+    def _place(self, npc: NPC, loc: int) -> int:
+        """Row for *npc* at location index *loc*, adding it if it is not ours."""
+        if isinstance(npc, NPCView) and npc._table is self:
+            r = npc._row
+            old = int(self._location[r])
+            if old != DETACHED and old != loc:
+                self._rows(old).remove(r)
+            self._location[r] = loc
+            return r
+        return self._append(npc, loc)
+
+    def _adopt_location(self, location: Location) -> None:
+        idx = self._loc_index.get(location.id)
+        if idx is None:
+            idx = self._loc_index[location.id] = len(self.location_ids)
+            self.location_ids.append(location.id)
+            self._members.append([])
+        else:
+            self._detach_rows(idx)
+        npcs = location.npcs
+        rows = self._rows(idx)
+        for npc in npcs:
+            rows.append(self._place(npc, idx))
+        location.npcs = NPCList(self, idx)
+
+    def _rows(self, idx: int) -> list[int]:
+        """Mutable row list of location *idx*."""
+        rows = self._members[idx]
+        if type(rows) is range:
+            rows = self._members[idx] = list(rows)
+        return rows  # type: ignore[return-value]
+
+    def _detach_rows(self, idx: int) -> None:
+        rows = self._rows(idx)
+        self._location[rows] = DETACHED
+        rows.clear()
+
+    def _on_change(self, event: str, subject: Location | Journey) -> None:
+        if event == "add_location":
+            assert isinstance(subject, Location)
+            npcs = subject.npcs
+            if not (isinstance(npcs, NPCList) and npcs._table is self):
+                self._adopt_location(subject)
+        elif event == "remove_location":
+            idx = self._loc_index.get(subject.id)
+            if idx is not None:
+                assert isinstance(subject, Location)
+                subject.npcs = NPCList(self, idx).to_list()
+                self._detach_rows(idx)
+
+
+class NPCView:
+    """An ``NPC``-compatible proxy for one row of an :class:`NPCTable`."""
+
+    __slots__ = ("_table", "_row")
+
+    def __init__(self, table: NPCTable, row: int) -> None:
+        self._table = table
+        self._row = row
+
+    @property
+    def id(self) -> str:
+        return self._table._ids[self._row]
+
+    @id.setter
+    def id(self, value: str) -> None:
+        self._table._ids[self._row] = value
+
+    @property
+    def name(self) -> str:
+        return self._table._names[self._row]
+
+    @name.setter
+    def name(self, value: str) -> None:
+        self._table._names[self._row] = value
+
+    @property
+    def description(self) -> str:
+        return self._table._descriptions[self._row]
+
+    @description.setter
+    def description(self, value: str) -> None:
+        self._table._descriptions[self._row] = value
+
+    @property
+    def hp(self) -> int:
+        return int(self._table._hp[self._row])
+
+    @hp.setter
+    def hp(self, value: int) -> None:
+        self._table._hp[self._row] = value
+
+    @property
+    def hostile(self) -> bool:
+        return bool(self._table._hostile[self._row])
+
+    @hostile.setter
+    def hostile(self, value: bool) -> None:
+        self._table._hostile[self._row] = value
+
+    def to_npc(self) -> NPC:
+        return NPC(id=self.id, name=self.name, hp=self.hp,
+                   hostile=self.hostile, description=self.description)
+
+    def to_dict(self) -> dict[str, Any]:
+        return self.to_npc().to_dict()
+
+    def __replace__(self, **changes: Any) -> NPC:
+        # copy.replace() on a view yields a detached NPC object
+        npc = self.to_npc()
+        for name, value in changes.items():
+            setattr(npc, name, value)
+        return npc
+
+    def __eq__(self, other: object) -> bool:
+        # Views are rows: two identical goblins are still two NPCs, so that
+        # NPCList.remove/index find the row asked for
+        if isinstance(other, NPCView):
+            return self._table is other._table and self._row == other._row
+        if isinstance(other, NPC):
+            return self.to_npc() == other
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"NPCView(row={self._row}, {self.to_npc()!r})"
+
+
+class NPCList(MutableSequence):
+    """The NPCs at one location, as a mutable list of :class:`NPCView` rows."""
+
+    __slots__ = ("_table", "_loc")
+
+    def __init__(self, table: NPCTable, loc: int) -> None:
+        self._table = table
+        self._loc = loc
+
+    @property
+    def _rows(self) -> range | list[int]:
+        return self._table._members[self._loc]
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    @overload
+    def __getitem__(self, i: int) -> NPCView: ...
+    @overload
+    def __getitem__(self, i: slice) -> list[NPCView]: ...
+
+    def __getitem__(self, i: int | slice) -> NPCView | list[NPCView]:
+        if isinstance(i, slice):
+            return [NPCView(self._table, r) for r in self._rows[i]]
+        return NPCView(self._table, self._rows[i])
+
+    def __iter__(self):  # type: ignore[override]
+        table = self._table
+        return (NPCView(table, r) for r in list(self._rows))
+
+    def __setitem__(self, i: int, npc: NPC) -> None:  # type: ignore[override]
+        rows = self._table._rows(self._loc)
+        old = rows[i]
+        new = self._table._place(npc, self._loc)
+        if new == old:
+            return
+        if new in rows:
+            rows.remove(new)
+        rows[rows.index(old)] = new
+        self._table._location[old] = DETACHED
+
+    def __delitem__(self, i: int) -> None:  # type: ignore[override]
+        rows = self._table._rows(self._loc)
+        self._table._location[rows[i]] = DETACHED
+        del rows[i]
+
+    def insert(self, i: int, npc: NPC) -> None:
+        rows = self._table._rows(self._loc)
+        r = self._table._place(npc, self._loc)
+        if r in rows:
+            rows.remove(r)
+        rows.insert(i, r)
+
+    def to_list(self) -> list[NPC]:
+        return [view.to_npc() for view in self]
+
+    def __eq__(self, other: object) -> bool:
+        # By value, like the lists of NPCs they stand in for
+        if isinstance(other, (NPCList, list)):
+            return len(self) == len(other) and all(
+                _value(a) == _value(b) for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"NPCList({list(self)!r})"
+
+
+def _value(npc: NPC | NPCView) -> NPC:
+    return npc.to_npc() if isinstance(npc, NPCView) else npc
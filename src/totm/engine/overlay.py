@@ -0,0 +1,351 @@
+"""Copy-on-write session worlds over a shared, immutable template.
+
+Every New Game used to re-parse the world file into a private
+:class:`WorldGraph`, although a session only ever changes a handful of NPC
+hit points and inventories.  :func:`load_template` parses each world file
+once per process and freezes it; a :class:`SessionWorld` then records only
+the fields a session changes and falls through to the template for
+everything else.
+"""
+
+from __future__ import annotations
+
+import copy
+import threading
+from pathlib import Path
+from typing import Any
+
+from totm.engine.binary import open_world
+from totm.engine.graph import GraphListener, WorldGraph
+from totm.engine.models import Journey, Location, NPC
+from totm.engine.risks import DEFAULT_RISK_STATS
+
+# (resolved path, mtime) -> shared template
+_TEMPLATES: dict[tuple[Path, float], WorldGraph] = {}
+# Guards _TEMPLATES; held while parsing, so each file is parsed once
+_TEMPLATES_LOCK = threading.Lock()
+
+
+def load_template(path: Path) -> WorldGraph:
+    """Return the shared, frozen template for *path*, parsing it at most once.
+
+    Compiled ``.totm`` files are memory-mapped instead of parsed.  The
+    template must not be mutated; wrap it in a :class:`SessionWorld`.
+    """
+    resolved = path.resolve()
+    key = (resolved, resolved.stat().st_mtime)
+    with _TEMPLATES_LOCK:
+        template = _TEMPLATES.get(key)
+        if template is None:
+            if resolved.suffix == ".totm":
+                template = open_world(resolved)  # type: ignore[assignment]
+            else:
+                template = WorldGraph.load(resolved)
+                template.freeze()
+            # Drop templates for older versions of the same file
+            for stale in [k for k in _TEMPLATES if k[0] == resolved]:
+                del _TEMPLATES[stale]
+            _TEMPLATES[key] = template
+        return template
+
+
+def template_path(template: WorldGraph) -> Path | None:
+    """The file *template* was parsed from by :func:`load_template`, if it was."""
+    with _TEMPLATES_LOCK:
+        for (path, _), loaded in _TEMPLATES.items():
+            if loaded is template:
+                return path
+    return None
+
+
+class SessionWorld:
+    """A per-session, ``WorldGraph``-compatible overlay on a template world.
+
+    Location fields (``name``, ``description``, ``gm_guide``, ``inventory``)
+    and NPC fields are patched per entity; a location whose NPC list changes
+    shape (an NPC moved in or out) owns a private copy of that list.
+    Locations are materialized on first read after a change and cached.
+
+    The world's structure — locations and journeys — is the template's and
+    cannot be changed through a session.
+    """
+
+    def __init__(self, template: WorldGraph) -> None:
+        self.template = template
+        # location_id -> {field: value}; "npcs" holds an owned NPC list
+        self._loc_patches: dict[str, dict[str, Any]] = {}
+        # location_id -> npc_id -> {field: value}, for locations without an owned list
+        self._npc_patches: dict[str, dict[str, dict[str, Any]]] = {}
+        # npc_id -> location_id for NPCs that left their template location
+        self._npc_moves: dict[str, str] = {}
+        self._views: dict[str, Location] = {}
+        self._listeners: list[GraphListener] = []
+        # Patches applied by this session; see version
+        self._revision = 0
+
+    # -- Template pass-through -------------------------------------------
+
+    @property
+    def region(self) -> str:
+        return self.template.region
+
+    @property
+    def version(self) -> int:
+        """Bumped by every patch, like ``WorldGraph.version``."""
+        return self.template.version + self._revision
+
+    frozen = True
+
+    def get_journey(self, journey_id: str) -> Journey | None:
+        return self.template.get_journey(journey_id)
+
+    def all_journeys(self) -> list[Journey]:
+        return self.template.all_journeys()
+
+    def exits(self, location_id: str) -> list[Journey]:
+        return self.template.exits(location_id)
+
+    def incoming(self, location_id: str) -> list[Journey]:
+        return self.template.incoming(location_id)
+
+    def journeys_with_risk(self, keyword: str) -> list[Journey]:
+        return self.template.journeys_with_risk(keyword)
+
+    @property
+    def risk_stats(self) -> dict[str, str]:
+        return self.template.risk_stats
+
+    def journey_stat(self, journey: Journey) -> str | None:
+        return self.template.journey_stat(journey)
+
+    neighborhood = WorldGraph.neighborhood
+
+    def add_listener(self, listener: GraphListener) -> None:
+        """Call *listener* with ``"update_location"`` after each patch."""
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: GraphListener) -> None:
+        self._listeners.remove(listener)
+
+    def _read_only(self, *args: Any, **kwargs: Any) -> None:
+        raise RuntimeError("SessionWorld cannot change the world's structure")
+
+    add_location = remove_location = add_journey = remove_journey = _read_only
+
+    # -- Locations -------------------------------------------------------
+
+    def get_location(self, location_id: str) -> Location | None:
+        view = self._views.get(location_id)
+        if view is not None:
+            return view
+        base = self.template.get_location(location_id)
+        if base is None or (location_id not in self._loc_patches
+                            and location_id not in self._npc_patches):
+            return base
+        view = self._materialize(base)
+        self._views[location_id] = view
+        return view
+
+    def all_locations(self) -> list[Location]:
+        return [self.get_location(loc.id) for loc in self.template.all_locations()]  # type: ignore[misc]
+
+    def neighbors(self, location_id: str) -> list[Location]:
+        return [self.get_location(loc.id) for loc in self.template.neighbors(location_id)]  # type: ignore[misc]
+
+    def _materialize(self, base: Location) -> Location:
+        patch = self._loc_patches.get(base.id, {})
+        npc_patches = self._npc_patches.get(base.id, {})
+        npcs = patch.get("npcs")
+        if npcs is None:
+            npcs = [
+                copy.replace(npc, **npc_patches[npc.id]) if npc.id in npc_patches else npc
+                for npc in base.npcs
+            ]
+        return Location(
+            id=base.id,
+            name=patch.get("name", base.name),
+            description=patch.get("description", base.description),
+            npcs=list(npcs),
+            inventory=list(patch.get("inventory", base.inventory)),
+            gm_guide=patch.get("gm_guide", base.gm_guide),
+        )
+
+    def _require(self, location_id: str) -> Location:
+        loc = self.get_location(location_id)
+        if loc is None:
+            raise ValueError(f"Location '{location_id}' not in graph")
+        return loc
+
+    def _patch(self, location_id: str, **fields: Any) -> None:
+        self._loc_patches.setdefault(location_id, {}).update(fields)
+        self._changed(location_id)
+
+    def _changed(self, location_id: str) -> None:
+        self._views.pop(location_id, None)
+        self._revision += 1
+        if self._listeners:
+            loc = self.get_location(location_id)
+            for listener in self._listeners:
+                listener("update_location", loc)
+
+    def update_location(self, location_id: str, **changes: Any) -> Location:
+        """Patch descriptive fields (name, description, gm_guide) of a location."""
+        self._require(location_id)
+        unknown = set(changes) - {"name", "description", "gm_guide"}
+        if unknown:
+            raise ValueError(f"Cannot patch location fields: {sorted(unknown)}")
+        self._patch(location_id, **changes)
+        return self._require(location_id)
+
+    # -- NPCs and items --------------------------------------------------
+
+    def update_npc(self, location_id: str, npc_id: str, **changes: Any) -> NPC:
+        loc = self._require(location_id)
+        if not any(n.id == npc_id for n in loc.npcs):
+            raise ValueError(f"NPC '{npc_id}' not at location '{location_id}'")
+        owned = self._loc_patches.get(location_id, {}).get("npcs")
+        if owned is not None:
+            npc = next(n for n in owned if n.id == npc_id)
+            for name, value in changes.items():
+                setattr(npc, name, value)
+        else:
+            patches = self._npc_patches.setdefault(location_id, {})
+            patches.setdefault(npc_id, {}).update(changes)
+        self._changed(location_id)
+        return next(n for n in self._require(location_id).npcs if n.id == npc_id)
+
+    def move_npc(self, npc_id: str, to_location_id: str) -> NPC:
+        src = self.locate_npc(npc_id)
+        if src is None:
+            raise ValueError(f"NPC '{npc_id}' not in graph")
+        self._require(to_location_id)
+        npc = next(n for n in src.npcs if n.id == npc_id)
+        # Both lists become owned so the NPC's current fields travel with it
+        moved = copy.replace(npc)
+        self._own_npcs(src.id, [n for n in src.npcs if n.id != npc_id])
+        # Read after the source changed: it may be the destination
+        dest = self._require(to_location_id)
+        self._own_npcs(dest.id, [*self._copies(dest.npcs), moved])
+        self._npc_moves[npc_id] = to_location_id
+        return moved
+
+    def _own_npcs(self, location_id: str, npcs: list[NPC]) -> None:
+        self._npc_patches.pop(location_id, None)
+        self._patch(location_id, npcs=self._copies(npcs))
+
+    @staticmethod
+    def _copies(npcs: list[NPC]) -> list[NPC]:
+        return [copy.replace(n) for n in npcs]
+
+    def add_item(self, location_id: str, item: str) -> None:
+        loc = self._require(location_id)
+        self._patch(location_id, inventory=[*loc.inventory, item])
+
+    def remove_item(self, location_id: str, item: str) -> None:
+        loc = self._require(location_id)
+        if item not in loc.inventory:
+            raise ValueError(f"Item '{item}' not at location '{location_id}'")
+        inventory = list(loc.inventory)
+        inventory.remove(item)
+        self._patch(location_id, inventory=inventory)
+
+    # -- Index queries ---------------------------------------------------
+
+    def locate_npc(self, npc_id: str) -> Location | None:
+        location_id = self._npc_moves.get(npc_id)
+        if location_id is not None:
+            return self.get_location(location_id)
+        base = self.template.locate_npc(npc_id)
+        return None if base is None else self.get_location(base.id)
+
+    def locations_with_item(self, item: str) -> list[Location]:
+        found = [
+            self.get_location(loc.id) for loc in self.template.locations_with_item(item)
+            if "inventory" not in self._loc_patches.get(loc.id, {})
+        ]
+        found += [
+            self.get_location(lid) for lid, patch in self._loc_patches.items()
+            if item in patch.get("inventory", ())
+        ]
+        return found  # type: ignore[return-value]
+
+    # -- Forking ---------------------------------------------------------
+
+    def fork(self) -> SessionWorld:
+        """An independent overlay on the same template, starting from this one's changes.
+
+        Costs time proportional to the changes, not the world.
+        """
+        world = SessionWorld(self.template)
+        for location_id, patch in self._loc_patches.items():
+            patch = dict(patch)
+            if "npcs" in patch:
+                # Owned NPCs are updated in place, so each overlay needs its own
+                patch["npcs"] = self._copies(patch["npcs"])
+            world._loc_patches[location_id] = patch
+        world._npc_patches = {
+            location_id: {npc_id: dict(fields) for npc_id, fields in npcs.items()}
+            for location_id, npcs in self._npc_patches.items()
+        }
+        world._npc_moves = dict(self._npc_moves)
+        return world
+
+    # -- Introspection / serialization -----------------------------------
+
+    @property
+    def patched_locations(self) -> set[str]:
+        """Ids of locations this session has changed."""
+        return set(self._loc_patches) | set(self._npc_patches)
+
+    def to_dict(self) -> dict[str, Any]:
+        data: dict[str, Any] = {
+            "region": self.region,
+            "locations": [loc.to_dict() for loc in self.all_locations()],
+            "journeys": [j.to_dict() for j in self.all_journeys()],
+        }
+        if self.risk_stats != DEFAULT_RISK_STATS:
+            data["risk_stats"] = self.risk_stats
+        return data
+
+    def overlay_to_dict(self) -> dict[str, Any]:
+        """Only this session's changes, as plain data; see :meth:`from_overlay`.
+
+        Proportional to the changes, not the world.
+        """
+        locations = {}
+        for location_id, patch in self._loc_patches.items():
+            patch = {k: list(v) if k == "inventory" else v for k, v in patch.items()}
+            if "npcs" in patch:
+                patch["npcs"] = [npc.to_dict() for npc in patch["npcs"]]
+            locations[location_id] = patch
+        return {
+            "region": self.region,
+            "locations": locations,
+            "npcs": {
+                location_id: {npc_id: dict(fields) for npc_id, fields in npcs.items()}
+                for location_id, npcs in self._npc_patches.items()
+            },
+            "npc_moves": dict(self._npc_moves),
+        }
+
+    @classmethod
+    def from_overlay(cls, template: WorldGraph, data: dict[str, Any]) -> SessionWorld:
+        """Rebuild the session saved by :meth:`overlay_to_dict` over *template*."""
+        if data["region"] != template.region:
+            raise ValueError(
+                f"Overlay for region '{data['region']}' does not fit template '{template.region}'"
+            )
+        world = cls(template)
+        for location_id, patch in data.get("locations", {}).items():
+            if template.get_location(location_id) is None:
+                raise ValueError(f"Overlay patches unknown location '{location_id}'")
+            patch = dict(patch)
+            if "npcs" in patch:
+                patch["npcs"] = [NPC.from_dict(npc) for npc in patch["npcs"]]
+            world._loc_patches[location_id] = patch
+        world._npc_patches = {
+            location_id: {npc_id: dict(fields) for npc_id, fields in npcs.items()}
+            for location_id, npcs in data.get("npcs", {}).items()
+        }
+        world._npc_moves = dict(data.get("npc_moves", {}))
+        return world
@@ -0,0 +1,188 @@
+"""ReachabilityIndex — constant-time "can I get from A to B" queries.
+
+The graph is condensed into strongly-connected components (Tarjan).  Each
+component stores the set of components reachable from it as an integer
+bitset, so a reachability query is one dict lookup and one bit test.
+
+The index follows the graph through :meth:`WorldGraph.add_listener`.  New
+locations and journeys that do not close a cycle are folded in
+incrementally; removals and cycle-closing journeys mark the index stale and
+it is rebuilt on the next query.
+"""
+
+from __future__ import annotations
+
+from totm.engine.graph import WorldGraph
+from totm.engine.models import Journey, Location
+
+
+class ReachabilityIndex:
+    """SCC condensation of a :class:`WorldGraph` with transitive-closure bitsets."""
+
+    def __init__(self, world: WorldGraph) -> None:
+        self.world = world
+        self._members: list[list[str]] = []
+        self._comp: dict[str, int] = {}
+        self._closure: list[int] = []
+        self._dead_ends: set[str] = set()
+        self._stale = True
+        world.add_listener(self._on_change)
+
+    def close(self) -> None:
+        """Stop following the graph."""
+        self.world.remove_listener(self._on_change)
+
+    # -- Queries ---------------------------------------------------------
+
+    def can_reach(self, from_id: str, to_id: str) -> bool:
+        """True if some sequence of journeys leads from *from_id* to *to_id*."""
+        self._ensure()
+        a = self._comp.get(from_id)
+        b = self._comp.get(to_id)
+        if a is None or b is None:
+            return False
+        return bool(self._closure[a] >> b & 1)
+
+    def reachable_from(self, location_id: str) -> set[str]:
+        """Every location reachable from *location_id*, itself included."""
+        self._ensure()
+        c = self._comp.get(location_id)
+        if c is None:
+            return set()
+        return {lid for comp in _bits(self._closure[c]) for lid in self._members[comp]}
+
+    def unreachable_from(self, start_id: str) -> set[str]:
+        """Locations that can never be reached from *start_id*."""
+        reachable = self.reachable_from(start_id)
+        return {lid for lid in self._comp if lid not in reachable}
+
+    def is_dead_end(self, location_id: str) -> bool:
+        """True if *location_id* has no outgoing journeys."""
+        self._ensure()
+        return location_id in self._dead_ends
+
+    def dead_ends(self) -> set[str]:
+        self._ensure()
+        return set(self._dead_ends)
+
+    def same_component(self, a: str, b: str) -> bool:
+        """True if *a* and *b* can each reach the other."""
+        self._ensure()
+        ca = self._comp.get(a)
+        return ca is not None and ca == self._comp.get(b)
+
+    @property
+    def component_count(self) -> int:
+        self._ensure()
+        return len(self._members)
+
+    # -- Maintenance -----------------------------------------------------
+
+    def _on_change(self, event: str, subject: Location | Journey | None) -> None:
+        if self._stale:
+            return
+        if event == "add_location":
+            if subject.id not in self._comp:
+                c = len(self._members)
+                self._members.append([subject.id])
+                self._comp[subject.id] = c
+                self._closure.append(1 << c)
+                self._dead_ends.add(subject.id)
+        elif event == "add_journey":
+            assert isinstance(subject, Journey)
+            self._add_edge(subject)
+        elif event not in ("update_location", "set_risk_stats"):
+            self._stale = True
+
+    def _add_edge(self, journey: Journey) -> None:
+        self._dead_ends.discard(journey.from_id)
+        a = self._comp[journey.from_id]
+        b = self._comp[journey.to_id]
+        if self._closure[a] >> b & 1:
+            return  # already reachable; condensation unchanged
+        if self._closure[b] >> a & 1:
+            self._stale = True  # closes a cycle, components merge
+            return
+        bit_a, reach_b = 1 << a, self._closure[b]
+        closure = self._closure
+        for c in range(len(closure)):
+            if closure[c] & bit_a:
+                closure[c] |= reach_b
+
+    def _ensure(self) -> None:
+        if self._stale:
+            self.rebuild()
+
+    def rebuild(self) -> None:
+        """Recompute components and closures from scratch (iterative Tarjan)."""
+        world = self.world
+        index: dict[str, int] = {}
+        low: dict[str, int] = {}
+        on_stack: set[str] = set()
+        stack: list[str] = []
+        members: list[list[str]] = []
+        comp: dict[str, int] = {}
+        closure: list[int] = []
+        dead_ends: set[str] = set()
+
+        for root in (loc.id for loc in world.all_locations()):
+            if root in index:
+                continue
+            work = [(root, iter([j.to_id for j in world.exits(root)]))]
+            index[root] = low[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            while work:
+                node, succ = work[-1]
+                advanced = False
+                for nxt in succ:
+                    if nxt not in index:
+                        index[nxt] = low[nxt] = len(index)
+                        stack.append(nxt)
+                        on_stack.add(nxt)
+                        work.append((nxt, iter([j.to_id for j in world.exits(nxt)])))
+                        advanced = True
+                        break
+                    if nxt in on_stack:
+                        low[node] = min(low[node], index[nxt])
+                if advanced:
+                    continue
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index[node]:
+                    # Tarjan emits components sinks-first, so every successor
+                    # component's closure is already final here.
+                    c = len(members)
+                    group = []
+                    while True:
+                        lid = stack.pop()
+                        on_stack.discard(lid)
+                        comp[lid] = c
+                        group.append(lid)
+                        if lid == node:
+                            break
+                    reach = 1 << c
+                    for lid in group:
+                        exits = world.exits(lid)
+                        if not exits:
+                            dead_ends.add(lid)
+                        for j in exits:
+                            reach |= closure[comp[j.to_id]] if comp[j.to_id] != c else 0
+                    members.append(group)
+                    closure.append(reach)
+
+        self._members, self._comp, self._closure = members, comp, closure
+        self._dead_ends = dead_ends
+        self._stale = False
+
+
+def _bits(value: int) -> list[int]:
+    """Indices of the set bits in *value*."""
+    out = []
+    while value:
+        low = value & -value
+        out.append(low.bit_length() - 1)
+        value ^= low
+    return out
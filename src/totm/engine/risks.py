@@ -0,0 +1,76 @@
+"""Risk keywords — which stat a journey's risks call for.
+
+A journey's traverse check rolls the stat named by the first of its risks
+that contains a known keyword (``"Slippery stones"`` -> ``speed``), trying
+keywords in table order, or the character's primary stat if none match.
+:class:`RiskMatcher` compiles a keyword table into one regular expression;
+worlds resolve each journey once, when it is added (see
+``WorldGraph.journey_stat``), so traversal does no string work at all.
+
+The default table can be replaced per world with a ``risk_stats`` object in
+the world file.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Iterable
+
+STAT_NAMES = ("brawn", "brains", "faith", "speed")
+
+DEFAULT_RISK_STATS: dict[str, str] = {
+    "slippery": "speed",
+    "darkness": "brains",
+    "climb": "brawn",
+    "steep": "brawn",
+    "trap": "speed",
+    "magic": "brains",
+    "curse": "faith",
+    "undead": "faith",
+}
+
+
+class RiskMatcher:
+    """A compiled keyword -> stat table.
+
+    All keywords go into one alternation inside a lookahead, so a single
+    scan finds every keyword occurrence, overlapping ones included; the
+    one earliest in the table wins, not the leftmost in the text.
+    """
+
+    __slots__ = ("table", "_pattern", "_rank", "_stats")
+
+    def __init__(self, table: dict[str, str]) -> None:
+        for keyword, stat_name in table.items():
+            if stat_name not in STAT_NAMES:
+                raise ValueError(
+                    f"Risk keyword '{keyword}' maps to unknown stat '{stat_name}'. "
+                    f"Valid: {', '.join(STAT_NAMES)}."
+                )
+            if not keyword:
+                raise ValueError("Risk keywords must not be empty")
+        self.table = dict(table)
+        # Lowered keyword -> position in the table; the first spelling wins
+        self._rank: dict[str, int] = {}
+        self._stats: list[str] = []
+        for keyword, stat_name in table.items():
+            lowered = keyword.lower()
+            if lowered not in self._rank:
+                self._rank[lowered] = len(self._stats)
+                self._stats.append(stat_name)
+        self._pattern = re.compile(
+            "(?=(" + "|".join(re.escape(k) for k in self._rank) + "))"
+        ) if self._rank else None
+
+    def match(self, risks: Iterable[str]) -> str | None:
+        """The stat named by the first risk containing a keyword, if any."""
+        if self._pattern is None:
+            return None
+        for risk in risks:
+            found = self._pattern.findall(risk.lower())
+            if found:
+                return self._stats[min(map(self._rank.__getitem__, found))]
+        return None
+
+
+DEFAULT_MATCHER = RiskMatcher(DEFAULT_RISK_STATS)
@@ -0,0 +1,244 @@
+"""RoutePlanner — weighted shortest paths over a WorldGraph's Journeys.
+
+Each Journey is weighted by how costly it is for a given character to get
+across: the expected number of attempts plus the expected damage taken
+before succeeding, derived from the same stat check ``StateEngine.traverse``
+applies.  Journeys the character can never pass are skipped.
+"""
+
+from __future__ import annotations
+
+import heapq
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable
+
+from totm.engine.graph import WorldGraph
+from totm.engine.models import Character, Journey, Location
+from totm.engine.risks import STAT_NAMES
+from totm.engine.store import expected_damage, success_probability
+
+# (brawn, brains, faith, speed) — everything the traverse rule reads
+StatProfile = tuple[int, int, int, int]
+
+
+def stat_profile(character: Character) -> StatProfile:
+    """Return the stat block of *character* as a hashable cache key."""
+    return (character.brawn, character.brains, character.faith, character.speed)
+
+
+@dataclass
+class RouteStep:
+    """One Journey along a planned route."""
+
+    journey: Journey
+    stat_used: str
+    stat_value: int
+    success_chance: float
+    expected_damage: float
+
+
+@dataclass
+class Route:
+    """A planned path from *source_id* to *destination_id*."""
+
+    source_id: str
+    destination_id: str
+    steps: list[RouteStep] = field(default_factory=list)
+    cost: float = 0.0
+
+    @property
+    def success_chance(self) -> float:
+        """Chance of clearing every step on the first attempt."""
+        chance = 1.0
+        for step in self.steps:
+            chance *= step.success_chance
+        return chance
+
+    @property
+    def expected_damage(self) -> float:
+        """Expected total damage taken while retrying each step until it succeeds."""
+        return sum(
+            step.expected_damage / step.success_chance for step in self.steps
+        )
+
+
+@dataclass
+class _Tree:
+    """Single-source shortest-path tree: best cost and incoming journey per location."""
+
+    dist: dict[str, float]
+    prev: dict[str, Journey]
+
+
+class RoutePlanner:
+    """Dijkstra / A* routing over a :class:`WorldGraph`.
+
+    Shortest-path trees are cached per ``(source, stat profile)`` in a
+    bounded LRU.  The planner follows the graph through its listeners and
+    drops them when a location, journey or the risk table changes; NPC and
+    item changes don't affect routes and keep them.  Call :meth:`close`
+    when done with a planner on a long-lived graph.
+    """
+
+    def __init__(self, world: WorldGraph, *, cache_size: int = 128) -> None:
+        self.world = world
+        self._cache_size = cache_size
+        self._trees: OrderedDict[tuple[str, StatProfile], _Tree] = OrderedDict()
+        # Per-journey odds for get_exits hints; small, so cleared wholesale when full
+        self._steps: dict[tuple[str, StatProfile], RouteStep] = {}
+        world.add_listener(self._on_change)
+
+    def close(self) -> None:
+        """Stop following the graph."""
+        self.world.remove_listener(self._on_change)
+
+    # -- Public API ------------------------------------------------------
+
+    def route(
+        self,
+        source_id: str,
+        destination_id: str,
+        profile: StatProfile,
+        *,
+        heuristic: Callable[[str], float] | None = None,
+    ) -> Route | None:
+        """Return the cheapest route, or ``None`` if *destination_id* is unreachable.
+
+        Without a *heuristic* the full shortest-path tree from *source_id* is
+        computed and cached.  With one, a targeted A* search runs instead; the
+        heuristic must never overestimate the remaining cost (each step costs
+        at least 1).
+        """
+        if self.world.get_location(source_id) is None:
+            raise ValueError(f"Location '{source_id}' not in world graph")
+        if self.world.get_location(destination_id) is None:
+            raise ValueError(f"Location '{destination_id}' not in world graph")
+
+        if heuristic is None:
+            tree = self._tree(source_id, profile)
+        else:
+            tree = self._search(source_id, profile, destination_id, heuristic)
+        if destination_id not in tree.dist:
+            return None
+        return self._build_route(source_id, destination_id, tree, profile)
+
+    def costs_from(self, source_id: str, profile: StatProfile) -> dict[str, float]:
+        """Return the cheapest cost from *source_id* to every reachable location."""
+        return dict(self._tree(source_id, profile).dist)
+
+    def step(self, journey: Journey, profile: StatProfile) -> RouteStep:
+        """The odds of one attempt at *journey*, cached until the graph changes."""
+        key = (journey.id, profile)
+        step = self._steps.get(key)
+        if step is None:
+            if len(self._steps) >= self._cache_size * 32:
+                self._steps.clear()
+            step = self._steps[key] = self._step(journey, profile)
+        return step
+
+    def invalidate(self) -> None:
+        """Drop every cached shortest-path tree and journey odds."""
+        self._trees.clear()
+        self._steps.clear()
+
+    def _on_change(self, event: str, subject: Location | Journey | None) -> None:
+        if event != "update_location":
+            self.invalidate()
+
+    # -- Edge weights ----------------------------------------------------
+
+    def _stat_for(self, journey: Journey, profile: StatProfile) -> tuple[str, int]:
+        stat_name = self.world.journey_stat(journey)
+        if stat_name is not None:
+            return stat_name, profile[STAT_NAMES.index(stat_name)]
+        # Mirrors Character.primary_stat: first highest stat wins ties
+        best = max(range(len(profile)), key=profile.__getitem__)
+        return STAT_NAMES[best], profile[best]
+
+    def _step(self, journey: Journey, profile: StatProfile) -> RouteStep:
+        stat_name, stat_value = self._stat_for(journey, profile)
+        return RouteStep(
+            journey=journey,
+            stat_used=stat_name,
+            stat_value=stat_value,
+            success_chance=success_probability(stat_value, journey.difficulty),
+            expected_damage=expected_damage(stat_value, journey.difficulty),
+        )
+
+    @staticmethod
+    def _cost(step: RouteStep) -> float:
+        """Expected attempts plus expected damage until the step succeeds."""
+        return (1.0 + step.expected_damage) / step.success_chance
+
+    # -- Search ----------------------------------------------------------
+
+    def _tree(self, source_id: str, profile: StatProfile) -> _Tree:
+        key = (source_id, profile)
+        tree = self._trees.get(key)
+        if tree is not None:
+            self._trees.move_to_end(key)
+            return tree
+        tree = self._search(source_id, profile, None, None)
+        self._trees[key] = tree
+        if len(self._trees) > self._cache_size:
+            self._trees.popitem(last=False)
+        return tree
+
+    def _search(
+        self,
+        source_id: str,
+        profile: StatProfile,
+        target_id: str | None,
+        heuristic: Callable[[str], float] | None,
+    ) -> _Tree:
+        dist: dict[str, float] = {source_id: 0.0}
+        prev: dict[str, Journey] = {}
+        done: set[str] = set()
+        # Per-search memo: cost only depends on (difficulty, stat resolution)
+        costs: dict[str, float | None] = {}
+        h = heuristic or (lambda _lid: 0.0)
+        heap: list[tuple[float, str]] = [(h(source_id), source_id)]
+
+        while heap:
+            _, lid = heapq.heappop(heap)
+            if lid in done:
+                continue
+            done.add(lid)
+            if lid == target_id:
+                break
+            base = dist[lid]
+            for journey in self.world.exits(lid):
+                cost = costs.get(journey.id, -1.0)
+                if cost == -1.0:
+                    step = self._step(journey, profile)
+                    cost = self._cost(step) if step.success_chance > 0 else None
+                    costs[journey.id] = cost
+                if cost is None:
+                    continue
+                nd = base + cost
+                if nd < dist.get(journey.to_id, float("inf")):
+                    dist[journey.to_id] = nd
+                    prev[journey.to_id] = journey
+                    heapq.heappush(heap, (nd + h(journey.to_id), journey.to_id))
+
+        if target_id is not None and target_id not in done:
+            dist.pop(target_id, None)
+        return _Tree(dist=dist, prev=prev)
+
+    def _build_route(
+        self, source_id: str, destination_id: str, tree: _Tree, profile: StatProfile,
+    ) -> Route:
+        journeys: list[Journey] = []
+        lid = destination_id
+        while lid != source_id:
+            journey = tree.prev[lid]
+            journeys.append(journey)
+            lid = journey.from_id
+        journeys.reverse()
+        return Route(
+            source_id=source_id,
+            destination_id=destination_id,
+            steps=[self._step(j, profile) for j in journeys],
+            cost=tree.dist[destination_id],
+        )
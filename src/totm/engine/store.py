@@ -6,14 +6,54 @@ deterministic adjudication for traversal and NPC interaction.
 
 from __future__ import annotations
 
-import json
+import copy
+import functools
 import random
-from dataclasses import dataclass, field, asdict
+import threading
+import uuid
+from array import array
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any, Callable, Iterable, TypeVar
 
+from totm.engine import codec
+from totm.engine.batch import INTERACT, TRAVERSE, Action, BatchResult, Outcome, Row
 from totm.engine.models import Character, Location, Journey, NPC
+from totm.engine.changes import ChangeTracker
 from totm.engine.graph import WorldGraph
+from totm.engine.overlay import SessionWorld
+
+if TYPE_CHECKING:
+    from totm.engine.journal import Journal
+    from totm.engine.undo import UndoLog
+
+# Incremental saves beyond this many patches rewrite the base instead
+MAX_PATCHES = 50
+
+
+def patch_path(path: Path, n: int) -> Path:
+    """Where the *n*-th incremental patch against the save at *path* lives."""
+    return path.with_name(f"{path.name}.p{n}")
+
+
+# ---------------------------------------------------------------------------
+# Traverse odds — closed forms of the ``randint(1, stat) >= difficulty`` rule
+# ---------------------------------------------------------------------------
+
+def success_probability(stat_value: int, difficulty: int) -> float:
+    """Chance that a single traverse attempt succeeds."""
+    sides = max(stat_value, 1)
+    passing = sides - max(difficulty, 1) + 1
+    return min(max(passing / sides, 0.0), 1.0)
+
+
+def expected_damage(stat_value: int, difficulty: int) -> float:
+    """Expected damage taken by a single traverse attempt (0 on success)."""
+    sides = max(stat_value, 1)
+    failing = min(difficulty - 1, sides)  # rolls 1..failing miss
+    if failing <= 0:
+        return 0.0
+    return (failing * difficulty - failing * (failing + 1) // 2) / sides
 
 
 # ---------------------------------------------------------------------------
@@ -36,7 +76,18 @@ class TraverseResult:
     message: str = ""
 
     def to_dict(self) -> dict[str, Any]:
-        return asdict(self)
+        return {
+            "success": self.success,
+            "journey_id": self.journey_id,
+            "from_id": self.from_id,
+            "to_id": self.to_id,
+            "stat_used": self.stat_used,
+            "stat_value": self.stat_value,
+            "difficulty": self.difficulty,
+            "roll": self.roll,
+            "damage": self.damage,
+            "message": self.message,
+        }
 
 
 @dataclass
@@ -54,13 +105,64 @@ class InteractResult:
     message: str = ""
 
     def to_dict(self) -> dict[str, Any]:
-        return asdict(self)
+        return {
+            "success": self.success,
+            "npc_id": self.npc_id,
+            "action": self.action,
+            "stat_used": self.stat_used,
+            "stat_value": self.stat_value,
+            "damage_dealt": self.damage_dealt,
+            "damage_taken": self.damage_taken,
+            "npc_defeated": self.npc_defeated,
+            "message": self.message,
+        }
+
+
+@dataclass(frozen=True)
+class EngineView:
+    """An immutable snapshot of an engine's state, safe to read from any thread.
+
+    ``character`` is ``Character.to_dict()`` output, copied for this view.
+    """
+
+    version: int
+    location_id: str | None
+    character: dict[str, Any] | None
+    rolls: int
+
+    @property
+    def hp(self) -> int | None:
+        return self.character["hp"] if self.character is not None else None
 
 
 # ---------------------------------------------------------------------------
 # StateEngine
 # ---------------------------------------------------------------------------
 
+_F = TypeVar("_F", bound=Callable[..., Any])
+
+
+def _locked(method: _F) -> _F:
+    """Run *method* holding the engine's lock."""
+    @functools.wraps(method)
+    def wrapper(self: StateEngine, *args: Any, **kwargs: Any) -> Any:
+        with self.lock:
+            return method(self, *args, **kwargs)
+    return wrapper  # type: ignore[return-value]
+
+
+def _writes(method: _F) -> _F:
+    """Run *method* holding the engine's lock, then publish a new :meth:`StateEngine.view`."""
+    @functools.wraps(method)
+    def wrapper(self: StateEngine, *args: Any, **kwargs: Any) -> Any:
+        with self.lock:
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                self._version += 1
+    return wrapper  # type: ignore[return-value]
+
+
 class StateEngine:
     """Authoritative game state manager.
 
@@ -71,12 +173,69 @@ class StateEngine:
 
     All mutations go through this class — the GM Agent must never modify
     state directly.
+
+    Every die roll comes from the engine's own :class:`random.Random`,
+    seeded with *seed* (random if omitted), and is appended to
+    :attr:`roll_log`, so sessions never share a random stream and any
+    session can be replayed exactly (see :mod:`totm.tools.replay`).  *rng*
+    substitutes any object with a compatible ``randint``.
+
+    Every public method holds the engine's re-entrant :attr:`lock`, so one
+    engine can be driven from several threads — a console and a background
+    agent, say — and each call sees and leaves a consistent state.  Hold
+    ``engine.lock`` to make several calls atomic; :meth:`view` reads a
+    consistent snapshot without waiting for writers.  Engines are
+    independent of each other: there is no global lock.  Engines sharing
+    one mutable world must share a *lock* too.
     """
 
-    def __init__(self, world: WorldGraph) -> None:
+    def __init__(
+        self,
+        world: WorldGraph,
+        seed: int | None = None,
+        rng: random.Random | None = None,
+        lock: threading.RLock | None = None,
+    ) -> None:
+        self.lock = lock if lock is not None else threading.RLock()
+        # Bumped after every locked write; see view()
+        self._version = 0
+        self._view: EngineView | None = None
         self.world = world
         self._character: Character | None = None
         self._current_location_id: str | None = None
+        self.seed = seed if seed is not None else random.getrandbits(63)
+        self._rng = rng if rng is not None else random.Random(self.seed)
+        # Every roll made by this engine, in order
+        self.roll_log: array[int] = array("I")
+        # Set by Journal.create/load; every state change is appended to it
+        self.journal: Journal | None = None
+        # Sides of the dice rolled since the last journal record
+        self._dice: list[int] = []
+        # Set by UndoLog; the inverse of every state change is pushed to it
+        self.undo_log: UndoLog | None = None
+        # Changes since the last snapshot(); see _mark_saved
+        self._changes: ChangeTracker | None = None
+        self._save_chain: SaveChain | None = None
+        self._saved_character: dict[str, Any] | None = None
+        self._saved_location: str | None = None
+        self._saved_rolls = 0
+
+    def _roll(self, sides: int) -> int:
+        """Roll a *sides*-sided die and record the result."""
+        value = self._rng.randint(1, sides)
+        self.roll_log.append(value)
+        if self.journal is not None:
+            self._dice.append(sides)
+        return value
+
+    def _record(self, op: str, **fields: Any) -> None:
+        """Append a state change to the journal, if one is attached."""
+        if self.journal is None:
+            return
+        if self._dice:
+            fields["dice"] = self._dice
+            self._dice = []
+        self.journal.append(op, fields)
 
     # -- Character -------------------------------------------------------
 
@@ -84,8 +243,12 @@ class StateEngine:
     def character(self) -> Character | None:
         return self._character
 
+    @_writes
     def set_character(self, character: Character) -> None:
+        if self.undo_log is not None:
+            self.undo_log.push(("character", self._character.to_dict() if self._character else None))
         self._character = character
+        self._record("set_character", character=character.to_dict() if character else None)
 
     # -- Location --------------------------------------------------------
 
@@ -99,17 +262,22 @@ class StateEngine:
             return None
         return self.world.get_location(self._current_location_id)
 
+    @_writes
     def set_location(self, location_id: str) -> None:
         if self.world.get_location(location_id) is None:
             raise ValueError(f"Location '{location_id}' not in world graph")
+        if self.undo_log is not None:
+            self.undo_log.push(("location", self._current_location_id))
         self._current_location_id = location_id
+        self._record("set_location", location=location_id)
 
     # -- Adjudication: Traverse ------------------------------------------
 
+    @_writes
     def traverse(self, journey_id: str) -> TraverseResult:
         """Attempt to traverse a Journey. Deterministic stat check.
 
-        Mechanic: ``roll = random.randint(1, stat_value)``
+        Mechanic: ``roll = randint(1, stat_value)``
         Success if ``roll >= difficulty``.
         On failure, character takes ``difficulty - roll`` damage.
         """
@@ -122,178 +290,534 @@ class StateEngine:
                 to_id="",
                 message=f"Journey '{journey_id}' does not exist.",
             )
+        return self._resolve_traverse(journey)
 
-        if self._character is None:
-            return TraverseResult(
-                success=False,
-                journey_id=journey_id,
-                from_id=journey.from_id,
-                to_id=journey.to_id,
-                message="No active character.",
+    @_writes
+    def _traverse(self, journey: Journey) -> TraverseResult:
+        """Adjudicate *journey*, which need not belong to the current world.
+
+        Used directly for portal journeys whose destination is in another
+        region (see :class:`~totm.engine.atlas.WorldAtlas`).
+        """
+        return self._resolve_traverse(journey)
+
+    def _resolve_traverse(self, journey: Journey) -> TraverseResult:
+        # Unlocked body of traverse/_traverse, so a traverse takes the lock once
+        outcome, stat_name, stat_value, roll, damage = self._adjudicate_traverse(journey)
+        result = TraverseResult(
+            success=outcome is Outcome.SUCCESS,
+            journey_id=journey.id,
+            from_id=journey.from_id,
+            to_id=journey.to_id,
+        )
+        if outcome is Outcome.NO_CHARACTER:
+            result.message = "No active character."
+            return result
+        if outcome is Outcome.WRONG_ORIGIN:
+            result.message = "Character is not at the journey's origin."
+            return result
+
+        assert self._character is not None
+        result.stat_used = stat_name
+        result.stat_value = stat_value
+        result.difficulty = journey.difficulty
+        result.roll = roll
+        result.damage = damage
+        if outcome is Outcome.SUCCESS:
+            result.message = f"Traversed successfully to '{journey.to_id}'."
+        else:
+            result.message = (
+                f"Failed! Took {damage} damage. HP: {self._character.hp}/{self._character.max_hp}."
             )
+        return result
 
+    def _adjudicate_traverse(self, journey: Journey) -> tuple[Outcome, str, int, int, int]:
+        """The traverse rule itself: ``(outcome, stat_used, stat_value, roll, damage)``."""
+        if self._character is None:
+            return Outcome.NO_CHARACTER, "", 0, 0, 0
         if self._current_location_id != journey.from_id:
-            return TraverseResult(
-                success=False,
-                journey_id=journey_id,
-                from_id=journey.from_id,
-                to_id=journey.to_id,
-                message="Character is not at the journey's origin.",
-            )
+            return Outcome.WRONG_ORIGIN, "", 0, 0, 0
 
         # Pick the most relevant stat for the journey's risks
-        stat_name, stat_value = self._pick_stat_for_risks(journey.risks)
-        roll = random.randint(1, max(stat_value, 1))
+        stat_name, stat_value = self._pick_stat(journey)
+        roll = self._roll(max(stat_value, 1))
 
         if roll >= journey.difficulty:
             # Success — move character
+            if self.undo_log is not None:
+                self.undo_log.push(("location", journey.from_id))
             self._current_location_id = journey.to_id
-            return TraverseResult(
-                success=True,
-                journey_id=journey_id,
-                from_id=journey.from_id,
-                to_id=journey.to_id,
-                stat_used=stat_name,
-                stat_value=stat_value,
-                difficulty=journey.difficulty,
-                roll=roll,
-                message=f"Traversed successfully to '{journey.to_id}'.",
-            )
-        else:
-            # Failure — take damage, stay put
-            damage = journey.difficulty - roll
-            self._character.hp = max(0, self._character.hp - damage)
-            return TraverseResult(
-                success=False,
-                journey_id=journey_id,
-                from_id=journey.from_id,
-                to_id=journey.to_id,
-                stat_used=stat_name,
-                stat_value=stat_value,
-                difficulty=journey.difficulty,
-                roll=roll,
-                damage=damage,
-                message=f"Failed! Took {damage} damage. HP: {self._character.hp}/{self._character.max_hp}.",
-            )
+            self._record("traverse", location=journey.to_id, hp=self._character.hp)
+            return Outcome.SUCCESS, stat_name, stat_value, roll, 0
+        # Failure — take damage, stay put
+        damage = journey.difficulty - roll
+        if self.undo_log is not None:
+            self.undo_log.push(("hp", self._character.hp))
+        self._character.hp = max(0, self._character.hp - damage)
+        self._record("traverse", location=journey.from_id, hp=self._character.hp)
+        return Outcome.FAILED, stat_name, stat_value, roll, damage
 
     # -- Adjudication: Interact ------------------------------------------
 
+    @_writes
     def interact(self, npc_id: str, action: str) -> InteractResult:
         """Interact with an NPC at the current location.
 
         Supported actions: ``attack``, ``talk``.
         """
-        loc = self.current_location
-        if loc is None:
-            return InteractResult(
-                success=False, npc_id=npc_id, action=action,
-                message="No current location.",
+        outcome, npc, damage_dealt, damage_taken = self._adjudicate_interact(npc_id, action)
+        result = InteractResult(
+            success=outcome is Outcome.SUCCESS, npc_id=npc_id, action=action,
+        )
+        if outcome is Outcome.NO_LOCATION:
+            result.message = "No current location."
+        elif outcome is Outcome.UNKNOWN_NPC:
+            result.message = f"NPC '{npc_id}' not found at current location."
+        elif outcome is Outcome.NO_CHARACTER:
+            result.message = "No active character."
+        elif outcome is Outcome.UNKNOWN_ACTION:
+            result.message = f"Unknown action: '{action}'."
+        elif action == "talk":
+            assert npc is not None
+            result.message = f"You engage {npc.name} in conversation."
+        else:
+            assert npc is not None and self._character is not None
+            result.stat_used = "brawn"
+            result.stat_value = self._character.brawn
+            result.damage_dealt = damage_dealt
+            result.damage_taken = damage_taken
+            result.npc_defeated = npc.hp <= 0
+            result.message = (
+                f"Dealt {damage_dealt} damage to {npc.name} "
+                f"(HP: {npc.hp}). "
+                + (f"Took {damage_taken} damage in return. " if damage_taken else "")
+                + ("NPC defeated!" if npc.hp <= 0 else "")
             )
+        return result
 
+    def _adjudicate_interact(self, npc_id: str, action: str) -> tuple[Outcome, NPC | None, int, int]:
+        """The interaction rules: ``(outcome, npc afterwards, damage_dealt, damage_taken)``."""
+        loc = self.current_location
+        if loc is None:
+            return Outcome.NO_LOCATION, None, 0, 0
         npc = next((n for n in loc.npcs if n.id == npc_id), None)
         if npc is None:
-            return InteractResult(
-                success=False, npc_id=npc_id, action=action,
-                message=f"NPC '{npc_id}' not found at current location.",
-            )
-
+            return Outcome.UNKNOWN_NPC, None, 0, 0
         if self._character is None:
-            return InteractResult(
-                success=False, npc_id=npc_id, action=action,
-                message="No active character.",
-            )
-
+            return Outcome.NO_CHARACTER, npc, 0, 0
         if action == "attack":
             return self._attack(npc)
-        elif action == "talk":
-            return InteractResult(
-                success=True, npc_id=npc_id, action=action,
-                message=f"You engage {npc.name} in conversation.",
-            )
-        else:
-            return InteractResult(
-                success=False, npc_id=npc_id, action=action,
-                message=f"Unknown action: '{action}'.",
-            )
+        if action == "talk":
+            return Outcome.SUCCESS, npc, 0, 0
+        return Outcome.UNKNOWN_ACTION, npc, 0, 0
 
-    def _attack(self, npc: NPC) -> InteractResult:
+    def _attack(self, npc: NPC) -> tuple[Outcome, NPC, int, int]:
         """Simple attack: character brawn vs NPC hp."""
         assert self._character is not None
-        attack_roll = random.randint(1, max(self._character.brawn, 1))
+        assert self._current_location_id is not None
+        attack_roll = self._roll(max(self._character.brawn, 1))
         damage_dealt = attack_roll
-        npc.hp = max(0, npc.hp - damage_dealt)
+        if self.undo_log is not None:
+            self.undo_log.push((
+                "attack", self._current_location_id, npc.id, npc.hp, self._character.hp,
+            ))
+        npc = self.world.update_npc(
+            self._current_location_id, npc.id, hp=max(0, npc.hp - damage_dealt),
+        )
 
         damage_taken = 0
         if npc.hostile and npc.hp > 0:
-            damage_taken = random.randint(1, 3)
+            damage_taken = self._roll(3)
             self._character.hp = max(0, self._character.hp - damage_taken)
-
-        return InteractResult(
-            success=True,
-            npc_id=npc.id,
-            action="attack",
-            stat_used="brawn",
-            stat_value=self._character.brawn,
-            damage_dealt=damage_dealt,
-            damage_taken=damage_taken,
-            npc_defeated=npc.hp <= 0,
-            message=(
-                f"Dealt {damage_dealt} damage to {npc.name} "
-                f"(HP: {npc.hp}). "
-                + (f"Took {damage_taken} damage in return. " if damage_taken else "")
-                + ("NPC defeated!" if npc.hp <= 0 else "")
-            ),
+        self._record(
+            "attack", location=self._current_location_id, npc=npc.id,
+            npc_hp=npc.hp, hp=self._character.hp,
         )
+        return Outcome.SUCCESS, npc, damage_dealt, damage_taken
+
+    # -- Adjudication: Batches -------------------------------------------
+
+    @_writes
+    def traverse_many(self, journey_ids: Iterable[str]) -> BatchResult:
+        """:meth:`traverse` each journey in turn; one result row per journey."""
+        adjudicate = self._adjudicate
+        return BatchResult.from_rows([adjudicate(("traverse", j)) for j in journey_ids], [self])
+
+    @_writes
+    def interact_many(self, interactions: Iterable[tuple[str, str]]) -> BatchResult:
+        """:meth:`interact` for each ``(npc_id, action)`` in turn."""
+        adjudicate = self._adjudicate
+        return BatchResult.from_rows(
+            [adjudicate(("interact", npc_id, action)) for npc_id, action in interactions], [self],
+        )
+
+    @_writes
+    def apply_actions(self, actions: Iterable[Action]) -> BatchResult:
+        """Run a sequence of ``("traverse", journey_id)`` / ``("interact", npc_id, action)``.
+
+        See :mod:`totm.engine.batch`.  A malformed action raises
+        ``ValueError``; the actions before it have already been applied.
+        """
+        adjudicate = self._adjudicate
+        return BatchResult.from_rows([adjudicate(action) for action in actions], [self])
+
+    def _adjudicate(self, action: Action) -> Row:
+        """Adjudicate one batch *action*; returns its :class:`BatchResult` row."""
+        op = action[0]
+        if op == "traverse" and len(action) == 2:
+            journey = self.world.get_journey(action[1])
+            if journey is None:
+                outcome, roll, damage = Outcome.UNKNOWN_JOURNEY, 0, 0
+            else:
+                outcome, _, _, roll, damage = self._adjudicate_traverse(journey)
+            npc_hp = -1
+            kind = TRAVERSE
+        elif op == "interact" and len(action) == 3:
+            outcome, npc, roll, damage = self._adjudicate_interact(action[1], action[2])  # type: ignore[misc]
+            attacked = npc is not None and roll
+            npc_hp = npc.hp if attacked else -1  # type: ignore[union-attr]
+            kind = INTERACT
+        else:
+            raise ValueError(f"Unknown batch action {action!r}")
+        hp = self._character.hp if self._character is not None else -1
+        return kind, outcome, roll, damage, hp, npc_hp
 
     # -- Internal helpers ------------------------------------------------
 
-    _RISK_STAT_MAP: dict[str, str] = {
-        "slippery": "speed",
-        "darkness": "brains",
-        "climb": "brawn",
-        "steep": "brawn",
-        "trap": "speed",
-        "magic": "brains",
-        "curse": "faith",
-        "undead": "faith",
-    }
-
-    def _pick_stat_for_risks(self, risks: list[str]) -> tuple[str, int]:
-        """Heuristic: map risk keywords to the best stat to check."""
+    # Per-action locking for batches spanning several engines
+    _adjudicate_locked = _writes(_adjudicate)
+
+    def _pick_stat(self, journey: Journey) -> tuple[str, int]:
+        """The stat *journey*'s risks call for, else the character's primary stat."""
         assert self._character is not None
-        stats = {
-            "brawn": self._character.brawn,
-            "brains": self._character.brains,
-            "faith": self._character.faith,
-            "speed": self._character.speed,
-        }
-        for risk in risks:
-            for keyword, stat_name in self._RISK_STAT_MAP.items():
-                if keyword in risk.lower():
-                    return stat_name, stats[stat_name]
-        # Default: use the character's primary stat
+        stat_name = self.world.journey_stat(journey)
+        if stat_name is not None:
+            return stat_name, getattr(self._character, stat_name)
         return self._character.primary_stat()
 
+    # -- Concurrent reads -------------------------------------------------
+
+    def view(self) -> EngineView:
+        """A consistent snapshot of the location and character.
+
+        Lock-free unless the engine changed since the last view: a reader
+        then waits for the write in progress and builds a new one.  Changes
+        made around the engine's methods show up after the next write.
+        """
+        view = self._view
+        if view is not None and view.version == self._version:
+            return view
+        with self.lock:
+            view = EngineView(
+                version=self._version,
+                location_id=self._current_location_id,
+                character=self._character.to_dict() if self._character is not None else None,
+                rolls=len(self.roll_log),
+            )
+            self._view = view
+            return view
+
+    @_writes
+    def adopt(self, other: StateEngine) -> None:
+        """Take over *other*'s world, character, location and dice (Load Game).
+
+        Nothing recorded against the previous state carries over: the next
+        save is a full one, undo history is cleared and an attached journal
+        is compacted onto the adopted state.
+        """
+        self.world = other.world
+        self._character = other._character
+        self._current_location_id = other._current_location_id
+        self.seed = other.seed
+        self._rng = other._rng
+        self.roll_log = array("I", other.roll_log)
+        self._dice = []
+        if self._changes is not None:
+            self._changes.close()
+            self._changes = None
+        self._save_chain = None
+        if self.undo_log is not None:
+            self.undo_log.clear()
+        if self.journal is not None:
+            self.journal.compact()
+
+    # -- Undo ------------------------------------------------------------
+
+    @_writes
+    def undo(self, changes: int = 1) -> int:
+        """Revert the last *changes* state changes; returns how many were reverted.
+
+        Needs an attached :class:`~totm.engine.undo.UndoLog`.
+        """
+        return self._require_undo().undo(changes)
+
+    @_writes
+    def rewind(self, turns: int = 1) -> int:
+        """Revert the last *turns* turns; returns how many changes were reverted."""
+        return self._require_undo().rewind(turns)
+
+    def _require_undo(self) -> UndoLog:
+        if self.undo_log is None:
+            raise RuntimeError("No undo log attached; see totm.engine.undo.UndoLog")
+        return self.undo_log
+
+    # -- Forking ---------------------------------------------------------
+
+    @_locked
+    def fork(self, seed: int | None = None) -> StateEngine:
+        """A throwaway copy of this game for what-if play (see :mod:`totm.engine.lookahead`).
+
+        The fork overlays this engine's world copy-on-write (a
+        :class:`SessionWorld`), so forking costs time proportional to the
+        session's changes rather than the world.  It gets a copy of the
+        character and location, and its own RNG seeded with *seed* (random
+        if omitted) — nothing it does reaches this engine, not even its
+        random stream.  A fork has no journal and is never saved.
+
+        A fork of an unfrozen world sees later structural edits to that
+        world; fork again after changing it.
+        """
+        world = self.world
+        forked = world.fork() if isinstance(world, SessionWorld) else SessionWorld(world)
+        engine = StateEngine(forked, seed=seed)  # type: ignore[arg-type]
+        if self._character is not None:
+            engine._character = copy.replace(
+                self._character, inventory=list(self._character.inventory),
+            )
+        engine._current_location_id = self._current_location_id
+        return engine
+
     # -- Persistence -----------------------------------------------------
 
-    def save(self, path: Path) -> None:
-        """Save the full game state (world + character + location) to JSON."""
+    @_locked
+    def to_state(self, with_world: bool = True) -> dict[str, Any]:
+        """The full game state (world, character, location, RNG) as plain data.
+
+        Without *with_world* the world is left out, for callers that save it
+        some other way (see :meth:`from_state`).
+        """
         state: dict[str, Any] = {
-            "world": self.world.to_dict(),
             "character": self._character.to_dict() if self._character else None,
             "current_location_id": self._current_location_id,
         }
-        path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text(json.dumps(state, indent=2))
+        if with_world:
+            state["world"] = self.world.to_dict()
+        rng_state = self._rng_state()
+        if rng_state is not None:
+            state["rng"] = rng_state
+        return state
+
+    def _rng_state(self) -> dict[str, Any] | None:
+        if not isinstance(self._rng, random.Random):
+            return None
+        version, internal, gauss = self._rng.getstate()
+        return {"seed": self.seed, "state": [version, list(internal), gauss]}
+
+    def _set_rng_state(self, data: dict[str, Any]) -> None:
+        version, internal, gauss = data["state"]
+        self._rng.setstate((version, tuple(internal), gauss))
 
     @classmethod
-    def load(cls, path: Path) -> StateEngine:
-        """Load a saved game state from JSON."""
-        data = json.loads(path.read_text())
-        world = WorldGraph.from_dict(data["world"])
-        engine = cls(world)
+    def from_state(
+        cls,
+        data: dict[str, Any],
+        rng: random.Random | None = None,
+        world: WorldGraph | None = None,
+    ) -> StateEngine:
+        """Rebuild an engine from :meth:`to_state` output.
+
+        The random stream resumes where it left off unless *rng* replaces
+        it; states written before the engine kept its own RNG get a fresh
+        seed.  *world*, if given, is used instead of the saved one.
+        """
+        if world is None:
+            world = WorldGraph.from_dict(data["world"])
+        rng_data = data.get("rng")
+        engine = cls(world, seed=rng_data["seed"] if rng_data else None, rng=rng)
+        if rng_data and rng is None:
+            engine._set_rng_state(rng_data)
         if data.get("character"):
             engine.set_character(Character.from_dict(data["character"]))
         if data.get("current_location_id"):
             engine.set_location(data["current_location_id"])
         return engine
+
+    @_locked
+    def snapshot(self, full: bool = False) -> Snapshot:
+        """Capture what the next save should write, and count it as saved.
+
+        Returns the whole :meth:`to_state` if *full*, if nothing has been
+        saved yet, or if the world was replaced since; otherwise only what
+        changed since the last snapshot — locations (with their NPCs) and
+        journeys added, changed or removed, a replaced risk table, plus the
+        character, current location and RNG state if they moved.  The
+        incremental case costs
+        time proportional to those changes, not to the world, and shares no
+        mutable data with the engine, so it can be written from any thread.
+        """
+        changes = self._changes
+        if full or changes is None or changes.world is not self.world:
+            state = self.to_state()
+            self._mark_saved()
+            return Snapshot(full=True, data=state)
+
+        world = self.world
+        data: dict[str, Any] = {}
+        if changes.removed_journeys:
+            data["removed_journeys"] = sorted(changes.removed_journeys)
+        if changes.removed_locations:
+            data["removed_locations"] = sorted(changes.removed_locations)
+        if changes.locations:
+            data["locations"] = [world.get_location(lid).to_dict() for lid in sorted(changes.locations)]
+        if changes.journeys:
+            data["journeys"] = [world.get_journey(jid).to_dict() for jid in sorted(changes.journeys)]
+        if changes.risk_stats:
+            data["risk_stats"] = world.risk_stats
+        character = self._character.to_dict() if self._character else None
+        if character != self._saved_character:
+            data["character"] = character
+        if self._current_location_id != self._saved_location:
+            data["current_location_id"] = self._current_location_id
+        if len(self.roll_log) != self._saved_rolls:
+            rng_state = self._rng_state()
+            if rng_state is not None:
+                data["rng"] = rng_state
+        self._mark_saved()
+        return Snapshot(full=False, data=data)
+
+    def _mark_saved(self) -> None:
+        """Start tracking changes against the state just saved or loaded."""
+        if self._changes is None or self._changes.world is not self.world:
+            if self._changes is not None:
+                self._changes.close()
+            self._changes = ChangeTracker(self.world)
+        else:
+            self._changes.clear()
+        self._saved_character = self._character.to_dict() if self._character else None
+        self._saved_location = self._current_location_id
+        self._saved_rolls = len(self.roll_log)
+
+    def _apply_patch(self, patch: dict[str, Any]) -> None:
+        world = self.world
+        for jid in patch.get("removed_journeys", ()):
+            if world.get_journey(jid) is not None:
+                world.remove_journey(jid)
+        for lid in patch.get("removed_locations", ()):
+            if world.get_location(lid) is not None:
+                world.remove_location(lid)
+        for data in patch.get("locations", ()):
+            world.add_location(Location.from_dict(data))
+        for data in patch.get("journeys", ()):
+            world.add_journey(Journey.from_dict(data))
+        if "risk_stats" in patch:
+            world.set_risk_stats(patch["risk_stats"])
+        if "character" in patch:
+            data = patch["character"]
+            self._character = Character.from_dict(data) if data else None
+        if "current_location_id" in patch:
+            self._current_location_id = patch["current_location_id"]
+        if "rng" in patch and isinstance(self._rng, random.Random):
+            self._set_rng_state(patch["rng"])
+
+    @_locked
+    def save(self, path: Path) -> None:
+        """Save the full game state (world + character + location) to JSON.
+
+        The file is replaced atomically.  It is also the base that
+        :meth:`save_incremental` patches; patches left over from an earlier
+        base are deleted.
+        """
+        if self._save_chain is None or self._save_chain.path != path:
+            self._save_chain = SaveChain(path)
+        self._save_chain.write(self.snapshot(full=True))
+
+    @_locked
+    def save_incremental(self, path: Path, max_patches: int = MAX_PATCHES) -> Path:
+        """Write what changed since the last save to *path* as a patch file.
+
+        See :meth:`snapshot` for what a patch holds.  Patches chain: each
+        one is relative to the previous save, and :meth:`load` applies
+        them in order on top of the base written by :meth:`save`.
+
+        Falls back to a full :meth:`save` — returning *path* — when this
+        engine has no base there yet, its world was replaced, or the chain
+        reached *max_patches*.  Otherwise returns the patch file written.
+        """
+        chain = self._save_chain
+        if chain is None or chain.path != path or chain.patches >= max_patches or not path.exists():
+            self.save(path)
+            return path
+        return chain.write(self.snapshot())
+
+    @classmethod
+    def load(cls, path: Path) -> StateEngine:
+        """Load a saved game state from JSON, applying any incremental patches."""
+        data = codec.read_json(path)
+        engine = cls.from_state(data)
+        save_id = data.get("save_id")
+        n = 0
+        while save_id is not None and (next_path := patch_path(path, n + 1)).exists():
+            patch = codec.read_json(next_path)
+            if patch.get("base_id") != save_id or patch.get("seq") != n + 1:
+                break  # left over from another base
+            engine._apply_patch(patch)
+            n += 1
+        engine._mark_saved()
+        engine._save_chain = SaveChain(path, save_id, n)
+        return engine
+
+
+# ---------------------------------------------------------------------------
+# Save files — a full base plus a chain of incremental patches
+# ---------------------------------------------------------------------------
+
+@dataclass
+class Snapshot:
+    """Game state captured by :meth:`StateEngine.snapshot` for writing.
+
+    ``full`` snapshots hold a whole :meth:`StateEngine.to_state`; the rest
+    hold a patch body relative to the previous snapshot.
+    """
+
+    full: bool
+    data: dict[str, Any]
+
+
+class SaveChain:
+    """Writes :class:`Snapshot` objects to a base save at *path* and its patches.
+
+    Full snapshots replace the base (with a new ``save_id``) and delete the
+    old patches; incremental ones become ``<path>.p1``, ``.p2``, ...  Every
+    file is replaced atomically, and the base is written before stale
+    patches are removed, so a crash at any point leaves a loadable save.
+    A chain is not thread-safe; give each writer thread its own.
+    """
+
+    def __init__(self, path: Path, save_id: str | None = None, patches: int = 0) -> None:
+        self.path = path
+        self.save_id = save_id
+        self.patches = patches
+
+    def write(self, snapshot: Snapshot) -> Path:
+        """Write *snapshot* and return the file it went to."""
+        if snapshot.full or self.save_id is None:
+            if not snapshot.full:
+                raise ValueError(f"No base save at '{self.path}' to patch")
+            save_id = uuid.uuid4().hex
+            codec.write_json(self.path, {**snapshot.data, "save_id": save_id}, pretty=True)
+            n = 1
+            while (stale := patch_path(self.path, n)).exists():
+                stale.unlink()
+                n += 1
+            self.save_id = save_id
+            self.patches = 0
+            return self.path
+        target = patch_path(self.path, self.patches + 1)
+        codec.write_json(target, {"base_id": self.save_id, "seq": self.patches + 1, **snapshot.data})
+        self.patches += 1
+        return target
+
+    def fold(self) -> None:
+        """Rewrite the base with every patch applied, from the files alone."""
+        if self.patches:
+            self.write(Snapshot(full=True, data=StateEngine.load(self.path).to_state()))
@@ -0,0 +1,190 @@
+"""UndoLog — take back recent turns by applying inverse changes.
+
+While an UndoLog is attached, every state change the engine makes
+(``set_character``, ``set_location``, ``traverse``, attacks) pushes its
+inverse: the previous location, hit points, NPC hit points or character.
+Undoing pops and applies them, in time proportional to what is undone —
+no save is reloaded::
+
+    UndoLog(engine, limit=2000, spill=Path("undo.log"))
+    engine.undo_log.mark()      # before each player turn
+    ...
+    engine.rewind(2)            # retcon the last two turns
+
+:meth:`UndoLog.mark` groups changes into turns (the console marks each
+player input); :meth:`~UndoLog.rewind` takes back whole turns and
+:meth:`~UndoLog.undo` single changes.
+
+History is bounded: beyond *limit* entries the oldest half is dropped or,
+with *spill*, appended to that file as one line and read back when undoing
+reaches it.  Undo reverts the game state but not the random stream, so a
+replayed turn rolls fresh dice.  Reverts are journaled as ordinary records
+and saved like any other change.  The log is guarded by the engine's lock
+(``push`` is only called with it held).  Changes made around the engine's
+methods (assigning ``character.hp``, swapping ``engine.world``) are not
+recorded; call :meth:`clear` after replacing the world.  WorldAtlas does
+so itself when a character changes region, so a crossing can't be undone.
+"""
+
+from __future__ import annotations
+
+from array import array
+from pathlib import Path
+from typing import Any
+
+from totm.engine import codec
+from totm.engine.models import Character
+from totm.engine.store import StateEngine
+
+# Entry kinds; an entry is (kind, *previous values)
+TURN = "turn"
+LOCATION = "location"
+HP = "hp"
+ATTACK = "attack"
+CHARACTER = "character"
+
+
+class UndoLog:
+    """Bounded stack of inverse changes for one engine, optionally spilling to disk."""
+
+    def __init__(self, engine: StateEngine, *, limit: int = 1000, spill: Path | None = None) -> None:
+        if limit < 2:
+            raise ValueError("limit must be at least 2")
+        self.engine = engine
+        self.limit = limit
+        self.spill = spill
+        # Entries dropped off the bottom, spill or not; they can't be undone
+        self.dropped = 0
+        self._entries: list[tuple[Any, ...]] = []
+        # Byte offset and number of changes of each spilled chunk, oldest first
+        self._chunks = array("Q")
+        self._chunk_changes = array("Q")
+        self._changes = 0
+        if spill is not None:
+            spill.write_bytes(b"")
+        engine.undo_log = self
+
+    @property
+    def depth(self) -> int:
+        """How many changes can be undone."""
+        return self._changes + sum(self._chunk_changes)
+
+    def mark(self) -> None:
+        """Start a new turn; changes pushed from here on are rewound together."""
+        with self.engine.lock:
+            if not self._entries or self._entries[-1][0] != TURN:
+                self._entries.append((TURN,))
+
+    def clear(self) -> None:
+        """Forget all history, e.g. after the engine's world was replaced."""
+        with self.engine.lock:
+            self._entries.clear()
+            del self._chunks[:]
+            del self._chunk_changes[:]
+            self._changes = 0
+            if self.spill is not None:
+                self.spill.write_bytes(b"")
+
+    def close(self) -> None:
+        """Detach from the engine and delete the spill file."""
+        if self.engine.undo_log is self:
+            self.engine.undo_log = None
+        if self.spill is not None:
+            self.spill.unlink(missing_ok=True)
+
+    # -- Recording (called by StateEngine) -------------------------------
+
+    def push(self, entry: tuple[Any, ...]) -> None:
+        self._entries.append(entry)
+        self._changes += 1
+        if len(self._entries) > self.limit:
+            self._trim()
+
+    def _trim(self) -> None:
+        """Move the oldest half of the in-memory entries to the spill file, or drop them."""
+        cut = len(self._entries) // 2
+        oldest = self._entries[:cut]
+        changes = sum(1 for entry in oldest if entry[0] != TURN)
+        del self._entries[:cut]
+        self._changes -= changes
+        if self.spill is None:
+            self.dropped += changes
+            return
+        with self.spill.open("ab") as fp:
+            self._chunks.append(fp.tell())
+            fp.write(codec.dumps(oldest) + b"\n")
+        self._chunk_changes.append(changes)
+
+    def _pop(self) -> tuple[Any, ...] | None:
+        if not self._entries:
+            if not self._chunks:
+                return None
+            assert self.spill is not None
+            offset = self._chunks.pop()
+            self._changes += self._chunk_changes.pop()
+            with self.spill.open("r+b") as fp:
+                fp.seek(offset)
+                self._entries = [tuple(entry) for entry in codec.loads(fp.read())]
+                fp.truncate(offset)
+        entry = self._entries.pop()
+        if entry[0] != TURN:
+            self._changes -= 1
+        return entry
+
+    # -- Reverting -------------------------------------------------------
+
+    def undo(self, changes: int = 1) -> int:
+        """Revert the last *changes* changes; returns how many were reverted."""
+        reverted = 0
+        while reverted < changes:
+            entry = self._pop()
+            if entry is None:
+                break
+            if entry[0] != TURN:
+                self._revert(entry)
+                reverted += 1
+        return reverted
+
+    def rewind(self, turns: int = 1) -> int:
+        """Revert every change of the last *turns* turns; returns how many changes.
+
+        Turns in which nothing changed don't count.
+        """
+        reverted = 0
+        changed = False
+        while turns > 0:
+            entry = self._pop()
+            if entry is None:
+                break
+            if entry[0] == TURN:
+                if changed:
+                    turns -= 1
+                    changed = False
+                continue
+            self._revert(entry)
+            reverted += 1
+            changed = True
+        return reverted
+
+    def _revert(self, entry: tuple[Any, ...]) -> None:
+        engine = self.engine
+        kind = entry[0]
+        if kind == LOCATION:
+            engine._current_location_id = entry[1]
+            engine._record("set_location", location=entry[1])
+        elif kind == HP:
+            assert engine._character is not None
+            engine._character.hp = entry[1]
+            engine._record("traverse", location=engine._current_location_id, hp=entry[1])
+        elif kind == ATTACK:
+            _, location_id, npc_id, npc_hp, hp = entry
+            assert engine._character is not None
+            engine.world.update_npc(location_id, npc_id, hp=npc_hp)
+            engine._character.hp = hp
+            engine._record("attack", location=location_id, npc=npc_id, npc_hp=npc_hp, hp=hp)
+        elif kind == CHARACTER:
+            data = entry[1]
+            engine._character = Character.from_dict(data) if data else None
+            engine._record("set_character", character=data)
+        else:
+            raise ValueError(f"Unknown undo entry '{kind}'")
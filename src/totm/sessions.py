@@ -0,0 +1,602 @@
+"""SessionManager — many independent game sessions in one process.
+
+Each session is a :class:`StateEngine` with its :class:`ArbiterTools` and,
+optionally, a GM agent, keyed by session id.  Sessions live in memory up to
+a byte ceiling; past it the least recently used idle ones are written to
+disk and dropped, and come back transparently on their next request::
+
+    manager = SessionManager(Path("sessions"), new_engine, max_bytes=512 << 20)
+    with manager.session("player-42") as s:
+        s.tools.traverse(...)
+
+On disk a session whose world is a :class:`SessionWorld` over a
+:func:`load_template` template is ``<directory>/<id>/overlay.json``: the
+character, location and RNG plus only the overlay's patches, rebuilt over
+the shared template when the session comes back.  Any other session is
+``save.json`` (see ``StateEngine.save_incremental`` — a session evicted
+again after rehydrating only writes what changed).  Either way
+``history.json`` holds the agent's conversation.
+
+Memory per session is estimated by walking the objects it owns, skipping
+shared templates, when it is opened.  Releasing it only re-measures what
+changed since: locations the world reported as changed, new agent history
+and new rolls.
+
+The manager is thread-safe and a session may be used by several threads
+at once — its engine and tools serialize their own calls.  Locks are taken
+in one order: a session's ``engine.lock`` (then, for atlas worlds, the
+atlas lock), then the manager's lock.  The manager's lock is innermost: it
+only guards bookkeeping, and nothing waits for an engine lock or the disk
+while holding it, so game actions on different sessions never wait for
+each other.  The manager takes one engine lock at a time; don't call it
+while holding an engine's lock.
+"""
+
+from __future__ import annotations
+
+import re
+import shutil
+import sys
+import threading
+import time
+import types
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator
+
+from totm.engine import codec
+from totm.engine.atlas import WorldAtlas
+from totm.engine.batch import Action, BatchResult, Row
+from totm.engine.models import Journey, Location
+from totm.engine.overlay import SessionWorld, load_template, template_path
+from totm.engine.store import StateEngine
+from totm.tools.api import ArbiterTools
+
+SAVE_NAME = "save.json"
+OVERLAY_NAME = "overlay.json"
+HISTORY_NAME = "history.json"
+
+_SESSION_ID = re.compile(r"[A-Za-z0-9_.-]{1,128}")
+
+
+@dataclass
+class Session:
+    """One player's engine, tools and agent (``GMAgent`` or ``None``)."""
+
+    id: str
+    engine: StateEngine
+    tools: ArbiterTools
+    agent: Any = None
+    # Estimated bytes owned by this session, as of its last release
+    nbytes: int = 0
+    last_used: float = 0.0
+    pins: int = 0
+    footprint: _Footprint | None = field(default=None, repr=False, compare=False)
+
+
+@dataclass
+class SessionStats:
+    sessions: int
+    resident: int
+    resident_bytes: int
+    max_bytes: int
+    hits: int
+    misses: int
+    created: int
+    evictions: int
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "sessions": self.sessions,
+            "resident": self.resident,
+            "resident_bytes": self.resident_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "created": self.created,
+            "evictions": self.evictions,
+            "hit_rate": self.hit_rate,
+        }
+
+
+class SessionManager:
+    """Hosts sessions keyed by id, evicting idle ones to *directory* past *max_bytes*.
+
+    *new_engine* builds the engine for a session id seen for the first
+    time; *new_agent*, if given, builds the agent for a session's tools
+    (and gets its saved history back after a rehydrate).  *atlas*, if
+    given, is told when a session leaves memory, so the region its
+    character stood in can be evicted.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        new_engine: Callable[[str], StateEngine],
+        *,
+        max_bytes: int = 256 << 20,
+        new_agent: Callable[[ArbiterTools], Any] | None = None,
+        atlas: WorldAtlas | None = None,
+    ) -> None:
+        self.directory = directory
+        self.new_engine = new_engine
+        self.new_agent = new_agent
+        self.atlas = atlas
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.created = 0
+        self.evictions = 0
+        # Resident sessions, least recently used first
+        self._resident: OrderedDict[str, Session] = OrderedDict()
+        self._bytes = 0
+        # Ids being loaded, written out or deleted; set when the disk work is done
+        self._busy: dict[str, threading.Event] = {}
+        # Guards the bookkeeping above.  Innermost lock: never held while
+        # waiting for an engine lock or the disk (see the module docstring)
+        self._lock = threading.Lock()
+        directory.mkdir(parents=True, exist_ok=True)
+
+    # -- Checkout --------------------------------------------------------
+
+    @contextmanager
+    def session(self, session_id: str) -> Iterator[Session]:
+        """The session *session_id*, pinned in memory for the ``with`` block."""
+        session = self.acquire(session_id)
+        try:
+            yield session
+        finally:
+            self.release(session)
+
+    def acquire(self, session_id: str) -> Session:
+        """Return *session_id*, loading or creating it; pin it until :meth:`release`."""
+        path = self._path(session_id)
+        while True:
+            with self._lock:
+                session = self._resident.get(session_id)
+                if session is not None:
+                    self.hits += 1
+                    self._resident.move_to_end(session_id)
+                    session.pins += 1
+                    session.last_used = time.monotonic()
+                    return session
+                busy = self._busy.get(session_id)
+                if busy is None:
+                    busy = self._busy[session_id] = threading.Event()
+                    break
+            # Being loaded or written out by another thread
+            busy.wait()
+
+        try:
+            session, loaded = self._open(session_id, path)
+            with session.engine.lock:
+                session.footprint = _Footprint()
+                session.nbytes = session.footprint.measure(session)
+        except BaseException:
+            self._done(session_id, busy)
+            raise
+        with self._lock:
+            if loaded:
+                self.misses += 1
+            else:
+                self.created += 1
+            self._resident[session_id] = session
+            self._bytes += session.nbytes
+            session.pins += 1
+            session.last_used = time.monotonic()
+            del self._busy[session_id]
+            victims = self._victims()
+        busy.set()
+        self._write_out(victims)
+        return session
+
+    def release(self, session: Session) -> None:
+        """Unpin *session* and account for whatever it grew or shrank by."""
+        # Measured outside the manager's lock, as other threads may still
+        # be playing this session
+        if session.footprint is not None:
+            with session.engine.lock:
+                session.footprint.update(session)
+        with self._lock:
+            if session.pins <= 0:
+                raise RuntimeError(f"Session '{session.id}' is not acquired")
+            session.pins -= 1
+            if self._resident.get(session.id) is session and session.footprint is not None:
+                # The latest estimate, should another release have measured since
+                nbytes = session.footprint.nbytes
+                self._bytes += nbytes - session.nbytes
+                session.nbytes = nbytes
+            victims = self._victims()
+        self._write_out(victims)
+
+    def _open(self, session_id: str, path: Path) -> tuple[Session, bool]:
+        """Load *session_id* from *path* or create it; also says whether it was loaded."""
+        engine = _load(path)
+        if engine is not None:
+            session = self._assemble(session_id, engine)
+            if session.agent is not None and (path / HISTORY_NAME).exists():
+                session.agent.history = codec.read_json(path / HISTORY_NAME)
+            return session, True
+        return self._assemble(session_id, self.new_engine(session_id)), False
+
+    def _done(self, session_id: str, busy: threading.Event) -> None:
+        """End the I/O announced by *busy* and wake whoever waits for it."""
+        with self._lock:
+            del self._busy[session_id]
+        busy.set()
+
+    def _assemble(self, session_id: str, engine: StateEngine) -> Session:
+        tools = ArbiterTools(engine)
+        agent = self.new_agent(tools) if self.new_agent is not None else None
+        return Session(id=session_id, engine=engine, tools=tools, agent=agent)
+
+    def _path(self, session_id: str) -> Path:
+        if not _SESSION_ID.fullmatch(session_id) or session_id.strip(".") == "":
+            raise ValueError(f"Invalid session id '{session_id}'")
+        return self.directory / session_id
+
+    # -- Batches ---------------------------------------------------------
+
+    def apply_actions(self, actions: Iterable[tuple[str, Action]]) -> BatchResult:
+        """Run ``(session_id, action)`` pairs in one pass (see :mod:`totm.engine.batch`).
+
+        Each session is acquired on its first action and stays pinned
+        until the batch ends; ``BatchResult.sessions`` lists their ids.
+        """
+        acquired: dict[str, tuple[int, Session]] = {}
+        rows: list[Row] = []
+        index: list[int] = []
+        try:
+            for session_id, action in actions:
+                entry = acquired.get(session_id)
+                if entry is None:
+                    entry = acquired[session_id] = (len(acquired), self.acquire(session_id))
+                rows.append(entry[1].engine._adjudicate_locked(action))
+                index.append(entry[0])
+        finally:
+            for _, session in acquired.values():
+                self.release(session)
+        return BatchResult.from_rows(rows, list(acquired), index)
+
+    # -- Eviction --------------------------------------------------------
+
+    def _victims(self) -> list[tuple[Session, threading.Event]]:
+        """Take least recently used idle sessions out until under the ceiling.
+
+        Called with the manager's lock held; each victim is marked busy
+        until :meth:`_write_out` has saved it.
+        """
+        victims = []
+        for session in list(self._resident.values()):
+            if self._bytes <= self.max_bytes:
+                break
+            if session.pins == 0:
+                victims.append(self._take(session))
+        return victims
+
+    def _take(self, session: Session) -> tuple[Session, threading.Event]:
+        del self._resident[session.id]
+        self._bytes -= session.nbytes
+        busy = self._busy[session.id] = threading.Event()
+        return session, busy
+
+    def _write_out(self, victims: list[tuple[Session, threading.Event]]) -> None:
+        """Save sessions taken by :meth:`_take`; called without the manager's lock."""
+        for i, (session, busy) in enumerate(victims):
+            try:
+                path = self._path(session.id)
+                path.mkdir(parents=True, exist_ok=True)
+                _save(session.engine, path)
+                if session.agent is not None:
+                    codec.write_json(path / HISTORY_NAME, session.agent.history)
+            except BaseException:
+                # Keep this and the unsaved rest in memory
+                with self._lock:
+                    for session, busy in victims[i:]:
+                        self._resident[session.id] = session
+                        self._resident.move_to_end(session.id, last=False)
+                        self._bytes += session.nbytes
+                        del self._busy[session.id]
+                        busy.set()
+                raise
+            self._teardown(session)
+            with self._lock:
+                self.evictions += 1
+                del self._busy[session.id]
+            busy.set()
+
+    def _teardown(self, session: Session) -> None:
+        """Detach a session leaving memory from the world it was measured and placed in."""
+        if session.footprint is not None:
+            with session.engine.lock:
+                session.footprint.close()
+        if self.atlas is not None:
+            self.atlas.leave(session.engine)
+
+    def evict(self, session_id: str) -> bool:
+        """Write *session_id* to disk and drop it from memory; False if not resident."""
+        with self._lock:
+            session = self._resident.get(session_id)
+            if session is None:
+                return False
+            if session.pins:
+                raise RuntimeError(f"Session '{session_id}' is in use")
+            victim = self._take(session)
+        self._write_out([victim])
+        return True
+
+    def drop(self, session_id: str) -> None:
+        """Forget *session_id* entirely, in memory and on disk.
+
+        Waits for a load or write-out of it in progress; raises
+        ``RuntimeError`` if it is in use.
+        """
+        path = self._path(session_id)
+        while True:
+            with self._lock:
+                busy = self._busy.get(session_id)
+                if busy is None:
+                    session = self._resident.get(session_id)
+                    if session is not None:
+                        if session.pins:
+                            raise RuntimeError(f"Session '{session_id}' is in use")
+                        del self._resident[session_id]
+                        self._bytes -= session.nbytes
+                    busy = self._busy[session_id] = threading.Event()
+                    break
+            busy.wait()
+        try:
+            if session is not None:
+                self._teardown(session)
+            shutil.rmtree(path, ignore_errors=True)
+        finally:
+            self._done(session_id, busy)
+
+    def close(self) -> None:
+        """Write every idle resident session to disk."""
+        with self._lock:
+            victims = [self._take(s) for s in list(self._resident.values()) if s.pins == 0]
+        self._write_out(victims)
+
+    # -- Reporting -------------------------------------------------------
+
+    def __contains__(self, session_id: str) -> bool:
+        return (
+            session_id in self._resident
+            or session_id in self._busy
+            or _saved(self._path(session_id))
+        )
+
+    def is_resident(self, session_id: str) -> bool:
+        return session_id in self._resident
+
+    @property
+    def resident_bytes(self) -> int:
+        return self._bytes
+
+    def memory(self) -> dict[str, int]:
+        """Estimated bytes per resident session, largest first."""
+        with self._lock:
+            sizes = {sid: s.nbytes for sid, s in self._resident.items()}
+        return dict(sorted(sizes.items(), key=lambda kv: kv[1], reverse=True))
+
+    def stats(self) -> SessionStats:
+        with self._lock:
+            known = set(self._resident) | set(self._busy)
+            resident = len(self._resident)
+            counters = (self._bytes, self.hits, self.misses, self.created, self.evictions)
+        # The directory is scanned without the lock
+        on_disk = sum(1 for p in self.directory.iterdir() if p.name not in known and _saved(p))
+        resident_bytes, hits, misses, created, evictions = counters
+        return SessionStats(
+            sessions=len(known) + on_disk,
+            resident=resident,
+            resident_bytes=resident_bytes,
+            max_bytes=self.max_bytes,
+            hits=hits,
+            misses=misses,
+            created=created,
+            evictions=evictions,
+        )
+
+
+# ---------------------------------------------------------------------------
+# Session files
+# ---------------------------------------------------------------------------
+
+def _saved(path: Path) -> bool:
+    return (path / OVERLAY_NAME).exists() or (path / SAVE_NAME).exists()
+
+
+def _save(engine: StateEngine, path: Path) -> None:
+    """Write *engine* to the session directory *path*, as an overlay if it can."""
+    with engine.lock:
+        world = engine.world
+        template = template_path(world.template) if isinstance(world, SessionWorld) else None
+        if template is None:
+            engine.save_incremental(path / SAVE_NAME)
+            (path / OVERLAY_NAME).unlink(missing_ok=True)
+            return
+        state = engine.to_state(with_world=False)
+        state["template"] = str(template)
+        state["overlay"] = world.overlay_to_dict()
+    codec.write_json(path / OVERLAY_NAME, state)
+    (path / SAVE_NAME).unlink(missing_ok=True)
+
+
+def _load(path: Path) -> StateEngine | None:
+    """The engine saved in session directory *path*, or None if there is none."""
+    if (path / OVERLAY_NAME).exists():
+        state = codec.read_json(path / OVERLAY_NAME)
+        world = SessionWorld.from_overlay(load_template(Path(state["template"])), state["overlay"])
+        return StateEngine.from_state(state, world=world)
+    if (path / SAVE_NAME).exists():
+        return StateEngine.load(path / SAVE_NAME)
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Memory estimate
+# ---------------------------------------------------------------------------
+
+def _session_bytes(session: Session) -> int:
+    """Bytes reachable from *session*'s engine, tools and agent history."""
+    seen: set[int] = set()
+    world = session.engine.world
+    if isinstance(world, SessionWorld):
+        seen.add(id(world.template))  # shared by every session over it
+    return (
+        _deep_sizeof(session.engine, seen)
+        + _deep_sizeof(session.tools, seen)
+        + _deep_sizeof(_history(session), seen)
+    )
+
+
+class _Footprint:
+    """Incremental estimate of the bytes a session owns.
+
+    :meth:`measure` walks the whole session once; :meth:`update` adds what
+    changed since — locations the world reported through its listener,
+    agent history appended, rolls made and tool indexes (re)built — and
+    falls back to a full walk if the engine's world or the agent's history
+    was replaced.  Called with the engine's lock held, like the world's
+    listeners.
+    """
+
+    def __init__(self) -> None:
+        self.nbytes = 0
+        self._world: Any = None
+        # Owned location id -> bytes, as last measured; absent means shared or unmeasured
+        self._locations: dict[str, int] = {}
+        self._dirty: set[str] = set()
+        self._history: Any = None
+        self._history_len = 0
+        self._rolls = 0
+        # Tools attribute -> (id of its value, bytes), for indexes built lazily
+        self._tools: dict[str, tuple[int, int]] = {}
+
+    def measure(self, session: Session) -> int:
+        self.close()
+        engine = session.engine
+        world = self._world = engine.world
+        world.add_listener(self._on_change)
+        if isinstance(world, SessionWorld):
+            owned = [world.get_location(lid) for lid in world.patched_locations]
+        else:
+            owned = world.all_locations()
+        self._locations = {loc.id: _deep_sizeof(loc, set()) for loc in owned}
+        self._history = _history(session)
+        self._history_len = len(self._history) if self._history is not None else 0
+        self._rolls = len(engine.roll_log)
+        self._tools = {
+            name: (id(value), _attribute_bytes(session, value))
+            for name, value in vars(session.tools).items()
+        }
+        self.nbytes = _session_bytes(session)
+        return self.nbytes
+
+    def update(self, session: Session) -> int:
+        engine = session.engine
+        history = _history(session)
+        if engine.world is not self._world or history is not self._history or (
+            history is not None and len(history) < self._history_len
+        ):
+            return self.measure(session)
+        for location_id in self._dirty:
+            loc = self._world.get_location(location_id)
+            size = _deep_sizeof(loc, set()) if loc is not None else 0
+            self.nbytes += size - self._locations.get(location_id, 0)
+            self._locations[location_id] = size
+        self._dirty.clear()
+        if history is not None:
+            seen: set[int] = set()
+            for entry in history[self._history_len:]:
+                self.nbytes += _deep_sizeof(entry, seen) + _POINTER
+            self._history_len = len(history)
+        rolls = len(engine.roll_log)
+        self.nbytes += (rolls - self._rolls) * engine.roll_log.itemsize
+        self._rolls = rolls
+        for name, value in vars(session.tools).items():
+            known = self._tools.get(name)
+            if known is None or known[0] != id(value):
+                size = _attribute_bytes(session, value)
+                self.nbytes += size - (known[1] if known else 0)
+                self._tools[name] = (id(value), size)
+        return self.nbytes
+
+    def close(self) -> None:
+        """Stop listening to the world measured last."""
+        if self._world is not None:
+            self._world.remove_listener(self._on_change)
+            self._world = None
+        self._dirty.clear()
+
+    def _on_change(self, event: str, subject: Location | Journey | None) -> None:
+        if isinstance(subject, Location):
+            self._dirty.add(subject.id)
+
+
+_POINTER = sys.getsizeof([None]) - sys.getsizeof([])
+
+
+def _attribute_bytes(session: Session, value: Any) -> int:
+    """Bytes of one of *session*'s attributes, not counting its engine and world."""
+    world = session.engine.world
+    seen = {id(session.engine), id(world)}
+    if isinstance(world, SessionWorld):
+        seen.add(id(world.template))
+    return _deep_sizeof(value, seen)
+
+
+def _history(session: Session) -> list[Any] | None:
+    return getattr(session.agent, "history", None) if session.agent is not None else None
+
+
+def _deep_sizeof(obj: Any, seen: set[int]) -> int:
+    """``sys.getsizeof`` summed over containers and plain instances reachable from *obj*.
+
+    Functions, methods, classes and modules are not followed; shared
+    interned strings are counted once per walk.
+    """
+    size = 0
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if item is None or id(item) in seen:
+            continue
+        seen.add(id(item))
+        size += sys.getsizeof(item)
+        if isinstance(item, (str, bytes, int, float, bool)):
+            continue
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+        elif not isinstance(item, _OPAQUE):
+            attrs = getattr(item, "__dict__", None)
+            if attrs is not None:
+                stack.append(attrs)
+            for cls in type(item).__mro__:
+                slots = getattr(cls, "__slots__", ())
+                for name in (slots,) if isinstance(slots, str) else slots:
+                    value = getattr(item, name, None)
+                    if value is not None:
+                        stack.append(value)
+    return size
+
+
+_OPAQUE = (
+    type,
+    types.ModuleType,
+    types.FunctionType,
+    types.BuiltinFunctionType,
+    types.MethodType,
+)
@@ -6,7 +6,13 @@ structured result objects suitable for LLM consumption.
 
 from __future__ import annotations
 
+import functools
+
+from totm.engine.graph import Neighborhood
 from totm.engine.models import Character, CharacterClass
+from totm.engine.neighborhood import NeighborhoodCache
+from totm.engine.reachability import ReachabilityIndex
+from totm.engine.routing import RoutePlanner, stat_profile
 from totm.engine.store import StateEngine
 from totm.tools.schema import (
     LocationInfo,
@@ -15,24 +21,70 @@ from totm.tools.schema import (
     TraverseToolResult,
     InteractToolResult,
     CharacterInfo,
+    RouteStepInfo,
+    RouteResult,
+    LocateResult,
+    NeighborhoodResult,
+    RewindResult,
     ToolError,
 )
 
-from typing import Any
+from typing import Any, Callable, TypeVar
+
+# Larger neighborhoods stop being "local" and swamp the GM's context window
+MAX_NEIGHBORHOOD_K = 3
+
+_F = TypeVar("_F", bound=Callable[..., Any])
+
+
+def _serialized(tool: _F) -> _F:
+    """Run *tool* holding the engine's lock, so it reads and acts on one consistent state."""
+    @functools.wraps(tool)
+    def wrapper(self: ArbiterTools, *args: Any, **kwargs: Any) -> Any:
+        with self._engine.lock:
+            return tool(self, *args, **kwargs)
+    return wrapper  # type: ignore[return-value]
 
 
 class ArbiterTools:
     """Stateless façade that wraps a :class:`StateEngine` with GM-friendly tools.
 
     Every public method returns a dict (via ``.to_dict()``) so the GM can
-    consume the result directly as structured data.
+    consume the result directly as structured data, and runs under the
+    engine's lock: tools may be called from several threads at once.
     """
 
     def __init__(self, engine: StateEngine) -> None:
         self._engine = engine
+        self._planner: RoutePlanner | None = None
+        self._reachability: ReachabilityIndex | None = None
+        self._neighborhoods: NeighborhoodCache | None = None
+
+    @property
+    def engine(self) -> StateEngine:
+        return self._engine
+
+    def _sync_indexes(self) -> None:
+        """(Re)build the world-derived indexes if the engine's world was swapped.
+
+        The engine's world is replaced on New Game / Load Game.
+        """
+        world = self._engine.world
+        if self._planner is not None and self._planner.world is world:
+            return
+        if self._planner is not None:
+            self._planner.close()
+        if self._reachability is not None:
+            self._reachability.close()
+        if self._neighborhoods is not None:
+            self._neighborhoods.close()
+        self._planner = RoutePlanner(world)
+        self._reachability = ReachabilityIndex(world)
+        self._neighborhoods = NeighborhoodCache(world, summarize=_summarize_neighborhood)
 
     # -- get_location ----------------------------------------------------
 
+    @_serialized
     def get_location(self) -> dict[str, Any]:
         """Return details of the current location, including GM guide."""
         loc = self._engine.current_location
@@ -52,6 +104,7 @@ class ArbiterTools:
 
     # -- get_exits -------------------------------------------------------
 
+    @_serialized
     def get_exits(self) -> dict[str, Any]:
         """Return all exits (journeys) from the current location."""
         loc = self._engine.current_location
@@ -59,17 +112,27 @@ class ArbiterTools:
             return ToolError(tool="get_exits", message="No current location set.").to_dict()
 
         journeys = self._engine.world.exits(loc.id)
+        char = self._engine.character
+        if char is not None:
+            self._sync_indexes()
+            assert self._planner is not None
+            profile = stat_profile(char)
         exit_infos = []
         for j in journeys:
             dest = self._engine.world.get_location(j.to_id)
-            exit_infos.append(ExitInfo(
+            info = ExitInfo(
                 journey_id=j.id,
                 direction=j.direction,
                 destination_name=dest.name if dest else j.to_id,
                 difficulty=j.difficulty,
                 risks=j.risks,
                 description=j.description,
-            ))
+            )
+            if char is not None:
+                step = self._planner.step(j, profile)
+                info.success_chance = round(step.success_chance, 3)
+                info.expected_damage = round(step.expected_damage, 3)
+            exit_infos.append(info)
 
         return ExitsResult(
             location_id=loc.id,
@@ -77,8 +140,102 @@ class ArbiterTools:
             exits=exit_infos,
         ).to_dict()
 
+    # -- plan_route ------------------------------------------------------
+
+    @_serialized
+    def plan_route(self, destination_id: str) -> dict[str, Any]:
+        """Return the safest path from the current location to *destination_id*."""
+        loc = self._engine.current_location
+        if loc is None:
+            return ToolError(tool="plan_route", message="No current location set.").to_dict()
+        char = self._engine.character
+        if char is None:
+            return ToolError(tool="plan_route", message="No active character.").to_dict()
+        world = self._engine.world
+        if world.get_location(destination_id) is None:
+            return ToolError(
+                tool="plan_route",
+                message=f"Location '{destination_id}' does not exist.",
+            ).to_dict()
+
+        self._sync_indexes()
+        route = None
+        if self._reachability.can_reach(loc.id, destination_id):
+            route = self._planner.route(loc.id, destination_id, stat_profile(char))
+        if route is None:
+            return RouteResult(
+                from_location=loc.id,
+                to_location=destination_id,
+                reachable=False,
+                message=f"No passable route to '{destination_id}'.",
+            ).to_dict()
+
+        steps = []
+        for step in route.steps:
+            j = step.journey
+            dest = world.get_location(j.to_id)
+            steps.append(RouteStepInfo(
+                journey_id=j.id,
+                direction=j.direction,
+                from_location=j.from_id,
+                to_location=j.to_id,
+                destination_name=dest.name if dest else j.to_id,
+                difficulty=j.difficulty,
+                stat_used=step.stat_used,
+                success_chance=round(step.success_chance, 3),
+            ))
+        return RouteResult(
+            from_location=loc.id,
+            to_location=destination_id,
+            reachable=True,
+            steps=steps,
+            total_cost=round(route.cost, 3),
+            success_chance=round(route.success_chance, 3),
+            expected_damage=round(route.expected_damage, 3),
+            message=f"{len(steps)} step(s) to '{destination_id}'.",
+        ).to_dict()
+
+    # -- get_neighborhood ------------------------------------------------
+
+    @_serialized
+    def get_neighborhood(self, k: int = 2) -> dict[str, Any]:
+        """Return every location, journey and NPC within *k* moves.
+
+        Results are cached until something inside the neighborhood changes;
+        the returned dict is shared and must not be mutated.
+        """
+        loc = self._engine.current_location
+        if loc is None:
+            return ToolError(tool="get_neighborhood", message="No current location set.").to_dict()
+        if not 0 <= k <= MAX_NEIGHBORHOOD_K:
+            return ToolError(
+                tool="get_neighborhood",
+                message=f"k must be between 0 and {MAX_NEIGHBORHOOD_K}.",
+            ).to_dict()
+        self._sync_indexes()
+        return self._neighborhoods.get(loc.id, k)
+
+    # -- locate ----------------------------------------------------------
+
+    @_serialized
+    def locate(self, target_id: str) -> dict[str, Any]:
+        """Return where an NPC (by id) or item is anywhere in the world."""
+        world = self._engine.world
+        loc = world.locate_npc(target_id)
+        if loc is not None:
+            kind, locations = "npc", [loc]
+        else:
+            locations = world.locations_with_item(target_id)
+            kind = "item" if locations else ""
+        return LocateResult(
+            target_id=target_id,
+            kind=kind,
+            locations=[{"id": l.id, "name": l.name} for l in locations],
+        ).to_dict()
+
     # -- traverse --------------------------------------------------------
 
+    @_serialized
     def traverse(self, journey_id: str) -> dict[str, Any]:
         """Attempt to traverse a journey. Returns deterministic outcome."""
         result = self._engine.traverse(journey_id)
@@ -103,6 +260,7 @@ class ArbiterTools:
 
     # -- interact --------------------------------------------------------
 
+    @_serialized
     def interact(self, npc_id: str, action: str) -> dict[str, Any]:
         """Interact with an NPC (attack, talk). Returns outcome."""
         result = self._engine.interact(npc_id, action)
@@ -129,8 +287,33 @@ class ArbiterTools:
             message=result.message,
         ).to_dict()
 
+    # -- rewind ----------------------------------------------------------
+
+    @_serialized
+    def rewind(self, turns: int = 1) -> dict[str, Any]:
+        """Take back the last *turns* turns (a retcon). Needs an undo log on the engine."""
+        if self._engine.undo_log is None:
+            return ToolError(tool="rewind", message="Undo is not enabled for this game.").to_dict()
+        if turns < 1:
+            return ToolError(tool="rewind", message="turns must be at least 1.").to_dict()
+
+        reverted = self._engine.rewind(turns)
+        loc = self._engine.current_location
+        char = self._engine.character
+        return RewindResult(
+            turns=turns,
+            changes_reverted=reverted,
+            location_id=loc.id if loc else "",
+            location_name=loc.name if loc else "",
+            character_hp=f"{char.hp}/{char.max_hp}" if char else "",
+            message=(
+                f"Rewound {reverted} change(s)." if reverted else "Nothing to take back."
+            ),
+        ).to_dict()
+
     # -- update_character ------------------------------------------------
 
+    @_serialized
     def update_character(
         self,
         name: str,
@@ -181,6 +364,7 @@ class ArbiterTools:
 
     # -- get_character (bonus utility) -----------------------------------
 
+    @_serialized
     def get_character(self) -> dict[str, Any]:
         """Return the current character snapshot."""
         char = self._engine.character
@@ -198,3 +382,25 @@ class ArbiterTools:
             xp=char.xp,
             inventory=char.inventory,
         ).to_dict()
+
+
+def _summarize_neighborhood(hood: Neighborhood) -> dict[str, Any]:
+    names = {loc.id: loc.name for loc in hood.locations}
+    return NeighborhoodResult(
+        location_id=hood.center_id,
+        k=hood.k,
+        locations=[
+            {"id": loc.id, "name": loc.name, "depth": hood.depth[loc.id],
+             "description": loc.description,
+             "npcs": [{"id": n.id, "name": n.name, "hp": n.hp, "hostile": n.hostile}
+                      for n in loc.npcs],
+             "inventory": list(loc.inventory)}
+            for loc in hood.locations
+        ],
+        journeys=[
+            {"journey_id": j.id, "from_location": j.from_id, "to_location": j.to_id,
+             "destination_name": names.get(j.to_id, j.to_id), "direction": j.direction,
+             "difficulty": j.difficulty, "risks": list(j.risks)}
+            for j in hood.journeys
+        ],
+    ).to_dict()
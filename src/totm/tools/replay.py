@@ -0,0 +1,227 @@
+"""Record and replay ArbiterTools sessions — no LLM involved.
+
+A :class:`SessionRecorder` captures the engine state (RNG included) when it
+starts, then every tool call with its arguments, result and the dice it
+rolled.  :func:`replay` rebuilds the engine from that state and re-issues
+the calls, reporting any call whose result differs.  Recordings are plain
+JSON, so production sessions can be checked in as regression tests or
+replayed as an offline benchmark::
+
+    python -m totm.tools.replay session.json --repeat 10
+
+By default a replay feeds the engine the recorded rolls, which pins the
+outcome of every check even if the RNG algorithm changes; ``--rolls seed``
+instead re-derives them from the recorded RNG state.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+
+from totm.engine import codec
+from totm.engine.store import StateEngine
+from totm.tools.api import ArbiterTools
+
+FORMAT_VERSION = 1
+
+
+class ReplayError(RuntimeError):
+    """The recording cannot be replayed (e.g. it ran out of recorded rolls)."""
+
+
+@dataclass
+class ToolCall:
+    """One recorded tool invocation."""
+
+    tool: str
+    args: dict[str, Any]
+    result: dict[str, Any]
+    rolls: list[int] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"tool": self.tool, "args": self.args, "result": self.result, "rolls": self.rolls}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> ToolCall:
+        return cls(
+            tool=data["tool"],
+            args=data.get("args", {}),
+            result=data["result"],
+            rolls=list(data.get("rolls", ())),
+        )
+
+
+@dataclass
+class Recording:
+    """Engine state at the start of a session plus the tool calls that followed."""
+
+    start: dict[str, Any]
+    calls: list[ToolCall] = field(default_factory=list)
+
+    @property
+    def rolls(self) -> list[int]:
+        return [r for call in self.calls for r in call.rolls]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "version": FORMAT_VERSION,
+            "start": self.start,
+            "calls": [c.to_dict() for c in self.calls],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Recording:
+        if data.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported recording version: {data.get('version')!r}")
+        return cls(start=data["start"], calls=[ToolCall.from_dict(c) for c in data["calls"]])
+
+    def save(self, path: Path) -> None:
+        codec.write_json(path, self.to_dict())
+
+    @classmethod
+    def load(cls, path: Path) -> Recording:
+        return cls.from_dict(codec.read_json(path))
+
+
+def _tool(tools: ArbiterTools, name: str) -> Callable[..., dict[str, Any]]:
+    if name.startswith("_") or not callable(getattr(tools, name, None)):
+        raise ReplayError(f"Unknown tool '{name}'")
+    return getattr(tools, name)
+
+
+class SessionRecorder:
+    """Records every tool call made through it on *tools*."""
+
+    def __init__(self, tools: ArbiterTools) -> None:
+        self.tools = tools
+        self.recording = Recording(start=tools.engine.to_state())
+
+    def call(self, tool: str, **args: Any) -> dict[str, Any]:
+        engine = self.tools.engine
+        first_roll = len(engine.roll_log)
+        result = _tool(self.tools, tool)(**args)
+        self.recording.calls.append(ToolCall(
+            tool=tool,
+            args=args,
+            # Stored as it will be read back, so replays compare like with like
+            result=codec.loads(codec.dumps(result)),
+            rolls=engine.roll_log[first_roll:].tolist(),
+        ))
+        return result
+
+    def wrap(self, tool_map: dict[str, Callable[..., Any]]) -> dict[str, Callable[..., Any]]:
+        """A tool map with the same names whose calls are recorded."""
+        def recorded(name: str) -> Callable[..., Any]:
+            return lambda **args: self.call(name, **args)
+        return {name: recorded(name) for name in tool_map}
+
+
+# ---------------------------------------------------------------------------
+# Replay
+# ---------------------------------------------------------------------------
+
+class _RecordedRolls:
+    """Stands in for the engine RNG, handing out recorded rolls in order."""
+
+    def __init__(self, rolls: list[int]) -> None:
+        self._rolls = iter(rolls)
+
+    def randint(self, a: int, b: int) -> int:
+        value = next(self._rolls, None)
+        if value is None:
+            raise ReplayError("Session made more rolls than were recorded")
+        if not a <= value <= b:
+            raise ReplayError(f"Recorded roll {value} outside {a}..{b}")
+        return value
+
+
+@dataclass
+class Divergence:
+    """A replayed call whose result or rolls differ from the recording."""
+
+    index: int
+    tool: str
+    expected: dict[str, Any]
+    actual: dict[str, Any]
+
+
+@dataclass
+class ReplayReport:
+    calls: int
+    rolls: int
+    seconds: float
+    divergences: list[Divergence] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.divergences
+
+    @property
+    def calls_per_s(self) -> float:
+        return self.calls / self.seconds if self.seconds > 0 else float("inf")
+
+
+def replay(
+    recording: Recording,
+    *,
+    rolls: str = "log",
+    stop_on_divergence: bool = False,
+) -> ReplayReport:
+    """Re-run *recording* against a fresh engine and compare every result.
+
+    *rolls* is ``"log"`` to feed the recorded dice or ``"seed"`` to draw
+    them from the recorded RNG state.
+    """
+    if rolls not in ("log", "seed"):
+        raise ValueError(f"rolls must be 'log' or 'seed', not '{rolls}'")
+    feed = _RecordedRolls(recording.rolls) if rolls == "log" else None
+    engine = StateEngine.from_state(recording.start, rng=feed)  # type: ignore[arg-type]
+    tools = ArbiterTools(engine)
+
+    report = ReplayReport(calls=0, rolls=0, seconds=0.0)
+    start = time.perf_counter()
+    for index, call in enumerate(recording.calls):
+        first_roll = len(engine.roll_log)
+        result = _tool(tools, call.tool)(**call.args)
+        report.calls += 1
+        drawn = engine.roll_log[first_roll:].tolist()
+        if drawn != call.rolls or (
+            result != call.result and codec.loads(codec.dumps(result)) != call.result
+        ):
+            report.divergences.append(Divergence(
+                index=index, tool=call.tool,
+                expected={"result": call.result, "rolls": call.rolls},
+                actual={"result": result, "rolls": drawn},
+            ))
+            if stop_on_divergence:
+                break
+    report.seconds = time.perf_counter() - start
+    report.rolls = len(engine.roll_log)
+    return report
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Replay a recorded TOTM tool session.")
+    parser.add_argument("recording", type=Path)
+    parser.add_argument("--rolls", choices=("log", "seed"), default="log")
+    parser.add_argument("--repeat", type=int, default=1, help="Replay this many times (benchmarking)")
+    args = parser.parse_args(argv)
+
+    recording = Recording.load(args.recording)
+    reports = [replay(recording, rolls=args.rolls) for _ in range(args.repeat)]
+    seconds = sum(r.seconds for r in reports)
+    calls = sum(r.calls for r in reports)
+    bad = reports[0].divergences
+    print(f"{calls} calls in {seconds:.4f}s ({calls / seconds if seconds else float('inf'):.0f} calls/s)")
+    for d in bad:
+        print(f"  call {d.index} ({d.tool}) diverged:\n    expected {d.expected}\n    actual   {d.actual}")
+    sys.exit(1 if bad else 0)
+
+
+if __name__ == "__main__":
+    main()
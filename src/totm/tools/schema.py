@@ -6,7 +6,7 @@ without needing to understand the engine internals.
 
 from __future__ import annotations
 
-from dataclasses import dataclass, asdict, field
+from dataclasses import dataclass, field
 from typing import Any
 
 
@@ -22,7 +22,14 @@ class LocationInfo:
     gm_guide: str
 
     def to_dict(self) -> dict[str, Any]:
-        return asdict(self)
+        return {
+            "id": self.id,
+            "name": self.name,
+            "description": self.description,
+            "npcs": list(self.npcs),
+            "inventory": list(self.inventory),
+            "gm_guide": self.gm_guide,
+        }
 
 
 @dataclass
@@ -35,9 +42,21 @@ class ExitInfo:
     difficulty: int
     risks: list[str]
     description: str
+    # Odds of one attempt for the active character; None without one
+    success_chance: float | None = None
+    expected_damage: float | None = None
 
     def to_dict(self) -> dict[str, Any]:
-        return asdict(self)
+        return {
+            "journey_id": self.journey_id,
+            "direction": self.direction,
+            "destination_name": self.destination_name,
+            "difficulty": self.difficulty,
+            "risks": list(self.risks),
+            "description": self.description,
+            "success_chance": self.success_chance,
+            "expected_damage": self.expected_damage,
+        }
 
 
 @dataclass
@@ -74,7 +93,20 @@ class TraverseToolResult:
     character_hp: str = ""
 
     def to_dict(self) -> dict[str, Any]:
-        return asdict(self)
+        return {
+            "success": self.success,
+            "journey_id": self.journey_id,
+            "from_location": self.from_location,
+            "to_location": self.to_location,
+            "stat_used": self.stat_used,
+            "stat_value": self.stat_value,
+            "difficulty": self.difficulty,
+            "roll": self.roll,
+            "damage": self.damage,
+            "message": self.message,
+            "new_location_name": self.new_location_name,
+            "character_hp": self.character_hp,
+        }
 
 
 @dataclass
@@ -94,7 +126,19 @@ class InteractToolResult:
     message: str
 
     def to_dict(self) -> dict[str, Any]:
-        return asdict(self)
+        return {
+            "success": self.success,
+            "npc_id": self.npc_id,
+            "npc_name": self.npc_name,
+            "action": self.action,
+            "stat_used": self.stat_used,
+            "damage_dealt": self.damage_dealt,
+            "damage_taken": self.damage_taken,
+            "npc_defeated": self.npc_defeated,
+            "npc_hp": self.npc_hp,
+            "character_hp": self.character_hp,
+            "message": self.message,
+        }
 
 
 @dataclass
@@ -112,7 +156,129 @@ class CharacterInfo:
     inventory: list[str]
 
     def to_dict(self) -> dict[str, Any]:
-        return asdict(self)
+        return {
+            "name": self.name,
+            "char_class": self.char_class,
+            "brawn": self.brawn,
+            "brains": self.brains,
+            "faith": self.faith,
+            "speed": self.speed,
+            "hp": self.hp,
+            "xp": self.xp,
+            "inventory": list(self.inventory),
+        }
+
+
+@dataclass
+class RouteStepInfo:
+    """A single journey along a planned route."""
+
+    journey_id: str
+    direction: str
+    from_location: str
+    to_location: str
+    destination_name: str
+    difficulty: int
+    stat_used: str
+    success_chance: float
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "journey_id": self.journey_id,
+            "direction": self.direction,
+            "from_location": self.from_location,
+            "to_location": self.to_location,
+            "destination_name": self.destination_name,
+            "difficulty": self.difficulty,
+            "stat_used": self.stat_used,
+            "success_chance": self.success_chance,
+        }
+
+
+@dataclass
+class RouteResult:
+    """Result of plan_route — cheapest path from the current location."""
+
+    from_location: str
+    to_location: str
+    reachable: bool
+    steps: list[RouteStepInfo] = field(default_factory=list)
+    total_cost: float = 0.0
+    success_chance: float = 0.0
+    expected_damage: float = 0.0
+    message: str = ""
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "from_location": self.from_location,
+            "to_location": self.to_location,
+            "reachable": self.reachable,
+            "steps": [s.to_dict() for s in self.steps],
+            "total_cost": self.total_cost,
+            "success_chance": self.success_chance,
+            "expected_damage": self.expected_damage,
+            "message": self.message,
+        }
+
+
+@dataclass
+class LocateResult:
+    """Result of locate — where an NPC or item can be found in the world."""
+
+    target_id: str
+    kind: str  # "npc", "item" or "" when nothing matched
+    locations: list[dict[str, str]]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "target_id": self.target_id,
+            "kind": self.kind,
+            "locations": list(self.locations),
+        }
+
+
+@dataclass
+class NeighborhoodResult:
+    """Result of get_neighborhood — everything within k moves of the character.
+
+    Each location carries its hop ``depth`` from the current location; each
+    journey is an exit the character could attempt within k moves.
+    """
+
+    location_id: str
+    k: int
+    locations: list[dict[str, Any]]
+    journeys: list[dict[str, Any]]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "location_id": self.location_id,
+            "k": self.k,
+            "locations": list(self.locations),
+            "journeys": list(self.journeys),
+        }
+
+
+@dataclass
+class RewindResult:
+    """Result of rewind — the state after taking turns back."""
+
+    turns: int
+    changes_reverted: int
+    location_id: str
+    location_name: str
+    character_hp: str
+    message: str
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "turns": self.turns,
+            "changes_reverted": self.changes_reverted,
+            "location_id": self.location_id,
+            "location_name": self.location_name,
+            "character_hp": self.character_hp,
+            "message": self.message,
+        }
 
 
 @dataclass
@@ -124,4 +290,8 @@ class ToolError:
     message: str = ""
 
     def to_dict(self) -> dict[str, Any]:
-        return asdict(self)
+        return {
+            "error": self.error,
+            "tool": self.tool,
+            "message": self.message,
+        }
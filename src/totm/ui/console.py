@@ -7,6 +7,8 @@ import sys
 import shutil
 from typing import Callable, NoReturn, Optional
 
+from totm.engine.atlas import WorldAtlas
+from totm.engine.autosave import AutoSaver
 from totm.engine.store import StateEngine
 from totm.engine.models import Character, CharacterClass
 from totm.tools.api import ArbiterTools
@@ -23,10 +25,22 @@ from totm.agent.client import GMAgent
 class Console:
     """The terminal interface controller."""
 
-    def __init__(self, engine: StateEngine, tools: ArbiterTools, agent: Optional[GMAgent] = None) -> None:
+    def __init__(
+        self,
+        engine: StateEngine,
+        tools: ArbiterTools,
+        agent: Optional[GMAgent] = None,
+        autosaver: Optional[AutoSaver] = None,
+        atlas: Optional[WorldAtlas] = None,
+    ) -> None:
         self.engine = engine
         self.tools = tools
         self.agent = agent
+        # Saves in the background once the player has saved or loaded,
+        # so a New Game never overwrites the save file unasked
+        self.autosaver = autosaver
+        # Told when the character leaves its region, so the region can be evicted
+        self.atlas = atlas
         self.parser = TriggerParser()
         self._running = True
 
@@ -43,6 +57,10 @@ class Console:
                 # Optional: prompt to retry or crash
                 if input("Continue? (y/n) > ").lower() != "y":
                     self._running = False
+        if self.autosaver:
+            self.autosaver.close()
+        if self.atlas:
+            self.atlas.leave(self.engine)
 
     def _show_main_menu(self) -> None:
         """Display the top-level menu."""
@@ -85,17 +103,36 @@ class Console:
         from pathlib import Path
         well_path = Path("src/totm/engine/worlds/well.json")
         if well_path.exists():
-            from totm.engine.graph import WorldGraph
-            new_world = WorldGraph.load(well_path)
-            self.engine.world = new_world
-            self.engine.set_character(None) # Clear active char
-            self.engine.set_location("loc_well_top")
+            from totm.engine.overlay import SessionWorld, load_template
+            # The template is parsed once per process; the session only
+            # records what the player changes.
+            new_world = SessionWorld(load_template(well_path))
+            if self.autosaver:
+                # Finish saving the old game; the new one autosaves after Save Game
+                self.autosaver.close()
+            # One step for anything else driving the engine (autosave, agents)
+            with self.engine.lock:
+                if self.atlas:
+                    self.atlas.leave(self.engine)
+                self.engine.world = new_world
+                self.engine.set_character(None) # Clear active char
+                self.engine.set_location("loc_well_top")
+                if self.engine.undo_log:
+                    self.engine.undo_log.clear()
             print_success("New game initialized: Dark Forest")
         else:
             print_error("Could not find world template.")
 
     def _save_game(self) -> None:
         from pathlib import Path
+        if self.autosaver:
+            # Written by the autosave thread; the menu doesn't wait for the disk
+            if self.autosaver.running:
+                self.autosaver.request()
+            else:
+                self.autosaver.start()
+            print_success(f"Saving game to {self.autosaver.path.absolute()}")
+            return
         save_path = Path("save.json")
         self.engine.save(save_path)
         print_success(f"Game saved to {save_path.absolute()}")
@@ -106,13 +143,19 @@ class Console:
         if not save_path.exists():
             print_error("No save file found.")
             return
-        
+        if self.autosaver:
+            self.autosaver.flush()
+
         # We need to *replace* the engine instance or update it in place.
         # The clean way is to load a new engine and copy state.
         loaded = StateEngine.load(save_path)
-        self.engine.world = loaded.world
-        self.engine._character = loaded._character
-        self.engine._current_location_id = loaded._current_location_id
+        with self.engine.lock:
+            if self.atlas:
+                self.atlas.leave(self.engine)
+            self.engine.adopt(loaded)
+        if self.autosaver:
+            # Play continues in the slot just loaded
+            self.autosaver.start()
         # Re-sync tools? Tools hold a reference to the engine instance, so mutating it in place works.
         print_success("Game loaded.")
 
@@ -180,16 +223,36 @@ class Console:
                     elif intent.tool == "help":
                         self._show_help()
                         continue
-                    
-                    # Tool call
-                    self._handle_tool(intent.tool, intent.args)
+                    elif intent.tool == "rewind":
+                        self._rewind(int(intent.args.get("turns", 1)))
+                    else:
+                        # Tool call
+                        self._mark_turn()
+                        self._handle_tool(intent.tool, intent.args)
                 else:
                     # Narrative input -> GM Agent
+                    self._mark_turn()
                     self._handle_narrative(user_input)
 
+                if self.autosaver:
+                    self.autosaver.turn()
+
             except KeyboardInterrupt:
                 break
 
+    def _mark_turn(self) -> None:
+        if self.engine.undo_log:
+            self.engine.undo_log.mark()
+
+    def _rewind(self, turns: int) -> None:
+        res = self.tools.rewind(turns)
+        if "error" in res:
+            print_error(res["message"])
+            return
+        print_system(res["message"])
+        if res["changes_reverted"]:
+            self._handle_tool("get_location", {})
+
     def _handle_tool(self, tool_name: str, args: dict) -> None:
         """Execute a tool and print the result."""
         # Map generic tool names to actual tool calls if needed, or dispatch dynamically
@@ -250,6 +313,7 @@ class Console:
         print("  look, /look      - Describe current area")
         print("  exits, /exits    - Show paths")
         print("  stats, /stats    - Show character sheet")
+        print("  undo [n], /undo  - Take back the last n turns")
         print("  quit, /quit      - Leave game")
         print("Narrative:")
         print("  Just type what you want to do! (e.g. 'I climb down the well')") 
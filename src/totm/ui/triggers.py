@@ -34,6 +34,9 @@ class TriggerParser:
         # Exits
         (r"(?i)^(?:exits|paths|ways out|directions)$", "get_exits", {}),
         
+        # Retcon
+        (r"(?i)^/?(?:undo|rewind)(?:\s+(?P<turns>\d+))?$", "rewind", {}),
+
         # Help
         (r"(?i)^(?:help|what can i do\??)$", "help", {}),
         
@@ -52,8 +55,10 @@ class TriggerParser:
 
         # Check plain text regex triggers
         for pattern, tool, args in self.PATTERNS:
-            if re.match(pattern, text):
-                return Intent(tool=tool, args=args, confidence=1.0)
+            match = re.match(pattern, text)
+            if match:
+                captured = {k: v for k, v in match.groupdict().items() if v is not None}
+                return Intent(tool=tool, args={**args, **captured}, confidence=1.0)
 
         # Check specific slash commands if any remain that aren't regex'd
         if text.startswith("/"):
@@ -0,0 +1,105 @@
+"""Tests for the vectorized journey odds tables."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from totm.engine.analytics import class_profiles, journey_odds, main, odds
+from totm.engine.graph import WorldGraph
+from totm.engine.models import Character, CharacterClass, Journey, Location
+from totm.engine.routing import RoutePlanner, stat_profile
+from totm.engine.store import expected_damage, success_probability
+
+WELL_PATH = Path(__file__).resolve().parent.parent / "src" / "totm" / "engine" / "worlds" / "well.json"
+
+
+@pytest.fixture
+def world() -> WorldGraph:
+    g = WorldGraph(region="R")
+    for lid in "abc":
+        g.add_location(Location(id=lid, name=lid.upper()))
+    g.add_journey(Journey(id="climb", from_id="a", to_id="b", difficulty=6, risks=["Steep climb"]))
+    g.add_journey(Journey(id="plain", from_id="b", to_id="c", difficulty=2))
+    g.add_journey(Journey(id="ward", from_id="c", to_id="a", difficulty=12, risks=["Cursed ward"]))
+    return g
+
+
+class TestOdds:
+    def test_matches_scalar_formulas(self):
+        stats, diffs = np.meshgrid(np.arange(-1, 15), np.arange(-1, 15))
+        success, expected, worst = odds(stats, diffs)
+        for s, d, p, e, w in zip(stats.ravel(), diffs.ravel(), success.ravel(),
+                                 expected.ravel(), worst.ravel()):
+            assert p == success_probability(int(s), int(d))
+            assert e == pytest.approx(expected_damage(int(s), int(d)))
+            assert w == (d - 1 if d > 1 else 0)
+
+    def test_max_damage_is_a_roll_of_one(self):
+        _, _, worst = odds(4, 7)
+        assert worst == 6
+
+
+class TestJourneyOdds:
+    def test_default_columns_are_classes(self, world: WorldGraph):
+        table = journey_odds(world)
+        assert table.labels == [c.value for c in CharacterClass]
+        assert table.success.shape == (3, 4)
+
+    def test_agrees_with_engine_stat_choice(self, world: WorldGraph):
+        table = journey_odds(world)
+        planner = RoutePlanner(world)
+        for cls in CharacterClass:
+            profile = stat_profile(Character.create("x", cls))
+            for journey in world.all_journeys():
+                step = planner._step(journey, profile)
+                row = table.lookup(journey.id, cls.value)
+                assert row["stat_used"] == step.stat_used
+                assert row["stat_value"] == step.stat_value
+                assert row["success_chance"] == step.success_chance
+                assert row["expected_damage"] == pytest.approx(step.expected_damage)
+
+    def test_custom_stat_blocks(self, world: WorldGraph):
+        table = journey_odds(world, {"even": (6, 6, 6, 6), "tie": (5, 5, 1, 1)})
+        assert table.lookup("plain", "even")["success_chance"] == 5 / 6
+        # No risk keyword: the first highest stat wins ties
+        assert table.lookup("plain", "tie")["stat_used"] == "brawn"
+
+    def test_summary(self, world: WorldGraph):
+        rows = {r["label"]: r for r in journey_odds(world).summary(top=1)}
+        assert rows["warrior"]["impassable"] == 1
+        assert rows["warrior"]["hardest"][0]["journey_id"] == "ward"
+        assert rows["warrior"]["max_damage"] == 11
+
+    def test_empty_world(self):
+        rows = journey_odds(WorldGraph(region="E")).summary()
+        assert rows[0]["journeys"] == 0
+        assert rows[0]["hardest"] == []
+
+    def test_lookup_errors(self, world: WorldGraph):
+        table = journey_odds(world)
+        with pytest.raises(ValueError):
+            table.lookup("missing", "warrior")
+        with pytest.raises(ValueError):
+            table.lookup("plain", "bard")
+
+    def test_class_profiles(self):
+        assert class_profiles()["warrior"] == (8, 3, 2, 4)
+
+
+class TestCli:
+    def test_text_report(self, capsys):
+        main([str(WELL_PATH), "--top", "1"])
+        out = capsys.readouterr().out
+        assert "warrior" in out and "impassable" in out
+
+    def test_json_report_with_custom_stats(self, capsys):
+        main([str(WELL_PATH), "--stats", "6,6,6,6", "--json"])
+        report = json.loads(capsys.readouterr().out)
+        assert [r["label"] for r in report][-1] == "6,6,6,6"
+
+    def test_bad_stats(self):
+        with pytest.raises(SystemExit):
+            main([str(WELL_PATH), "--stats", "1,2"])
@@ -0,0 +1,169 @@
+"""Tests for WorldAtlas — lazy multi-region loading, portals and eviction."""
+
+import json
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+
+from totm.engine.atlas import WorldAtlas
+from totm.engine.graph import WorldGraph
+from totm.engine.models import Character, CharacterClass
+from totm.engine.store import StateEngine
+from totm.engine.undo import UndoLog
+
+
+def _write_region(directory: Path, name: str, loc_ids: list[str], portals: list[dict]) -> Path:
+    data = {
+        "region": name,
+        "locations": [{"id": lid, "name": lid.upper()} for lid in loc_ids],
+        "journeys": [
+            {"id": f"j_{a}_{b}", "from_id": a, "to_id": b, "difficulty": 1}
+            for a, b in zip(loc_ids, loc_ids[1:])
+        ],
+        "portals": portals,
+    }
+    path = directory / f"{name.lower()}.json"
+    path.write_text(json.dumps(data))
+    return path
+
+
+@pytest.fixture
+def atlas_dir(tmp_path: Path) -> Path:
+    _write_region(tmp_path, "North", ["n1", "n2"], [
+        {"id": "p_north_south", "from_id": "n2", "to_id": "s1", "to_region": "South", "difficulty": 2},
+    ])
+    _write_region(tmp_path, "South", ["s1", "s2"], [
+        {"id": "p_south_north", "from_id": "s1", "to_id": "n2", "to_region": "North", "difficulty": 2},
+    ])
+    return tmp_path
+
+
+@pytest.fixture
+def engine() -> StateEngine:
+    e = StateEngine(WorldGraph(region="Empty"))
+    e.set_character(Character.create("Hero", CharacterClass.WARRIOR))
+    return e
+
+
+class TestWorldAtlas:
+    def test_index_is_lazy(self, atlas_dir: Path):
+        atlas = WorldAtlas.from_directory(atlas_dir)
+        assert sorted(atlas.regions()) == ["North", "South"]
+        assert atlas.loaded_regions() == []
+
+    def test_enter_loads_region(self, atlas_dir: Path, engine: StateEngine):
+        atlas = WorldAtlas.from_directory(atlas_dir)
+        atlas.enter(engine, "North", "n1")
+        assert atlas.loaded_regions() == ["North"]
+        assert engine.world.region == "North"
+        assert engine.current_location_id == "n1"
+
+    def test_portals(self, atlas_dir: Path):
+        atlas = WorldAtlas.from_directory(atlas_dir)
+        assert [p.journey.id for p in atlas.portals("North", "n2")] == ["p_north_south"]
+        assert atlas.portals("North", "n1") == []
+
+    def test_cross_portal(self, atlas_dir: Path, engine: StateEngine):
+        atlas = WorldAtlas.from_directory(atlas_dir)
+        atlas.enter(engine, "North", "n2")
+        with patch.object(engine._rng, "randint", return_value=8):
+            result = atlas.cross(engine, "p_north_south")
+        assert result.success is True
+        assert engine.world.region == "South"
+        assert engine.current_location_id == "s1"
+
+    def test_failed_crossing_stays_put(self, atlas_dir: Path, engine: StateEngine):
+        atlas = WorldAtlas.from_directory(atlas_dir)
+        atlas.enter(engine, "North", "n2")
+        with patch.object(engine._rng, "randint", return_value=1):
+            result = atlas.cross(engine, "p_north_south")
+        assert result.success is False
+        assert engine.world.region == "North"
+        assert engine.current_location_id == "n2"
+        assert atlas._occupancy == {"North": 1}
+
+    def test_broken_portal_changes_nothing(self, atlas_dir: Path, engine: StateEngine):
+        _write_region(atlas_dir, "South", ["s2"], [])
+        atlas = WorldAtlas.from_directory(atlas_dir)
+        atlas.enter(engine, "North", "n2")
+        hp = engine.character.hp
+        with pytest.raises(ValueError):
+            atlas.cross(engine, "p_north_south")
+        assert engine.world.region == "North"
+        assert engine.current_location_id == "n2"
+        assert engine.character.hp == hp
+        assert engine.roll_log.tolist() == []
+        assert atlas._occupancy == {"North": 1}
+
+    def test_enter_unknown_location_changes_nothing(self, atlas_dir: Path, engine: StateEngine):
+        atlas = WorldAtlas.from_directory(atlas_dir)
+        atlas.enter(engine, "North", "n1")
+        with pytest.raises(ValueError):
+            atlas.enter(engine, "South", "nowhere")
+        assert engine.world.region == "North"
+        assert engine.current_location_id == "n1"
+        assert atlas._occupancy == {"North": 1}
+
+    def test_undo_stops_at_crossing(self, atlas_dir: Path, engine: StateEngine):
+        atlas = WorldAtlas.from_directory(atlas_dir)
+        UndoLog(engine)
+        atlas.enter(engine, "North", "n1")
+        engine.traverse("j_n1_n2")
+        engine.undo_log.mark()
+        with patch.object(engine._rng, "randint", return_value=8):
+            assert atlas.cross(engine, "p_north_south").success
+        # Nothing before the crossing can be undone into the new region
+        assert engine.undo(5) == 0
+        assert engine.rewind(5) == 0
+        assert (engine.world.region, engine.current_location_id) == ("South", "s1")
+
+        # Changes made after the crossing still undo
+        engine.traverse("j_s1_s2")
+        assert engine.undo() == 1
+        assert (engine.world.region, engine.current_location_id) == ("South", "s1")
+
+    def test_cross_unknown_portal(self, atlas_dir: Path, engine: StateEngine):
+        atlas = WorldAtlas.from_directory(atlas_dir)
+        atlas.enter(engine, "North", "n1")
+        assert atlas.cross(engine, "nope").success is False
+
+    def test_evicts_cold_regions(self, atlas_dir: Path, engine: StateEngine):
+        evicted: list[str] = []
+        size = (atlas_dir / "north.json").stat().st_size
+        atlas = WorldAtlas.from_directory(
+            atlas_dir, memory_budget=size, on_evict=lambda name, graph: evicted.append(name),
+        )
+        atlas.enter(engine, "North", "n2")
+        with patch.object(engine._rng, "randint", return_value=8):
+            atlas.cross(engine, "p_north_south")
+        assert atlas.loaded_regions() == ["South"]
+        assert evicted == ["North"]
+
+    def test_occupied_region_not_evicted(self, atlas_dir: Path, engine: StateEngine):
+        atlas = WorldAtlas.from_directory(atlas_dir, memory_budget=1)
+        atlas.enter(engine, "North", "n1")
+        atlas.region("South")  # peek without entering
+        assert atlas.is_loaded("North")
+
+    def test_region_evictable_after_last_occupant_leaves(self, atlas_dir: Path, engine: StateEngine):
+        atlas = WorldAtlas.from_directory(atlas_dir, memory_budget=1)
+        other = StateEngine(WorldGraph(region="Empty"))
+        atlas.enter(engine, "North", "n1")
+        atlas.enter(other, "North", "n2")
+        atlas.leave(engine)
+        atlas.leave(engine)  # a second leave changes nothing
+        assert atlas.is_loaded("North")
+        atlas.leave(other)
+        assert not atlas.is_loaded("North")
+
+    def test_leave_without_entering(self, atlas_dir: Path, engine: StateEngine):
+        atlas = WorldAtlas.from_directory(atlas_dir, memory_budget=1)
+        atlas.enter(engine, "North", "n1")
+        # Same graph, but this engine never entered: North stays occupied
+        bystander = StateEngine(atlas.region("North"))
+        atlas.leave(bystander)
+        assert atlas._occupancy == {"North": 1}
+
+    def test_unknown_region(self, atlas_dir: Path):
+        with pytest.raises(ValueError):
+            WorldAtlas.from_directory(atlas_dir).region("West")
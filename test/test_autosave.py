@@ -0,0 +1,192 @@
+"""Tests for the background AutoSaver."""
+
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from totm.engine.autosave import AutoSaver
+from totm.engine.graph import WorldGraph
+from totm.engine.models import Character, CharacterClass, Location
+from totm.engine.store import SaveChain, StateEngine, patch_path
+from totm.tools.api import ArbiterTools
+
+WELL_PATH = Path(__file__).resolve().parent.parent / "src" / "totm" / "engine" / "worlds" / "well.json"
+
+
+@pytest.fixture
+def engine() -> StateEngine:
+    e = StateEngine(WorldGraph.load(WELL_PATH), seed=5)
+    e.set_character(Character.create("Hero", CharacterClass.WARRIOR))
+    e.set_location("loc_well_top")
+    return e
+
+
+@pytest.fixture
+def saver(engine: StateEngine, tmp_path: Path):
+    s = AutoSaver(engine, tmp_path / "save.json", every_turns=1)
+    s.start()
+    yield s
+    s.close()
+
+
+def _play(engine: StateEngine, saver: AutoSaver, turns: int) -> None:
+    tools = ArbiterTools(engine)
+    for _ in range(turns):
+        for npc in tools.get_location()["npcs"]:
+            tools.interact(npc["id"], "attack")
+        exits = tools.get_exits()["exits"]
+        if exits:
+            tools.traverse(exits[0]["journey_id"])
+        saver.turn()
+
+
+def _on_disk(saver: AutoSaver) -> dict:
+    return StateEngine.load(saver.path).to_state()
+
+
+def _wait_for(condition, timeout: float = 5) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+class TestAutoSaver:
+    def test_start_writes_base(self, engine: StateEngine, saver: AutoSaver):
+        assert saver.flush(5)
+        assert StateEngine.load(saver.path).to_state() == engine.to_state()
+
+    def test_turns_are_saved(self, engine: StateEngine, saver: AutoSaver):
+        _play(engine, saver, 10)
+        saver.flush(5)
+        assert StateEngine.load(saver.path).to_state() == engine.to_state()
+
+    def test_every_turns(self, engine: StateEngine, tmp_path: Path):
+        saver = AutoSaver(engine, tmp_path / "save.json", every_turns=3)
+        saver.start()
+        saver.flush(5)
+        saver.turn()
+        saver.turn()
+        saver.flush(5)
+        assert saver.saves == 1
+        saver.turn()
+        saver.close(5)
+        assert saver.saves == 2
+
+    def test_interval(self, engine: StateEngine, tmp_path: Path):
+        saver = AutoSaver(engine, tmp_path / "save.json", every_turns=None, interval=60)
+        saver.start()
+        saver.flush(5)
+        saver.turn()
+        saver.flush(5)
+        assert saver.saves == 1
+        with patch("totm.engine.autosave.time.monotonic", return_value=saver._last + 61):
+            saver.turn()
+        saver.close(5)
+        assert saver.saves == 2
+
+    def test_busy_writer_coalesces(self, engine: StateEngine, saver: AutoSaver):
+        saver.flush(5)
+        release = threading.Event()
+        write = SaveChain.write
+
+        def slow_write(chain, snapshot):
+            release.wait(5)
+            return write(chain, snapshot)
+
+        with patch.object(SaveChain, "write", slow_write):
+            saver.request()
+            for hp in range(1, 6):
+                engine.character.hp = hp
+                saver.turn()
+            release.set()
+            saver.flush(5)
+        assert saver.coalesced >= 4
+        assert saver.saves == 3  # base, the slow write, then one for the whole burst
+        assert StateEngine.load(saver.path).to_state() == engine.to_state()
+
+    def test_save_requested_during_write_lands_without_another_turn(
+        self, engine: StateEngine, saver: AutoSaver,
+    ):
+        saver.flush(5)
+        writing, release = threading.Event(), threading.Event()
+        write = SaveChain.write
+
+        def slow_write(chain, snapshot):
+            writing.set()
+            release.wait(5)
+            return write(chain, snapshot)
+
+        with patch.object(SaveChain, "write", slow_write):
+            engine.character.hp = 3
+            saver.request()
+            assert writing.wait(5)
+            engine.character.hp = 2
+            saver.request()  # the player's last action, then a crash
+            release.set()
+            assert _wait_for(lambda: _on_disk(saver) == engine.to_state())
+
+    def test_interval_saves_on_a_timer(self, engine: StateEngine, tmp_path: Path):
+        saver = AutoSaver(engine, tmp_path / "save.json", every_turns=None, interval=0.05)
+        saver.start()
+        saver.flush(5)
+        engine.character.hp = 2
+        saver.turn()  # not due yet, and no turn follows
+        try:
+            assert _wait_for(lambda: _on_disk(saver) == engine.to_state())
+        finally:
+            saver.close(5)
+
+    def test_chain_folds_into_base(self, engine: StateEngine, tmp_path: Path):
+        saver = AutoSaver(engine, tmp_path / "save.json", max_patches=3)
+        saver.start()
+        _play(engine, saver, 7)
+        saver.close(5)
+        assert not patch_path(saver.path, 3).exists()
+        assert StateEngine.load(saver.path).to_state() == engine.to_state()
+
+    def test_replaced_world_is_saved_in_full(self, engine: StateEngine, saver: AutoSaver):
+        saver.flush(5)
+        world = WorldGraph(region="Elsewhere")
+        world.add_location(Location(id="x", name="X"))
+        engine.world = world
+        engine.set_location("x")
+        saver.request()
+        saver.flush(5)
+        assert StateEngine.load(saver.path).world.region == "Elsewhere"
+
+    def test_write_error_raised_on_flush_then_rebased(self, engine: StateEngine, saver: AutoSaver):
+        saver.flush(5)
+        with patch.object(SaveChain, "write", side_effect=OSError("disk full")):
+            engine.character.hp = 1
+            saver.request()
+            with pytest.raises(OSError):
+                saver.flush(5)
+        saver.request()
+        saver.flush(5)
+        assert StateEngine.load(saver.path).character.hp == 1
+
+    def test_game_thread_never_writes(self, engine: StateEngine, saver: AutoSaver):
+        saver.flush(5)
+        writers = []
+        write = SaveChain.write
+
+        def spy(chain, snapshot):
+            writers.append(threading.current_thread().name)
+            return write(chain, snapshot)
+
+        with patch.object(SaveChain, "write", spy):
+            _play(engine, saver, 3)
+            saver.flush(5)
+        assert writers and set(writers) == {"totm-autosave"}
+
+    def test_invalid_config(self, engine: StateEngine, tmp_path: Path):
+        with pytest.raises(ValueError):
+            AutoSaver(engine, tmp_path / "s.json", every_turns=0)
+        with pytest.raises(ValueError):
+            AutoSaver(engine, tmp_path / "s.json", interval=0)
@@ -0,0 +1,194 @@
+"""Tests for batch adjudication and its columnar results."""
+
+from pathlib import Path
+
+import pytest
+
+from totm.engine.batch import INTERACT, TRAVERSE, BatchResult, Outcome, apply_actions
+from totm.engine.graph import WorldGraph
+from totm.engine.models import NPC, Character, CharacterClass, Journey, Location
+from totm.engine.store import StateEngine
+from totm.sessions import SessionManager
+
+
+def make_engine(seed: int = 7) -> StateEngine:
+    g = WorldGraph(region="Test")
+    g.add_location(Location(
+        id="top", name="Top",
+        npcs=[
+            NPC(id="goblin", name="Goblin", hp=30, hostile=True),
+            NPC(id="hermit", name="Hermit", hp=5),
+        ],
+    ))
+    g.add_location(Location(id="bottom", name="Bottom"))
+    g.add_journey(Journey(id="j_down", from_id="top", to_id="bottom", difficulty=3, risks=["Slippery stones"]))
+    g.add_journey(Journey(id="j_up", from_id="bottom", to_id="top", difficulty=5, risks=["Climb"]))
+    e = StateEngine(g, seed=seed)
+    hero = Character.create("Hero", CharacterClass.WARRIOR)
+    hero.hp = hero.max_hp = 1000
+    e.set_character(hero)
+    e.set_location("top")
+    return e
+
+
+ACTIONS = [
+    ("interact", "goblin", "attack"),
+    ("interact", "hermit", "talk"),
+    ("traverse", "j_down"),
+    ("traverse", "j_down"),
+    ("traverse", "j_up"),
+    ("traverse", "j_nowhere"),
+    ("interact", "goblin", "attack"),
+    ("interact", "goblin", "dance"),
+    ("interact", "ghost", "talk"),
+] * 5
+
+
+def _single(engine: StateEngine, action) -> tuple:
+    """One action through the object API, as (outcome, roll, damage, npc_hp)."""
+    if action[0] == "traverse":
+        r = engine.traverse(action[1])
+        if r.success:
+            return Outcome.SUCCESS, r.roll, 0, -1
+        if r.message.startswith("Journey"):
+            return Outcome.UNKNOWN_JOURNEY, 0, 0, -1
+        if r.message.startswith("Character is not"):
+            return Outcome.WRONG_ORIGIN, 0, 0, -1
+        return Outcome.FAILED, r.roll, r.damage, -1
+    r = engine.interact(action[1], action[2])
+    if not r.success:
+        outcome = Outcome.UNKNOWN_NPC if "not found" in r.message else Outcome.UNKNOWN_ACTION
+        return outcome, 0, 0, -1
+    if action[2] == "attack":
+        npc = next(n for n in engine.current_location.npcs if n.id == action[1])
+        return Outcome.SUCCESS, r.damage_dealt, r.damage_taken, npc.hp
+    return Outcome.SUCCESS, 0, 0, -1
+
+
+class TestEngineBatches:
+    def test_matches_single_calls(self):
+        single, batch = make_engine(), make_engine()
+        expected = [_single(single, a) for a in ACTIONS]
+        result = batch.apply_actions(ACTIONS)
+
+        assert len(result) == len(ACTIONS)
+        got = list(zip(result.outcome, result.roll, result.damage, result.npc_hp))
+        assert got == [tuple(map(int, row)) for row in expected]
+        assert list(batch.roll_log) == list(single.roll_log)
+        assert batch.to_state() == single.to_state()
+        assert list(result.hp)[-1] == single.character.hp
+
+    def test_kind_column(self):
+        result = make_engine().apply_actions(ACTIONS[:3])
+        assert list(result.kind) == [INTERACT, INTERACT, TRAVERSE]
+        assert result.row(2)["kind"] == "traverse"
+
+    def test_traverse_many(self):
+        engine = make_engine()
+        result = engine.traverse_many(["j_up", "j_down"])
+        assert Outcome(result.outcome[0]) is Outcome.WRONG_ORIGIN
+        assert result.roll[0] == 0
+        assert Outcome(result.outcome[1]) in (Outcome.SUCCESS, Outcome.FAILED)
+        assert result.sessions == [engine]
+
+    def test_interact_many(self):
+        engine = make_engine()
+        result = engine.interact_many([("hermit", "talk"), ("goblin", "attack")])
+        assert result.successes == 2
+        assert result.npc_hp[0] == -1
+        goblin = next(n for n in engine.current_location.npcs if n.id == "goblin")
+        assert result.npc_hp[1] == goblin.hp == 30 - result.roll[1]
+
+    def test_no_character(self):
+        engine = StateEngine(make_engine().world, seed=1)
+        engine.set_location("top")
+        result = engine.apply_actions([("traverse", "j_down"), ("interact", "hermit", "talk")])
+        assert result.counts() == {"no_character": 2}
+        assert list(result.hp) == [-1, -1]
+        assert len(engine.roll_log) == 0
+
+    def test_no_location(self):
+        engine = StateEngine(make_engine().world, seed=1)
+        result = engine.interact_many([("hermit", "talk")])
+        assert result.row(0)["outcome"] == "no_location"
+
+    def test_malformed_action_raises_after_applying_earlier(self):
+        engine = make_engine()
+        with pytest.raises(ValueError, match="Unknown batch action"):
+            engine.apply_actions([("traverse", "j_down"), ("fly", "top")])
+        assert len(engine.roll_log) == 1
+
+    def test_journal_matches_single_calls(self, tmp_path: Path):
+        from totm.engine.journal import Journal
+
+        single, batch = make_engine(), make_engine()
+        Journal.create(single, tmp_path / "single")
+        Journal.create(batch, tmp_path / "batch")
+        for action in ACTIONS:
+            _single(single, action)
+        batch.apply_actions(ACTIONS)
+        single.journal.close()
+        batch.journal.close()
+        replayed = Journal.load(tmp_path / "batch")
+        replayed.journal.close()
+        assert replayed.to_state() == single.to_state()
+
+
+class TestMultiEngineBatches:
+    def test_interleaved_engines(self):
+        a, b = make_engine(1), make_engine(2)
+        solo_a, solo_b = make_engine(1), make_engine(2)
+        pairs = [(e, act) for act in ACTIONS for e in (a, b)]
+
+        result = apply_actions(pairs)
+        expect_a = solo_a.apply_actions(ACTIONS)
+        expect_b = solo_b.apply_actions(ACTIONS)
+
+        assert result.sessions == [a, b]
+        assert list(result.session) == [0, 1] * len(ACTIONS)
+        assert list(result.roll[0::2]) == list(expect_a.roll)
+        assert list(result.roll[1::2]) == list(expect_b.roll)
+        assert a.to_state() == solo_a.to_state()
+
+    def test_session_manager(self, tmp_path: Path):
+        manager = SessionManager(tmp_path / "sessions", lambda sid: make_engine(len(sid)))
+        result = manager.apply_actions([
+            ("a", ("traverse", "j_down")),
+            ("bb", ("interact", "hermit", "talk")),
+            ("a", ("traverse", "j_nowhere")),
+        ])
+        assert result.sessions == ["a", "bb"]
+        assert list(result.session) == [0, 1, 0]
+        assert Outcome(result.outcome[2]) is Outcome.UNKNOWN_JOURNEY
+        # Every session is released once the batch ends
+        manager.evict("a")
+        manager.evict("bb")
+
+    def test_session_manager_releases_on_error(self, tmp_path: Path):
+        manager = SessionManager(tmp_path / "sessions", lambda sid: make_engine())
+        with pytest.raises(ValueError):
+            manager.apply_actions([("a", ("traverse", "j_down")), ("a", ("bogus",))])
+        assert manager.evict("a")
+
+
+class TestBatchResult:
+    def test_empty(self):
+        result = BatchResult()
+        assert len(result) == 0
+        assert result.counts() == {}
+        assert result.to_dict()["roll"] == []
+
+    def test_to_dict(self):
+        result = make_engine().traverse_many(["j_nowhere"])
+        assert result.to_dict() == {
+            "kind": [TRAVERSE], "outcome": [Outcome.UNKNOWN_JOURNEY], "roll": [0],
+            "damage": [0], "hp": [1000], "npc_hp": [-1], "session": [0],
+        }
+
+    def test_to_numpy_shares_memory(self):
+        np = pytest.importorskip("numpy")
+        result = make_engine().apply_actions(ACTIONS)
+        columns = result.to_numpy()
+        assert columns["roll"].dtype == np.uint32
+        assert columns["roll"].tolist() == list(result.roll)
+        assert int((columns["outcome"] == Outcome.SUCCESS).sum()) == result.successes
@@ -0,0 +1,81 @@
+"""Tests for the compiled, memory-mapped world format."""
+
+import pytest
+from pathlib import Path
+
+from totm.engine.binary import compile_world, open_world
+from totm.engine.graph import WorldGraph
+from totm.engine.models import Location, Journey, NPC
+
+WELL_PATH = Path(__file__).resolve().parent.parent / "src" / "totm" / "engine" / "worlds" / "well.json"
+
+
+@pytest.fixture
+def compiled(tmp_path: Path) -> Path:
+    path = tmp_path / "well.totm"
+    compile_world(WorldGraph.load(WELL_PATH), path)
+    return path
+
+
+class TestBinaryWorld:
+    def test_round_trip_is_lossless(self, compiled: Path):
+        with open_world(compiled) as world:
+            assert world.to_dict() == WorldGraph.load(WELL_PATH).to_dict()
+
+    def test_queries_match_graph(self, compiled: Path):
+        graph = WorldGraph.load(WELL_PATH)
+        with open_world(compiled) as world:
+            assert world.region == "Dark Forest"
+            for loc in graph.all_locations():
+                assert world.get_location(loc.id) == loc
+                assert world.exits(loc.id) == graph.exits(loc.id)
+                assert world.incoming(loc.id) == graph.incoming(loc.id)
+                assert world.neighbors(loc.id) == graph.neighbors(loc.id)
+            assert world.get_journey("j_bottom_to_tunnel") == graph.get_journey("j_bottom_to_tunnel")
+
+    def test_risk_keywords_match_graph(self, tmp_path: Path):
+        graph = WorldGraph(region="Risky")
+        graph.add_location(Location(id="a", name="A"))
+        graph.add_location(Location(id="b", name="B"))
+        graph.add_journey(Journey(id="j1", from_id="a", to_id="b", difficulty=1,
+                                  risks=["Goblin-infested tunnel", "Spiders, everywhere"]))
+        graph.add_journey(Journey(id="j2", from_id="b", to_id="a", difficulty=1, risks=["Deep water"]))
+        compile_world(graph, tmp_path / "risky.totm")
+        with open_world(tmp_path / "risky.totm") as world:
+            for keyword in ["goblin", "infested", "spiders", "Spiders, everywhere", "water", "spiders,"]:
+                assert world.journeys_with_risk(keyword) == graph.journeys_with_risk(keyword)
+            assert [j.id for j in world.journeys_with_risk("goblin")] == ["j1"]
+
+    def test_missing_ids(self, compiled: Path):
+        with open_world(compiled) as world:
+            assert world.get_location("nowhere") is None
+            assert world.get_journey("nope") is None
+            assert world.exits("nowhere") == []
+
+    def test_to_graph_is_mutable(self, compiled: Path):
+        with open_world(compiled) as world:
+            graph = world.to_graph()
+        graph.add_location(Location(id="new", name="New"))
+        assert graph.get_location("new") is not None
+
+    def test_unicode_and_empty_graph(self, tmp_path: Path):
+        g = WorldGraph(region="Forêt")
+        g.add_location(Location(id="é", name="Château", npcs=[NPC(id="n", name="Gé", hp=-1)]))
+        g.add_location(Location(id="a", name="A"))
+        g.add_journey(Journey(id="j", from_id="é", to_id="a", risks=["Piège"], difficulty=0))
+        path = tmp_path / "u.totm"
+        compile_world(g, path)
+        with open_world(path) as world:
+            assert world.to_dict() == g.to_dict()
+            assert world.get_location("é").npcs[0].hp == -1
+
+        empty = tmp_path / "empty.totm"
+        compile_world(WorldGraph(region="Nothing"), empty)
+        with open_world(empty) as world:
+            assert world.to_dict() == {"region": "Nothing", "locations": [], "journeys": []}
+
+    def test_rejects_other_files(self, tmp_path: Path):
+        path = tmp_path / "bogus.totm"
+        path.write_bytes(b"\0" * 256)
+        with pytest.raises(ValueError, match="not a compiled"):
+            open_world(path)
@@ -0,0 +1,135 @@
+"""Tests for the JSON codec and the hand-written model encoders."""
+
+import dataclasses
+import json
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from totm.engine import codec
+from totm.engine.models import Character, CharacterClass, Journey, Location, NPC
+from totm.engine.store import InteractResult, TraverseResult
+from totm.tools import schema
+
+
+@pytest.fixture
+def stdlib_backend():
+    previous = codec.backend()
+    yield codec.use_backend("json")
+    codec._backend = previous
+
+
+class TestCodec:
+    def test_round_trip(self, stdlib_backend):
+        data = {"a": [1, 2, {"b": "ünïcode"}], "c": None, "d": True}
+        assert codec.loads(codec.dumps(data)) == data
+        assert codec.loads(codec.dumps_str(data)) == data
+
+    def test_pretty_matches_json_indent(self, stdlib_backend):
+        data = {"a": [1, 2], "b": {"c": "d"}}
+        assert codec.dumps_str(data, pretty=True) == json.dumps(data, indent=2)
+
+    def test_compact(self, stdlib_backend):
+        assert codec.dumps({"a": [1, 2]}) == b'{"a":[1,2]}'
+
+    def test_files(self, tmp_path, stdlib_backend):
+        path = tmp_path / "sub" / "x.json"
+        codec.write_json(path, {"k": 1}, pretty=True)
+        assert codec.read_json(path) == {"k": 1}
+
+    def test_write_replaces_atomically(self, tmp_path, stdlib_backend):
+        path = tmp_path / "x.json"
+        codec.write_json(path, {"k": 1})
+        codec.write_json(path, {"k": 2})
+        assert codec.read_json(path) == {"k": 2}
+        assert [p.name for p in tmp_path.iterdir()] == ["x.json"]
+
+    def test_failed_encode_keeps_old_file(self, tmp_path, stdlib_backend):
+        path = tmp_path / "x.json"
+        codec.write_json(path, {"k": 1})
+        with pytest.raises(TypeError):
+            codec.write_json(path, {"k": object()})
+        assert codec.read_json(path) == {"k": 1}
+
+    def test_concurrent_writers_never_tear(self, tmp_path, stdlib_backend):
+        path = tmp_path / "x.json"
+        payloads = [{"writer": i, "data": [i] * 20_000} for i in range(4)]
+
+        def write(obj):
+            for _ in range(10):
+                codec.write_json(path, obj)
+
+        threads = [threading.Thread(target=write, args=(obj,)) for obj in payloads]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert codec.read_json(path) in payloads
+        assert [p.name for p in tmp_path.iterdir()] == ["x.json"]
+
+    def test_failed_write_leaves_no_temp_file(self, tmp_path, stdlib_backend):
+        path = tmp_path / "x.json"
+        with patch("totm.engine.codec.os.replace", side_effect=OSError("disk full")):
+            with pytest.raises(OSError):
+                codec.write_atomic(path, b"{}")
+        assert list(tmp_path.iterdir()) == []
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError):
+            codec.use_backend("yaml")
+
+    def test_stdlib_always_available(self):
+        assert codec.available_backends()[-1] == "json"
+
+    @pytest.mark.parametrize("name", ["orjson", "msgspec"])
+    def test_optional_backends_agree(self, name):
+        pytest.importorskip(name)
+        previous = codec.backend()
+        try:
+            fast = codec.use_backend(name)
+            data = {"a": [1, 2.5, "x"], "b": {"c": False}}
+            assert fast.loads(fast.dumps(data, True)) == data
+            assert json.loads(fast.dumps(data, False)) == data
+        finally:
+            codec._backend = previous
+
+
+class TestEncoders:
+    """Hand-written ``to_dict`` methods must match ``dataclasses.asdict``."""
+
+    @pytest.mark.parametrize("obj", [
+        NPC(id="g", name="Goblin", hp=3, hostile=True, description="Green."),
+        Journey(id="j", from_id="a", to_id="b", direction="up", duration="1m",
+                difficulty=2, risks=["Darkness"], description="Dark."),
+        Location(id="a", name="A", description="d", npcs=[NPC(id="g", name="G")],
+                 inventory=["key"], gm_guide="guide"),
+        TraverseResult(success=True, journey_id="j", from_id="a", to_id="b", roll=4),
+        InteractResult(success=False, npc_id="g", action="talk", message="Hm."),
+        schema.ExitInfo("j", "up", "B", 2, ["Darkness"], "Dark."),
+        schema.LocateResult("rope", "item", [{"id": "a", "name": "A"}]),
+        schema.RouteResult("a", "b", True, steps=[
+            schema.RouteStepInfo("j", "up", "a", "b", "B", 2, "speed", 0.5)]),
+        schema.NeighborhoodResult("a", 1, [{"id": "a"}], []),
+        schema.ToolError(tool="x", message="y"),
+    ], ids=lambda o: type(o).__name__)
+    def test_matches_asdict(self, obj):
+        assert obj.to_dict() == dataclasses.asdict(obj)
+
+    def test_character(self):
+        c = Character.create("Hero", CharacterClass.THIEF)
+        c.inventory.append("dagger")
+        expected = dataclasses.asdict(c) | {"char_class": "thief"}
+        assert c.to_dict() == expected
+        assert Character.from_dict(c.to_dict()) == c
+
+    def test_to_dict_copies_lists(self):
+        loc = Location(id="a", name="A", inventory=["key"])
+        loc.to_dict()["inventory"].append("gem")
+        assert loc.inventory == ["key"]
+
+    def test_from_dict_defaults(self):
+        j = Journey.from_dict({"id": "j", "from_id": "a", "to_id": "b"})
+        assert j == Journey(id="j", from_id="a", to_id="b")
+        assert NPC.from_dict({"id": "g", "name": "G"}) == NPC(id="g", name="G")
+        assert Location.from_dict({"id": "a", "name": "A"}) == Location(id="a", name="A")
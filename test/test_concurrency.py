@@ -0,0 +1,309 @@
+"""Stress tests for engines, tools and sessions driven from many threads."""
+
+import random
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+from totm.engine.graph import WorldGraph
+from totm.engine.journal import Journal
+from totm.engine.models import NPC, Character, CharacterClass, Journey, Location
+from totm.engine.store import StateEngine
+from totm.engine.undo import UndoLog
+from totm.sessions import SessionManager
+from totm.tools.api import ArbiterTools
+
+THREADS = 8
+LOCATIONS = {"top", "bottom"}
+
+
+def build_world() -> WorldGraph:
+    g = WorldGraph(region="Test")
+    g.add_location(Location(
+        id="top", name="Top",
+        npcs=[NPC(id="goblin", name="Goblin", hp=10_000, hostile=True)],
+    ))
+    g.add_location(Location(id="bottom", name="Bottom"))
+    g.add_journey(Journey(id="j_down", from_id="top", to_id="bottom", difficulty=3, risks=["Slippery stones"]))
+    g.add_journey(Journey(id="j_up", from_id="bottom", to_id="top", difficulty=5, risks=["Climb"]))
+    return g
+
+
+def new_engine(session_id: str = "hero") -> StateEngine:
+    engine = StateEngine(build_world(), seed=len(session_id))
+    engine.set_character(Character.create(session_id, CharacterClass.WARRIOR))
+    engine.set_location("top")
+    return engine
+
+
+def sure_footed(engine: StateEngine) -> StateEngine:
+    """Make every traverse succeed."""
+    for stat in ("brawn", "brains", "faith", "speed"):
+        setattr(engine.character, stat, 10**6)
+    return engine
+
+
+@pytest.fixture(autouse=True)
+def fast_switching():
+    """Switch threads as often as possible, so races show up within a short test."""
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def _run(workers) -> None:
+    """Start every worker at once; re-raise the first failure."""
+    barrier = threading.Barrier(len(workers))
+    errors: list[BaseException] = []
+
+    def run(work):
+        barrier.wait()
+        try:
+            work()
+        except BaseException as exc:  # noqa: BLE001 - reported below
+            errors.append(exc)
+
+    threads = [threading.Thread(target=run, args=(work,)) for work in workers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+
+
+class TestEngineStress:
+    def test_many_writers_and_readers(self, tmp_path: Path):
+        engine = new_engine()
+        engine.character.hp = engine.character.max_hp = 10**6
+        tools = ArbiterTools(engine)
+        UndoLog(engine, limit=64)
+        Journal.create(engine, tmp_path / "journal")
+        writing = threading.Semaphore(0)
+
+        def writer(seed: int):
+            def work():
+                rng = random.Random(seed)
+                try:
+                    for _ in range(300):
+                        op = rng.randrange(8)
+                        if op == 0:
+                            engine.traverse(rng.choice(["j_down", "j_up"]))
+                        elif op == 1:
+                            engine.interact("goblin", rng.choice(["attack", "talk"]))
+                        elif op == 2:
+                            tools.traverse(rng.choice(["j_down", "j_up"]))
+                        elif op == 3:
+                            tools.get_exits()
+                        elif op == 4:
+                            engine.apply_actions([("traverse", "j_down"), ("interact", "goblin", "attack")])
+                        elif op == 5:
+                            engine.undo_log.mark()
+                        elif op == 6:
+                            engine.undo(rng.randint(1, 3))
+                        else:
+                            engine.rewind()
+                finally:
+                    writing.release()
+            return work
+
+        def reader():
+            last = engine.view()
+            finished = 0
+            while finished < THREADS:
+                view = engine.view()
+                assert view.location_id in LOCATIONS
+                assert 0 <= view.hp <= view.character["max_hp"]
+                assert view.version >= last.version
+                assert view.rolls >= last.rolls
+                last = view
+                finished += writing.acquire(blocking=False)
+
+        _run([writer(seed) for seed in range(THREADS)] + [reader])
+        assert engine.current_location_id in LOCATIONS
+        assert engine.character.hp >= 0
+
+        # Every change was journaled whole and in the order it was made
+        engine.journal.close()
+        replayed = Journal.load(tmp_path / "journal")
+        replayed.journal.close()
+        assert replayed.to_state() == engine.to_state()
+
+    def test_hp_never_below_zero(self):
+        engine = new_engine()
+        engine.character.hp = 40
+
+        def attack():
+            for _ in range(200):
+                engine.interact("goblin", "attack")
+                assert engine.view().hp >= 0
+
+        _run([attack] * THREADS)
+        assert engine.character.hp == 0
+
+    def test_check_then_act_is_atomic(self):
+        # Each thread moves on only from where it finds the character; with
+        # the lock held, no two threads can act on the same observation
+        engine = sure_footed(new_engine())
+        moves = []
+
+        def walk():
+            for _ in range(200):
+                with engine.lock:
+                    here = engine.current_location_id
+                    result = engine.traverse("j_down" if here == "top" else "j_up")
+                    assert result.success and result.from_id == here
+                    moves.append(result.to_id)
+
+        _run([walk] * THREADS)
+        assert len(moves) == THREADS * 200
+        assert all(a != b for a, b in zip(moves, moves[1:]))
+
+
+class TestView:
+    def test_cached_until_changed(self):
+        engine = new_engine()
+        view = engine.view()
+        assert engine.view() is view
+        assert (view.location_id, view.hp, view.rolls) == ("top", 12, 0)
+
+        engine.traverse("j_down")
+        changed = engine.view()
+        assert changed is not view
+        assert changed.version > view.version
+        assert changed.rolls == 1
+        # Views are snapshots, not live objects
+        assert view.location_id == "top"
+
+    def test_view_of_empty_engine(self):
+        view = StateEngine(build_world()).view()
+        assert view.location_id is None
+        assert view.hp is None
+
+    def test_reader_does_not_wait_for_writer(self):
+        engine = new_engine()
+        view = engine.view()
+        seen = []
+        with engine.lock:
+            reader = threading.Thread(target=lambda: seen.append(engine.view()))
+            reader.start()
+            reader.join(timeout=5)
+        assert seen == [view]
+
+
+class TestSerialization:
+    def test_tools_wait_for_engine_lock(self):
+        engine = new_engine()
+        tools = ArbiterTools(engine)
+        results = []
+        with engine.lock:
+            worker = threading.Thread(target=lambda: results.append(tools.get_location()))
+            worker.start()
+            worker.join(timeout=0.2)
+            assert worker.is_alive()
+            engine.set_location("bottom")
+        worker.join(timeout=5)
+        assert results[0]["id"] == "bottom"
+
+    def test_shared_lock(self):
+        lock = threading.RLock()
+        world = build_world()
+        a = StateEngine(world, lock=lock)
+        b = StateEngine(world, lock=lock)
+        assert a.lock is b.lock is lock
+        assert new_engine().lock is not new_engine().lock
+
+    def test_adopt(self):
+        engine = new_engine()
+        other = new_engine("other")
+        other.set_location("bottom")
+        version = engine.view().version
+        engine.adopt(other)
+        assert engine.world is other.world
+        assert engine.character is other.character
+        assert engine.view().location_id == "bottom"
+        assert engine.view().version > version
+
+    def test_adopt_starts_fresh_saves_and_history(self, tmp_path: Path):
+        engine = new_engine()
+        UndoLog(engine)
+        path = tmp_path / "save.json"
+        engine.save(path)
+        engine.traverse("j_down")
+        other = sure_footed(new_engine("other"))
+        other.traverse("j_down")
+        engine.adopt(other)
+        assert engine.undo_log.depth == 0
+        assert engine.roll_log.tolist() == other.roll_log.tolist()
+        # A patch against the previous base would miss the adopted world
+        assert engine.snapshot().full
+        assert engine.save_incremental(path) == path
+        assert StateEngine.load(path).to_state() == engine.to_state()
+
+    def test_adopt_compacts_journal(self, tmp_path: Path):
+        engine = new_engine()
+        Journal.create(engine, tmp_path / "journal")
+        engine.traverse("j_down")
+        engine.adopt(new_engine("other"))
+        engine.journal.close()
+        replayed = Journal.load(tmp_path / "journal")
+        replayed.journal.close()
+        assert replayed.to_state() == engine.to_state()
+
+
+class TestSessionsStress:
+    def test_threads_share_sessions_under_eviction(self, tmp_path: Path):
+        # A ceiling of one byte: every release evicts someone
+        manager = SessionManager(
+            tmp_path / "sessions", lambda sid: sure_footed(new_engine(sid)), max_bytes=1,
+        )
+        ids = [f"s{i}" for i in range(4)]
+        moved = {session_id: 0 for session_id in ids}
+        moved_lock = threading.Lock()
+
+        def play(seed: int):
+            def work():
+                rng = random.Random(seed)
+                for _ in range(100):
+                    actions = [(rng.choice(ids), ("traverse", rng.choice(["j_down", "j_up"])))
+                               for _ in range(rng.randint(1, 4))]
+                    result = manager.apply_actions(actions)
+                    with moved_lock:
+                        for session_id, outcome in zip(
+                            (result.sessions[i] for i in result.session), result.outcome,
+                        ):
+                            moved[session_id] += outcome == 0
+                    with manager.session(rng.choice(ids)) as s:
+                        assert s.tools.get_location()["id"] in LOCATIONS
+            return work
+
+        _run([play(seed) for seed in range(THREADS)])
+        assert manager.stats().evictions > 0
+        # Moves alternate top/bottom: no move was lost or applied twice
+        for session_id in ids:
+            with manager.session(session_id) as s:
+                expected = "bottom" if moved[session_id] % 2 else "top"
+                assert s.engine.current_location_id == expected
+
+    def test_busy_engine_does_not_block_manager(self, tmp_path: Path):
+        # A write-out waiting for a session's engine lock must not hold the
+        # manager's lock; before, release() took them in the other order
+        manager = SessionManager(tmp_path / "sessions", new_engine)
+        with manager.session("a") as a:
+            pass
+        manager.max_bytes = a.nbytes  # room for "a" alone
+        with a.engine.lock:
+            evicting = threading.Thread(target=lambda: manager.release(manager.acquire("b")))
+            evicting.start()
+            evicting.join(timeout=0.2)
+            assert evicting.is_alive()  # waiting to save "a"
+            reporting = threading.Thread(target=lambda: (manager.stats(), manager.memory()))
+            reporting.start()
+            reporting.join(timeout=5)
+            assert not reporting.is_alive()
+        evicting.join(timeout=5)
+        assert not evicting.is_alive()
+        assert not manager.is_resident("a")
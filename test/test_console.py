@@ -1,5 +1,7 @@
 """Tests for Console logic (mocked)."""
 
+from pathlib import Path
+
 import pytest
 from unittest.mock import patch, MagicMock
 
@@ -34,3 +36,55 @@ class TestConsoleFlow:
         with patch("totm.ui.console.print_error") as mock_err:
             mock_console._play_game()
             mock_err.assert_called_with("No character created! Go to 'Create Character' first.")
+
+    def test_undo_command_rewinds_without_marking(self, mock_console):
+        mock_console.engine.world = MagicMock()
+        mock_console.engine.undo_log = MagicMock()
+        mock_console.tools.rewind.return_value = {"message": "Rewound 2 change(s).", "changes_reverted": 2}
+        mock_console.tools.get_location.return_value = {"error": True, "message": "x"}
+        with patch("builtins.input", side_effect=["look", "undo 2", "quit"]):
+            mock_console._play_game()
+        mock_console.tools.rewind.assert_called_once_with(2)
+        # Only the "look" turn was marked
+        assert mock_console.engine.undo_log.mark.call_count == 1
+
+
+class TestAutosave:
+    @pytest.fixture
+    def console(self):
+        engine = MagicMock(spec=StateEngine)
+        engine.lock = MagicMock()
+        engine.undo_log = None
+        return Console(engine, MagicMock(spec=ArbiterTools), autosaver=MagicMock())
+
+    def test_play_does_not_start_autosave(self, console):
+        console.engine.world = MagicMock()
+        console.tools.get_location.return_value = {"error": True, "message": "x"}
+        with patch("builtins.input", side_effect=["quit"]):
+            console._play_game()
+        console.autosaver.start.assert_not_called()
+
+    def test_new_game_stops_autosave(self, console, monkeypatch):
+        monkeypatch.chdir(Path(__file__).parents[1])
+        console._new_game()
+        console.autosaver.close.assert_called_once()
+        console.autosaver.start.assert_not_called()
+
+    def test_new_game_leaves_atlas(self, console, monkeypatch):
+        monkeypatch.chdir(Path(__file__).parents[1])
+        console.atlas = MagicMock()
+        console._new_game()
+        console.atlas.leave.assert_called_once_with(console.engine)
+
+    def test_save_starts_autosave(self, console):
+        console.autosaver.running = False
+        console._save_game()
+        console.autosaver.start.assert_called_once()
+
+    def test_load_starts_autosave(self, console, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "save.json").write_text("{}")
+        with patch("totm.ui.console.StateEngine.load") as load:
+            console._load_game()
+        console.engine.adopt.assert_called_once_with(load.return_value)
+        console.autosaver.start.assert_called_once()
@@ -47,14 +47,14 @@ class TestStateEngineLocation:
 class TestTraverse:
     def test_traverse_success(self, engine: StateEngine):
         # Force a high roll to guarantee success
-        with patch("totm.engine.store.random.randint", return_value=8):
+        with patch.object(engine._rng, "randint", return_value=8):
             result = engine.traverse("j_down")
         assert result.success is True
         assert engine.current_location_id == "bottom"
 
     def test_traverse_failure(self, engine: StateEngine):
         # Force a low roll to guarantee failure
-        with patch("totm.engine.store.random.randint", return_value=1):
+        with patch.object(engine._rng, "randint", return_value=1):
             result = engine.traverse("j_down")
         assert result.success is False
         assert engine.current_location_id == "top"  # stayed put
@@ -90,13 +90,13 @@ class TestInteract:
         assert "conversation" in result.message
 
     def test_attack(self, engine: StateEngine):
-        with patch("totm.engine.store.random.randint", return_value=3):
+        with patch.object(engine._rng, "randint", return_value=3):
             result = engine.interact("goblin", "attack")
         assert result.success is True
         assert result.damage_dealt == 3
 
     def test_attack_defeat(self, engine: StateEngine):
-        with patch("totm.engine.store.random.randint", return_value=5):
+        with patch.object(engine._rng, "randint", return_value=5):
             result = engine.interact("goblin", "attack")
         assert result.npc_defeated is True
 
@@ -131,3 +131,97 @@ class TestPersistence:
         e2 = StateEngine.load(path)
         assert e2.character is None
         assert e2.current_location_id is None
+
+
+class TestIncrementalSave:
+    @pytest.fixture
+    def saved(self, engine: StateEngine, tmp_path: Path) -> Path:
+        path = tmp_path / "save.json"
+        engine.save(path)
+        return path
+
+    def test_first_incremental_save_writes_base(self, engine: StateEngine, tmp_path: Path):
+        path = tmp_path / "save.json"
+        assert engine.save_incremental(path) == path
+        assert StateEngine.load(path).current_location_id == "top"
+
+    def test_patch_holds_only_changes(self, engine: StateEngine, saved: Path):
+        engine.world.update_npc("top", "goblin", hp=1)
+        target = engine.save_incremental(saved)
+        assert target == saved.with_name("save.json.p1")
+        patch = json.loads(target.read_text())
+        assert [loc["id"] for loc in patch["locations"]] == ["top"]
+        assert "journeys" not in patch
+        assert "character" not in patch
+        assert "current_location_id" not in patch
+
+    def test_nothing_changed_writes_empty_patch(self, engine: StateEngine, saved: Path):
+        patch = json.loads(engine.save_incremental(saved).read_text())
+        assert set(patch) == {"base_id", "seq"}
+
+    def test_patch_chain_round_trip(self, engine: StateEngine, saved: Path):
+        engine.world.update_npc("top", "goblin", hp=2)
+        engine.save_incremental(saved)
+        with patch.object(engine._rng, "randint", return_value=6):
+            engine.traverse("j_down")
+        engine.world.add_location(Location(id="cave", name="Cave"))
+        engine.world.add_journey(Journey(id="j_cave", from_id="bottom", to_id="cave"))
+        engine.world.remove_journey("j_up")
+        assert engine.save_incremental(saved) == saved.with_name("save.json.p2")
+
+        loaded = StateEngine.load(saved)
+        assert loaded.to_state() == engine.to_state()
+        assert loaded.current_location_id == "bottom"
+        assert loaded.world.get_journey("j_up") is None
+
+    def test_removed_location_stays_removed(self, engine: StateEngine, saved: Path):
+        engine.world.add_location(Location(id="cave", name="Cave"))
+        engine.save_incremental(saved)
+        engine.world.remove_location("cave")
+        engine.save_incremental(saved)
+        assert StateEngine.load(saved).world.get_location("cave") is None
+
+    def test_character_changes_are_saved(self, engine: StateEngine, saved: Path):
+        engine.character.hp = 3
+        patch = json.loads(engine.save_incremental(saved).read_text())
+        assert patch["character"]["hp"] == 3
+        assert StateEngine.load(saved).character.hp == 3
+
+    def test_rng_resumes_after_patch(self, engine: StateEngine, saved: Path):
+        engine.traverse("j_down")
+        engine.save_incremental(saved)
+        loaded = StateEngine.load(saved)
+        assert loaded._rng.random() == engine._rng.random()
+
+    def test_full_save_drops_old_patches(self, engine: StateEngine, saved: Path):
+        engine.world.update_npc("top", "goblin", hp=1)
+        engine.save_incremental(saved)
+        engine.save(saved)
+        assert not saved.with_name("save.json.p1").exists()
+
+    def test_loaded_engine_continues_chain(self, engine: StateEngine, saved: Path):
+        engine.world.update_npc("top", "goblin", hp=1)
+        engine.save_incremental(saved)
+        loaded = StateEngine.load(saved)
+        loaded.world.update_npc("top", "goblin", hp=4)
+        assert loaded.save_incremental(saved) == saved.with_name("save.json.p2")
+        assert StateEngine.load(saved).world.get_location("top").npcs[0].hp == 4
+
+    def test_patches_from_other_base_ignored(self, engine: StateEngine, saved: Path):
+        StateEngine.load(saved).save(saved.with_name("other.json"))
+        engine.world.update_npc("top", "goblin", hp=1)
+        engine.save_incremental(saved).rename(saved.with_name("other.json.p1"))
+        assert StateEngine.load(saved.with_name("other.json")).world.get_location("top").npcs[0].hp == 5
+
+    def test_replaced_world_falls_back_to_full_save(self, engine: StateEngine, saved: Path):
+        world = WorldGraph(region="Elsewhere")
+        world.add_location(Location(id="x", name="X"))
+        engine.world = world
+        engine._current_location_id = "x"
+        assert engine.save_incremental(saved) == saved
+        assert StateEngine.load(saved).world.region == "Elsewhere"
+
+    def test_chain_limit_rewrites_base(self, engine: StateEngine, saved: Path):
+        engine.save_incremental(saved, max_patches=1)
+        assert engine.save_incremental(saved, max_patches=1) == saved
+        assert not saved.with_name("save.json.p1").exists()
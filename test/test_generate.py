@@ -0,0 +1,40 @@
+"""Tests for the synthetic region generator."""
+
+import pytest
+from pathlib import Path
+
+from totm.engine.generate import generate_region, write_region
+from totm.engine.graph import WorldGraph
+from totm.engine.loader import stream_load
+from totm.engine.reachability import ReachabilityIndex
+
+
+class TestGenerateRegion:
+    def test_valid_and_connected(self):
+        g = WorldGraph.from_dict(generate_region(200, seed=1))
+        assert len(g.all_locations()) == 200
+        assert ReachabilityIndex(g).component_count == 1
+
+    def test_deterministic(self):
+        assert generate_region(50, seed=3) == generate_region(50, seed=3)
+        assert generate_region(50, seed=3) != generate_region(50, seed=4)
+
+    @pytest.mark.parametrize("distribution", ["poisson", "uniform", "powerlaw"])
+    def test_mean_degree(self, distribution: str):
+        data = generate_region(2000, seed=0, mean_degree=3.0, degree_distribution=distribution)
+        assert len(data["journeys"]) / 2000 == pytest.approx(3.0, rel=0.25)
+
+    def test_densities_and_vocabulary(self):
+        data = generate_region(2000, seed=0, npc_density=0.5, risk_vocabulary=("Bog", "Fog"))
+        npcs = sum(len(loc["npcs"]) for loc in data["locations"])
+        assert npcs / 2000 == pytest.approx(0.5, rel=0.2)
+        risks = {r for j in data["journeys"] for r in j["risks"]}
+        assert risks <= {"Bog", "Fog"}
+
+    def test_unknown_distribution(self):
+        with pytest.raises(ValueError, match="degree distribution"):
+            generate_region(10, degree_distribution="zipf")
+
+    def test_write_region(self, tmp_path: Path):
+        path = write_region(tmp_path / "gen.json", 100, seed=2)
+        assert stream_load(path).to_dict() == WorldGraph.from_dict(generate_region(100, seed=2)).to_dict()
@@ -85,3 +85,157 @@ class TestWellWorld:
         assert g.get_location("loc_well_bottom") is not None
         exits = g.exits("loc_well_bottom")
         assert len(exits) == 2  # up to top and east to tunnel
+
+
+class TestFrozenGraph:
+    def test_exits_match_mutable(self, sample_graph: WorldGraph):
+        expected = {lid: sample_graph.exits(lid) for lid in ("a", "b", "c", "zzz")}
+        sample_graph.freeze()
+        assert sample_graph.frozen
+        for lid, exits in expected.items():
+            assert sample_graph.exits(lid) == exits
+
+    def test_neighbors(self, sample_graph: WorldGraph):
+        sample_graph.freeze()
+        assert {n.id for n in sample_graph.neighbors("a")} == {"b", "c"}
+        assert sample_graph.neighbors("zzz") == []
+
+    def test_get_journey(self, sample_graph: WorldGraph):
+        sample_graph.freeze()
+        j = sample_graph.get_journey("j_ab")
+        assert j is not None and j.to_id == "b"
+
+    def test_mutation_rejected(self, sample_graph: WorldGraph):
+        sample_graph.freeze()
+        with pytest.raises(RuntimeError, match="frozen"):
+            sample_graph.add_location(Location(id="d", name="D"))
+        with pytest.raises(RuntimeError, match="frozen"):
+            sample_graph.add_journey(Journey(id="j_cb", from_id="c", to_id="b"))
+
+    def test_thaw_restores_authoring(self, sample_graph: WorldGraph):
+        sample_graph.freeze()
+        sample_graph.thaw()
+        assert not sample_graph.frozen
+        sample_graph.add_journey(Journey(id="j_cb", from_id="c", to_id="b"))
+        assert [j.id for j in sample_graph.exits("c")] == ["j_cb"]
+        assert {j.id for j in sample_graph.exits("a")} == {"j_ab", "j_ac"}
+
+    def test_round_trip_while_frozen(self, sample_graph: WorldGraph):
+        sample_graph.freeze()
+        g2 = WorldGraph.from_dict(sample_graph.to_dict())
+        assert len(g2.exits("a")) == 2
+
+
+class TestRemoval:
+    def test_incoming(self, sample_graph: WorldGraph):
+        assert [j.id for j in sample_graph.incoming("a")] == ["j_ba"]
+        assert {j.id for j in sample_graph.incoming("b")} == {"j_ab"}
+        assert sample_graph.incoming("zzz") == []
+
+    def test_incoming_frozen(self, sample_graph: WorldGraph):
+        sample_graph.freeze()
+        assert [j.id for j in sample_graph.incoming("c")] == ["j_ac"]
+        sample_graph.thaw()
+        assert [j.id for j in sample_graph.incoming("c")] == ["j_ac"]
+
+    def test_remove_journey(self, sample_graph: WorldGraph):
+        removed = sample_graph.remove_journey("j_ab")
+        assert removed.id == "j_ab"
+        assert sample_graph.get_journey("j_ab") is None
+        assert [j.id for j in sample_graph.exits("a")] == ["j_ac"]
+        assert sample_graph.incoming("b") == []
+
+    def test_remove_missing_journey(self, sample_graph: WorldGraph):
+        with pytest.raises(ValueError):
+            sample_graph.remove_journey("nope")
+
+    def test_remove_location_drops_incident_journeys(self, sample_graph: WorldGraph):
+        sample_graph.remove_location("b")
+        assert sample_graph.get_location("b") is None
+        assert sample_graph.get_journey("j_ab") is None
+        assert sample_graph.get_journey("j_ba") is None
+        assert [j.id for j in sample_graph.exits("a")] == ["j_ac"]
+        assert sample_graph.incoming("a") == []
+        assert len(sample_graph.to_dict()["journeys"]) == 1
+
+    def test_removal_rejected_while_frozen(self, sample_graph: WorldGraph):
+        sample_graph.freeze()
+        with pytest.raises(RuntimeError):
+            sample_graph.remove_journey("j_ab")
+
+    def test_removal_bumps_version(self, sample_graph: WorldGraph):
+        before = sample_graph.version
+        sample_graph.remove_journey("j_ab")
+        assert sample_graph.version > before
+
+    def test_every_notified_change_bumps_version(self, sample_graph: WorldGraph):
+        events = []
+        sample_graph.add_listener(lambda event, subject: events.append(event))
+        location = sample_graph.all_locations()[0].id
+        changes = [
+            lambda: sample_graph.add_item(location, "coin"),
+            lambda: sample_graph.remove_item(location, "coin"),
+            lambda: sample_graph.set_risk_stats({"stones": "brawn"}),
+        ]
+        for change in changes:
+            before, seen = sample_graph.version, len(events)
+            change()
+            assert sample_graph.version > before
+            assert len(events) > seen
+        assert events[-1] == "set_risk_stats"
+
+
+class TestSecondaryIndexes:
+    @pytest.fixture
+    def graph(self) -> WorldGraph:
+        g = WorldGraph(region="Idx")
+        g.add_location(Location(id="a", name="A", npcs=[NPC(id="goblin", name="Goblin")],
+                                inventory=["rope", "rope"]))
+        g.add_location(Location(id="b", name="B", inventory=["rope", "key"]))
+        g.add_journey(Journey(id="j_ab", from_id="a", to_id="b", risks=["Slippery stones"]))
+        g.add_journey(Journey(id="j_ba", from_id="b", to_id="a", risks=["Steep climb", "Slippery"]))
+        return g
+
+    def test_locate_npc(self, graph: WorldGraph):
+        assert graph.locate_npc("goblin").id == "a"
+        assert graph.locate_npc("dragon") is None
+
+    def test_move_npc(self, graph: WorldGraph):
+        graph.move_npc("goblin", "b")
+        assert graph.locate_npc("goblin").id == "b"
+        assert graph.get_location("a").npcs == []
+        assert [n.id for n in graph.get_location("b").npcs] == ["goblin"]
+
+    def test_update_npc(self, graph: WorldGraph):
+        npc = graph.update_npc("a", "goblin", hp=1)
+        assert npc.hp == 1
+        with pytest.raises(ValueError):
+            graph.update_npc("b", "goblin", hp=1)
+
+    def test_items(self, graph: WorldGraph):
+        assert {l.id for l in graph.locations_with_item("rope")} == {"a", "b"}
+        graph.remove_item("a", "rope")
+        assert {l.id for l in graph.locations_with_item("rope")} == {"a", "b"}
+        graph.remove_item("a", "rope")
+        assert [l.id for l in graph.locations_with_item("rope")] == ["b"]
+        graph.add_item("a", "key")
+        assert {l.id for l in graph.locations_with_item("key")} == {"a", "b"}
+        with pytest.raises(ValueError):
+            graph.remove_item("a", "rope")
+
+    def test_risks(self, graph: WorldGraph):
+        assert {j.id for j in graph.journeys_with_risk("slippery")} == {"j_ab", "j_ba"}
+        assert [j.id for j in graph.journeys_with_risk("Steep Climb")] == ["j_ba"]
+        graph.remove_journey("j_ba")
+        assert [j.id for j in graph.journeys_with_risk("slippery")] == ["j_ab"]
+        assert graph.journeys_with_risk("climb") == []
+
+    def test_remove_location_unindexes(self, graph: WorldGraph):
+        graph.remove_location("a")
+        assert graph.locate_npc("goblin") is None
+        assert [l.id for l in graph.locations_with_item("rope")] == ["b"]
+
+    def test_replacing_location_reindexes(self, graph: WorldGraph):
+        graph.add_location(Location(id="a", name="A2"))
+        assert graph.locate_npc("goblin") is None
+        assert [l.id for l in graph.locations_with_item("rope")] == ["b"]
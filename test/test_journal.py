@@ -0,0 +1,104 @@
+"""Tests for the event-sourced game journal."""
+
+from pathlib import Path
+
+import pytest
+
+from totm.engine.graph import WorldGraph
+from totm.engine.journal import LOG_NAME, SNAPSHOT_NAME, Journal
+from totm.engine.models import Character, CharacterClass
+from totm.engine.store import StateEngine
+from totm.tools.api import ArbiterTools
+
+WELL_PATH = Path(__file__).resolve().parent.parent / "src" / "totm" / "engine" / "worlds" / "well.json"
+
+
+@pytest.fixture
+def engine() -> StateEngine:
+    return StateEngine(WorldGraph.load(WELL_PATH), seed=11)
+
+
+def _play(engine: StateEngine, turns: int = 20) -> None:
+    tools = ArbiterTools(engine)
+    for _ in range(turns):
+        for npc in tools.get_location()["npcs"]:
+            tools.interact(npc["id"], "attack")
+        exits = tools.get_exits()["exits"]
+        if exits:
+            tools.traverse(exits[0]["journey_id"])
+
+
+def _start(engine: StateEngine, directory: Path, **kwargs) -> Journal:
+    journal = Journal.create(engine, directory, **kwargs)
+    engine.set_character(Character.create("Hero", CharacterClass.WARRIOR))
+    engine.set_location("loc_well_top")
+    return journal
+
+
+class TestJournal:
+    def test_load_replays_log(self, engine: StateEngine, tmp_path: Path):
+        journal = _start(engine, tmp_path)
+        _play(engine)
+        journal.sync()
+        loaded = Journal.load(tmp_path)
+        assert loaded.to_state() == engine.to_state()
+
+    def test_records_are_small(self, engine: StateEngine, tmp_path: Path):
+        journal = _start(engine, tmp_path)
+        size = (tmp_path / LOG_NAME).stat().st_size
+        _play(engine, turns=1)
+        journal.sync()
+        added = (tmp_path / LOG_NAME).read_bytes()[size:]
+        assert 0 < len(added) < 400
+
+    def test_compaction(self, engine: StateEngine, tmp_path: Path):
+        journal = _start(engine, tmp_path, snapshot_every=5)
+        _play(engine)
+        journal.sync()
+        lines = (tmp_path / LOG_NAME).read_bytes().splitlines()
+        assert len(lines) < 5
+        assert Journal.load(tmp_path).to_state() == engine.to_state()
+
+    def test_rng_resumes(self, engine: StateEngine, tmp_path: Path):
+        journal = _start(engine, tmp_path)
+        _play(engine, turns=3)
+        journal.sync()
+        loaded = Journal.load(tmp_path)
+        assert [loaded._roll(20) for _ in range(5)] == [engine._roll(20) for _ in range(5)]
+
+    def test_keeps_journaling_after_load(self, engine: StateEngine, tmp_path: Path):
+        journal = _start(engine, tmp_path)
+        journal.close()
+        loaded = Journal.load(tmp_path)
+        _play(loaded, turns=2)
+        loaded.journal.close()
+        assert Journal.load(tmp_path).to_state() == loaded.to_state()
+
+    def test_torn_tail_is_dropped(self, engine: StateEngine, tmp_path: Path):
+        journal = _start(engine, tmp_path)
+        journal.sync()
+        expected = engine.to_state()
+        with (tmp_path / LOG_NAME).open("ab") as fp:
+            fp.write(b'{"seq": 99, "op": "set_loc')
+        assert Journal.load(tmp_path).to_state() == expected
+        assert not (tmp_path / LOG_NAME).read_bytes().endswith(b"set_loc")
+
+    def test_records_already_in_snapshot_are_skipped(self, engine: StateEngine, tmp_path: Path):
+        journal = _start(engine, tmp_path)
+        journal.sync()
+        log = (tmp_path / LOG_NAME).read_bytes()
+        journal.compact()
+        # Crash between snapshot and truncation: the old log is still there
+        (tmp_path / LOG_NAME).write_bytes(log)
+        assert Journal.load(tmp_path).to_state() == engine.to_state()
+
+    def test_snapshot_written_atomically(self, engine: StateEngine, tmp_path: Path):
+        _start(engine, tmp_path)
+        assert (tmp_path / SNAPSHOT_NAME).exists()
+        assert not list(tmp_path.glob("*.tmp"))
+
+    def test_close_detaches(self, engine: StateEngine, tmp_path: Path):
+        journal = _start(engine, tmp_path)
+        journal.close()
+        assert engine.journal is None
+        engine.set_location("loc_well_bottom")  # no error, not journaled
@@ -0,0 +1,100 @@
+"""Tests for the streaming region loader."""
+
+import json
+import pytest
+from pathlib import Path
+
+from totm.engine.graph import WorldGraph
+from unittest.mock import patch
+
+from totm.engine import loader
+from totm.engine.loader import iter_region, read_region, stream_load
+
+WELL_PATH = Path(__file__).resolve().parent.parent / "src" / "totm" / "engine" / "worlds" / "well.json"
+
+
+class TestStreamLoad:
+    @pytest.mark.parametrize("chunk_size", [1, 7, 64, 1 << 16])
+    def test_matches_full_load(self, chunk_size: int):
+        streamed = stream_load(WELL_PATH, chunk_size=chunk_size)
+        assert streamed.to_dict() == WorldGraph.load(WELL_PATH).to_dict()
+
+    def test_progress_reports_bytes(self):
+        calls: list[tuple[int, int]] = []
+        stream_load(WELL_PATH, chunk_size=256, progress=lambda done, total: calls.append((done, total)))
+        total = WELL_PATH.stat().st_size
+        assert calls[-1] == (total, total)
+        assert [c[0] for c in calls] == sorted(c[0] for c in calls)
+
+    def test_journeys_before_locations(self, tmp_path: Path):
+        data = WorldGraph.load(WELL_PATH).to_dict()
+        reordered = {"journeys": data["journeys"], "locations": data["locations"], "region": data["region"]}
+        path = tmp_path / "reordered.json"
+        path.write_text(json.dumps(reordered))
+        g = stream_load(path, chunk_size=32)
+        assert g.region == "Dark Forest"
+        assert len(g.exits("loc_well_bottom")) == 2
+
+    def test_unicode_across_chunks(self, tmp_path: Path):
+        path = tmp_path / "unicode.json"
+        path.write_text(json.dumps({
+            "region": "Forêt Noire",
+            "locations": [{"id": "a", "name": "Château ✨"}],
+            "journeys": [],
+        }, ensure_ascii=False), encoding="utf-8")
+        g = stream_load(path, chunk_size=3)
+        assert g.region == "Forêt Noire"
+        assert g.get_location("a").name == "Château ✨"
+
+    def test_empty_arrays_and_extra_keys(self, tmp_path: Path):
+        path = tmp_path / "empty.json"
+        path.write_text('{"region": "R", "version": 2, "locations": [], "journeys": []}')
+        assert list(iter_region(path)) == [("region", "R"), ("version", 2)]
+
+    def test_malformed(self, tmp_path: Path):
+        path = tmp_path / "bad.json"
+        path.write_text('{"region": "R", "locations": [{"id": "a", "name": "A"}')
+        with pytest.raises(ValueError):
+            stream_load(path, chunk_size=8)
+
+    def test_dangling_journey(self, tmp_path: Path):
+        path = tmp_path / "dangling.json"
+        path.write_text(json.dumps({
+            "region": "R",
+            "locations": [{"id": "a", "name": "A"}],
+            "journeys": [{"id": "j", "from_id": "a", "to_id": "x"}],
+        }))
+        with pytest.raises(ValueError, match="Destination"):
+            stream_load(path)
+
+
+class TestReadRegion:
+    @pytest.mark.parametrize("chunk_size", [1, 5, 1 << 16])
+    def test_skips_values_before_region(self, tmp_path: Path, chunk_size: int):
+        path = tmp_path / "late.json"
+        path.write_text(json.dumps({
+            "locations": [{"id": "a", "name": 'Brackets ]}[{ and "quotes" \\'}],
+            "version": -1.5e3,
+            "flags": [True, None, {"nested": [[], {}]}],
+            "note": "ünïcode ✨",
+            "region": "Late",
+            "journeys": [],
+        }, ensure_ascii=False), encoding="utf-8")
+        parse = loader._JSONStream.value
+        with patch.object(loader._JSONStream, "value", autospec=True, side_effect=parse) as value:
+            assert read_region(path, chunk_size=chunk_size) == "Late"
+        # Only the keys up to "region" and its value were decoded
+        assert value.call_count == 6
+
+    def test_missing_region(self, tmp_path: Path):
+        path = tmp_path / "none.json"
+        path.write_text('{"locations": [], "version": 2}')
+        assert read_region(path) is None
+        path.write_text("{}")
+        assert read_region(path) is None
+
+    def test_unterminated(self, tmp_path: Path):
+        path = tmp_path / "bad.json"
+        path.write_text('{"locations": [{"id": "a"')
+        with pytest.raises(ValueError):
+            read_region(path, chunk_size=4)
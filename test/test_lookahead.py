@@ -0,0 +1,131 @@
+"""Tests for engine forks and the what-if lookahead."""
+
+from unittest.mock import patch
+
+import pytest
+
+from totm.engine.graph import WorldGraph
+from totm.engine.lookahead import Forecast, lookahead
+from totm.engine.models import NPC, Character, CharacterClass, Journey, Location
+from totm.engine.overlay import SessionWorld
+from totm.engine.store import StateEngine, success_probability
+
+
+@pytest.fixture
+def engine() -> StateEngine:
+    g = WorldGraph(region="Test")
+    g.add_location(Location(
+        id="top", name="Top",
+        npcs=[NPC(id="goblin", name="Goblin", hp=8, hostile=True)],
+        inventory=["rope"],
+    ))
+    g.add_location(Location(id="bottom", name="Bottom"))
+    g.add_journey(Journey(id="j_down", from_id="top", to_id="bottom", difficulty=3, risks=["Slippery stones"]))
+    g.add_journey(Journey(id="j_stairs", from_id="top", to_id="bottom", difficulty=1))
+    g.add_journey(Journey(id="j_up", from_id="bottom", to_id="top", difficulty=5, risks=["Climb"]))
+    e = StateEngine(g, seed=11)
+    e.set_character(Character.create("Hero", CharacterClass.WARRIOR))
+    e.set_location("top")
+    return e
+
+
+class TestFork:
+    def test_fork_leaves_parent_untouched(self, engine: StateEngine):
+        before = engine.to_state()
+        fork = engine.fork(seed=1)
+        fork.character.inventory.append("sword")
+        fork.interact("goblin", "attack")
+        fork.traverse("j_stairs")
+        assert engine.to_state() == before
+        assert len(engine.roll_log) == 0
+        assert engine.current_location.npcs[0].hp == 8
+        assert fork.current_location_id == "bottom"
+
+    def test_fork_shares_world_structure(self, engine: StateEngine):
+        fork = engine.fork()
+        assert isinstance(fork.world, SessionWorld)
+        assert fork.world.template is engine.world
+        assert fork.world.get_location("bottom") is engine.world.get_location("bottom")
+        assert fork.journal is None
+
+    def test_fork_of_session_world_keeps_changes(self, engine: StateEngine):
+        first = engine.fork(seed=2)
+        first.world.update_npc("top", "goblin", hp=3)
+        second = first.fork(seed=3)
+        assert second.world.template is engine.world
+        assert second.current_location.npcs[0].hp == 3
+        second.world.update_npc("top", "goblin", hp=1)
+        assert first.current_location.npcs[0].hp == 3
+
+    def test_same_seed_same_play(self, engine: StateEngine):
+        a, b = engine.fork(seed=5), engine.fork(seed=5)
+        assert [a.traverse("j_down").roll for _ in range(5)] == [b.traverse("j_down").roll for _ in range(5)]
+
+
+class TestLookahead:
+    def test_parent_untouched(self, engine: StateEngine):
+        before = engine.to_state()
+        lookahead(engine, [("traverse", "j_down"), ("interact", "goblin", "attack")],
+                  rollouts=50, seed=1, processes=0)
+        assert engine.to_state() == before
+        assert len(engine.roll_log) == 0
+
+    def test_certain_outcome(self, engine: StateEngine):
+        [forecast] = lookahead(engine, [("traverse", "j_stairs")], rollouts=20, seed=1, processes=0)
+        assert forecast.success_rate == 1.0
+        assert forecast.locations == {"bottom": 20}
+        assert forecast.damage == {0: 20}
+        assert forecast.mean_damage == 0.0
+
+    def test_matches_closed_form(self, engine: StateEngine):
+        [forecast] = lookahead(engine, [("traverse", "j_down")], rollouts=4000, seed=2, processes=0)
+        expected = success_probability(engine.character.speed, 3)
+        assert forecast.success_rate == pytest.approx(expected, abs=0.03)
+        assert forecast.outcomes.keys() <= {"success", "failed"}
+        assert sum(forecast.damage.values()) == 4000
+
+    def test_plan_candidate(self, engine: StateEngine):
+        plan = [("interact", "goblin", "attack")] * 10
+        [forecast] = lookahead(engine, [plan], rollouts=30, seed=3, processes=0)
+        assert forecast.plan == plan
+        assert forecast.defeated == 30
+        assert forecast.locations == {"top": 30}
+
+    def test_npc_already_down_is_not_defeated(self, engine: StateEngine):
+        engine.world.update_npc("top", "goblin", hp=0)
+        [forecast] = lookahead(engine, [("interact", "goblin", "attack")], rollouts=20, seed=3, processes=0)
+        assert forecast.defeated == 0
+
+    def test_common_seeds_across_candidates(self, engine: StateEngine):
+        a, b = lookahead(engine, [("traverse", "j_down")] * 2, rollouts=40, seed=4, processes=0)
+        assert a == b
+
+    def test_process_pool_matches_inline(self, engine: StateEngine):
+        candidates = [("traverse", "j_down"), ("interact", "goblin", "attack")]
+        inline = lookahead(engine, candidates, rollouts=60, seed=5, processes=0)
+        pooled = lookahead(engine, candidates, rollouts=60, seed=5, processes=2)
+        assert pooled == inline
+
+    def test_spawn_fallback_matches_inline(self, engine: StateEngine):
+        candidates = [("traverse", "j_down")]
+        inline = lookahead(engine, candidates, rollouts=10, seed=6, processes=0)
+        # Another thread is running: workers must not be forked
+        with patch("totm.engine.lookahead.threading.active_count", return_value=2):
+            spawned = lookahead(engine, candidates, rollouts=10, seed=6, processes=1)
+        assert spawned == inline
+
+    def test_invalid_arguments(self, engine: StateEngine):
+        with pytest.raises(ValueError, match="rollouts"):
+            lookahead(engine, [("traverse", "j_down")], rollouts=0)
+        with pytest.raises(ValueError, match="Empty"):
+            lookahead(engine, [[]], processes=0)
+        with pytest.raises(ValueError, match="Unknown batch action"):
+            lookahead(engine, [("fly", "top")], rollouts=1, processes=0)
+
+    def test_to_dict(self, engine: StateEngine):
+        [forecast] = lookahead(engine, [("traverse", "j_stairs")], rollouts=5, seed=1, processes=0)
+        data = forecast.to_dict()
+        assert data["plan"] == [["traverse", "j_stairs"]]
+        assert data["success_rate"] == 1.0
+        assert data["damage"] == {"0": 5}
+        assert Forecast(plan=[], rollouts=0).success_rate == 0.0
@@ -55,6 +55,18 @@ class TestCharacter:
         assert name == "brawn"
         assert val == 8
 
+    def test_primary_stat_ties_and_order(self):
+        c = Character("T", CharacterClass.MAGE, brawn=3, brains=5, faith=5, speed=4)
+        assert c.primary_stat() == ("brains", 5)
+        c.speed = 6
+        assert c.primary_stat() == ("speed", 6)
+
+    def test_slotted(self):
+        c = Character.create("Test", CharacterClass.WARRIOR)
+        assert not hasattr(c, "__dict__")
+        with pytest.raises(AttributeError):
+            c.luck = 3  # type: ignore[attr-defined]
+
 
 # -- NPC ----------------------------------------------------------------
 
@@ -99,3 +111,16 @@ class TestJourney:
         assert j2.id == "j1"
         assert j2.difficulty == 3
         assert j2.risks == ["Darkness"]
+
+    def test_from_dict_interns_ids(self):
+        raw = json.loads('[{"id": "j1", "from_id": "hall", "to_id": "yard", "risks": ["Darkness"]},'
+                         ' {"id": "j2", "from_id": "yard", "to_id": "hall", "risks": ["Darkness"]}]')
+        a, b = (Journey.from_dict(d) for d in raw)
+        assert a.from_id is b.to_id
+        assert a.risks[0] is b.risks[0]
+
+    def test_from_dict_does_not_alias_input(self):
+        d = {"id": "j1", "from_id": "a", "to_id": "b", "risks": ["Darkness"]}
+        j = Journey.from_dict(d)
+        j.risks.append("Trap")
+        assert d["risks"] == ["Darkness"]
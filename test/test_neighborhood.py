@@ -0,0 +1,104 @@
+"""Tests for WorldGraph.neighborhood and NeighborhoodCache."""
+
+import pytest
+
+from totm.engine.graph import WorldGraph
+from totm.engine.models import Location, Journey, NPC
+from totm.engine.neighborhood import NeighborhoodCache
+from totm.engine.overlay import SessionWorld
+
+
+@pytest.fixture
+def chain() -> WorldGraph:
+    """a -> b -> c -> d, plus b -> a; an orc at c and a key at d."""
+    g = WorldGraph(region="R")
+    for lid in "abcd":
+        g.add_location(Location(id=lid, name=lid.upper()))
+    g.get_location("c").npcs.append(NPC(id="orc", name="Orc", hp=6, hostile=True))
+    g.add_item("d", "key")
+    for a, b in [("a", "b"), ("b", "c"), ("c", "d"), ("b", "a")]:
+        g.add_journey(Journey(id=f"{a}{b}", from_id=a, to_id=b))
+    return g
+
+
+class TestNeighborhoodQuery:
+    def test_depths(self, chain: WorldGraph):
+        hood = chain.neighborhood("a", 2)
+        assert hood.depth == {"a": 0, "b": 1, "c": 2}
+        assert [loc.id for loc in hood.locations] == ["a", "b", "c"]
+        assert {j.id for j in hood.journeys} == {"ab", "bc", "ba"}
+
+    def test_zero_hops(self, chain: WorldGraph):
+        hood = chain.neighborhood("b", 0)
+        assert hood.depth == {"b": 0}
+        assert hood.journeys == []
+
+    def test_unknown_location(self, chain: WorldGraph):
+        with pytest.raises(ValueError):
+            chain.neighborhood("zzz", 1)
+
+    def test_session_world(self, chain: WorldGraph):
+        chain.freeze()
+        session = SessionWorld(chain)
+        session.update_npc("c", "orc", hp=1)
+        hood = session.neighborhood("b", 1)
+        assert next(l for l in hood.locations if l.id == "c").npcs[0].hp == 1
+
+
+class TestNeighborhoodCache:
+    def test_hit(self, chain: WorldGraph):
+        cache = NeighborhoodCache(chain)
+        first = cache.get("a", 2)
+        assert cache.get("a", 2) is first
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_change_inside_invalidates(self, chain: WorldGraph):
+        cache = NeighborhoodCache(chain)
+        first = cache.get("a", 2)
+        chain.update_npc("c", "orc", hp=2)
+        second = cache.get("a", 2)
+        assert second is not first
+        assert second.locations[2].npcs[0].hp == 2
+
+    def test_change_outside_keeps_entry(self, chain: WorldGraph):
+        cache = NeighborhoodCache(chain)
+        first = cache.get("a", 1)
+        chain.remove_item("d", "key")
+        assert cache.get("a", 1) is first
+
+    def test_structural_change_invalidates(self, chain: WorldGraph):
+        cache = NeighborhoodCache(chain)
+        first = cache.get("a", 1)
+        chain.add_journey(Journey(id="ad", from_id="a", to_id="d"))
+        assert len(cache) == 0
+        assert "d" in cache.get("a", 1).depth
+        assert first.depth == {"a": 0, "b": 1}
+
+    def test_lru_bound(self, chain: WorldGraph):
+        cache = NeighborhoodCache(chain, maxsize=2)
+        cache.get("a", 1)
+        cache.get("b", 1)
+        cache.get("a", 1)
+        cache.get("c", 1)
+        assert len(cache) == 2
+        cache.get("a", 1)
+        assert cache.misses == 3  # "b" was evicted, "a" was not
+
+    def test_summarize(self, chain: WorldGraph):
+        cache = NeighborhoodCache(chain, summarize=lambda h: sorted(h.depth))
+        assert cache.get("b", 1) == ["a", "b", "c"]
+
+    def test_session_patches_invalidate(self, chain: WorldGraph):
+        chain.freeze()
+        session = SessionWorld(chain)
+        cache = NeighborhoodCache(session)
+        first = cache.get("b", 1)
+        session.add_item("c", "torch")
+        assert cache.get("b", 1) is not first
+
+    def test_close(self, chain: WorldGraph):
+        cache = NeighborhoodCache(chain)
+        first = cache.get("a", 2)
+        cache.close()
+        chain.update_npc("c", "orc", hp=2)
+        assert cache.get("a", 2) is first
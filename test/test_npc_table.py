@@ -0,0 +1,145 @@
+"""Tests for NPCTable — columnar NPC storage behind Location.npcs."""
+
+import copy
+from unittest.mock import patch
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from totm.engine.graph import WorldGraph
+from totm.engine.models import Character, CharacterClass, Location, Journey, NPC
+from totm.engine.neighborhood import NeighborhoodCache
+from totm.engine.npc_table import DETACHED, NPCList, NPCTable, NPCView
+from totm.engine.store import StateEngine
+
+
+@pytest.fixture
+def world() -> WorldGraph:
+    g = WorldGraph(region="R")
+    g.add_location(Location(id="a", name="A", npcs=[
+        NPC(id="orc", name="Orc", hp=6, hostile=True),
+        NPC(id="monk", name="Monk", hp=4),
+    ]))
+    g.add_location(Location(id="b", name="B", npcs=[NPC(id="rat", name="Rat", hp=1, hostile=True)]))
+    g.add_location(Location(id="c", name="C"))
+    g.add_journey(Journey(id="ab", from_id="a", to_id="b"))
+    return g
+
+
+@pytest.fixture
+def table(world: WorldGraph) -> NPCTable:
+    return NPCTable.attach(world)
+
+
+class TestAttach:
+    def test_columns(self, table: NPCTable):
+        assert len(table) == 3
+        assert table.hp.tolist() == [6, 4, 1]
+        assert table.hostile.tolist() == [True, False, True]
+        assert [table.location_ids[i] for i in table.location] == ["a", "a", "b"]
+
+    def test_location_npcs_are_views(self, world: WorldGraph, table: NPCTable):
+        npcs = world.get_location("a").npcs
+        assert isinstance(npcs, NPCList)
+        assert isinstance(npcs[0], NPCView)
+        assert npcs == [NPC(id="orc", name="Orc", hp=6, hostile=True), NPC(id="monk", name="Monk", hp=4)]
+
+    def test_serialization_unchanged(self, world: WorldGraph):
+        before = world.to_dict()
+        NPCTable.attach(world)
+        assert world.to_dict() == before
+
+    def test_detach(self, world: WorldGraph, table: NPCTable):
+        table.heal(1)
+        table.detach()
+        npcs = world.get_location("a").npcs
+        assert type(npcs) is list
+        assert npcs[0] == NPC(id="orc", name="Orc", hp=7, hostile=True)
+
+
+class TestViews:
+    def test_write_through(self, world: WorldGraph, table: NPCTable):
+        world.update_npc("a", "orc", hp=2)
+        assert table.hp[table.row("orc")] == 2
+
+    def test_move(self, world: WorldGraph, table: NPCTable):
+        world.move_npc("orc", "c")
+        assert [n.id for n in world.get_location("a").npcs] == ["monk"]
+        assert [n.id for n in world.get_location("c").npcs] == ["orc"]
+        assert len(table) == 3  # row reused, not copied
+        assert table.location_ids[table.location[table.row("orc")]] == "c"
+
+    def test_append_plain_npc(self, world: WorldGraph, table: NPCTable):
+        world.get_location("c").npcs.append(NPC(id="bat", name="Bat", hp=2, hostile=True))
+        assert len(table) == 4
+        assert table.count_hostile(where=table.at("c")) == 1
+
+    def test_delete(self, world: WorldGraph, table: NPCTable):
+        del world.get_location("b").npcs[0]
+        assert table.location[2] == DETACHED
+        assert table.count_hostile() == 1
+
+    def test_identical_npcs_are_distinct_rows(self, world: WorldGraph, table: NPCTable):
+        npcs = world.get_location("c").npcs
+        npcs.append(NPC(id="goblin", name="Goblin", hp=3, hostile=True))
+        npcs.append(NPC(id="goblin", name="Goblin", hp=3, hostile=True))
+        first, second = npcs[0], npcs[1]
+        assert first != second
+        assert npcs.index(second) == 1
+        npcs.remove(second)
+        assert [view._row for view in npcs] == [first._row]
+        assert table.location[second._row] == DETACHED
+        # Plain NPCs still match by value
+        assert npcs.index(NPC(id="goblin", name="Goblin", hp=3, hostile=True)) == 0
+
+    def test_replace_gives_plain_npc(self, world: WorldGraph, table: NPCTable):
+        copied = copy.replace(world.get_location("a").npcs[0], hp=1)
+        assert type(copied) is NPC and copied.hp == 1
+        assert table.hp[0] == 6
+
+
+class TestBulk:
+    def test_heal_with_cap(self, table: NPCTable):
+        assert table.heal(3, cap=5) == 3
+        assert table.hp.tolist() == [6, 5, 4]  # orc was already above the cap
+
+    def test_damage_selected(self, table: NPCTable):
+        table.damage(5, where=table.hostile)
+        assert table.hp.tolist() == [1, 4, 0]
+
+    def test_detached_rows_untouched(self, world: WorldGraph, table: NPCTable):
+        world.remove_location("b")
+        table.heal(10)
+        assert table.hp[2] == 1
+        assert world.get_location("a").npcs[0].hp == 16
+
+    def test_hostile_counts(self, table: NPCTable):
+        assert table.hostile_counts().tolist() == [1, 1, 0]
+        table.set_hostile(False, where=table.at("a"))
+        assert table.hostile_counts().tolist() == [0, 1, 0]
+
+    def test_bulk_update_notifies_caches(self, world: WorldGraph, table: NPCTable):
+        cache = NeighborhoodCache(world)
+        near_c = cache.get("c", 0)
+        near_a = cache.get("a", 0)
+        table.heal(1, where=table.at("a"))
+        assert cache.get("c", 0) is near_c
+        assert cache.get("a", 0) is not near_a
+
+    def test_added_location_adopted(self, world: WorldGraph, table: NPCTable):
+        world.add_location(Location(id="d", name="D", npcs=[NPC(id="imp", name="Imp", hostile=True)]))
+        assert isinstance(world.get_location("d").npcs, NPCList)
+        assert table.count_hostile() == 3
+
+
+class TestEngine:
+    def test_interact_unchanged(self, world: WorldGraph, table: NPCTable):
+        engine = StateEngine(world)
+        engine.set_character(Character.create("Hero", CharacterClass.WARRIOR))
+        engine.set_location("a")
+        with patch.object(engine._rng, "randint", return_value=4):
+            result = engine.interact("orc", "attack")
+        assert result.damage_dealt == 4
+        assert table.hp[table.row("orc")] == 2
+        assert engine.interact("monk", "talk").success
@@ -0,0 +1,185 @@
+"""Tests for copy-on-write SessionWorld overlays over shared templates."""
+
+import shutil
+import threading
+import time
+
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+
+from totm.engine.binary import compile_world
+from totm.engine.graph import WorldGraph
+from totm.engine.models import Character, CharacterClass
+from totm.engine import codec
+from totm.engine.overlay import SessionWorld, load_template, template_path
+from totm.engine.store import StateEngine
+
+WELL_PATH = Path(__file__).resolve().parent.parent / "src" / "totm" / "engine" / "worlds" / "well.json"
+
+
+@pytest.fixture
+def template() -> WorldGraph:
+    return load_template(WELL_PATH)
+
+
+class TestLoadTemplate:
+    def test_shared_and_frozen(self, template: WorldGraph):
+        assert load_template(WELL_PATH) is template
+        assert template.frozen
+
+    def test_parsed_once_across_threads(self, tmp_path: Path, monkeypatch):
+        world = tmp_path / "well.json"
+        shutil.copy(WELL_PATH, world)
+        barrier = threading.Barrier(8)
+        loaded = []
+        parsed = []
+        parse = WorldGraph.load
+
+        def slow_parse(path: Path) -> WorldGraph:
+            parsed.append(path)
+            time.sleep(0.05)  # long enough for every thread to ask for it
+            return parse(path)
+
+        monkeypatch.setattr(WorldGraph, "load", slow_parse)
+
+        def load():
+            barrier.wait()
+            loaded.append(load_template(world))
+            template_path(loaded[-1])
+
+        threads = [threading.Thread(target=load) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert parsed == [world.resolve()]
+        assert len({id(t) for t in loaded}) == 1
+
+    def test_template_path(self, template: WorldGraph):
+        assert template_path(template) == WELL_PATH
+        assert template_path(WorldGraph(region="Elsewhere")) is None
+
+    def test_compiled_template(self, tmp_path: Path, template: WorldGraph):
+        path = tmp_path / "well.totm"
+        compile_world(template, path)
+        mapped = load_template(path)
+        session = SessionWorld(mapped)
+        session.update_npc("loc_well_bottom", "goblin_01", hp=1)
+        assert session.locate_npc("goblin_01").npcs[0].hp == 1
+        assert mapped.get_location("loc_well_bottom").npcs[0].hp == 5
+
+
+class TestSessionWorld:
+    def test_reads_fall_through(self, template: WorldGraph):
+        session = SessionWorld(template)
+        assert session.get_location("loc_well_top") is template.get_location("loc_well_top")
+        assert session.exits("loc_well_bottom") == template.exits("loc_well_bottom")
+        assert session.patched_locations == set()
+
+    def test_npc_patch_is_private(self, template: WorldGraph):
+        a, b = SessionWorld(template), SessionWorld(template)
+        version = a.version
+        npc = a.update_npc("loc_well_bottom", "goblin_01", hp=2)
+        assert a.version > version == b.version
+        assert npc.hp == 2
+        assert a.get_location("loc_well_bottom").npcs[0].hp == 2
+        assert b.get_location("loc_well_bottom").npcs[0].hp == 5
+        assert template.get_location("loc_well_bottom").npcs[0].hp == 5
+        assert a.patched_locations == {"loc_well_bottom"}
+
+    def test_items(self, template: WorldGraph):
+        session = SessionWorld(template)
+        session.remove_item("loc_well_top", "frayed_rope")
+        session.add_item("loc_tunnel", "frayed_rope")
+        assert [l.id for l in session.locations_with_item("frayed_rope")] == ["loc_tunnel"]
+        assert template.get_location("loc_well_top").inventory == ["frayed_rope"]
+        with pytest.raises(ValueError):
+            session.remove_item("loc_well_top", "frayed_rope")
+
+    def test_move_npc_keeps_patches(self, template: WorldGraph):
+        session = SessionWorld(template)
+        session.update_npc("loc_well_bottom", "goblin_01", hp=3)
+        session.move_npc("goblin_01", "loc_tunnel")
+        assert session.locate_npc("goblin_01").id == "loc_tunnel"
+        assert session.get_location("loc_well_bottom").npcs == []
+        assert session.get_location("loc_tunnel").npcs[0].hp == 3
+        session.update_npc("loc_tunnel", "goblin_01", hp=1)
+        assert session.get_location("loc_tunnel").npcs[0].hp == 1
+
+    def test_move_npc_to_its_own_location(self, template: WorldGraph):
+        session = SessionWorld(template)
+        session.move_npc("goblin_01", "loc_well_bottom")
+        graph = WorldGraph.from_dict(template.to_dict())
+        graph.move_npc("goblin_01", "loc_well_bottom")
+        ids = [n.id for n in session.get_location("loc_well_bottom").npcs]
+        assert ids == [n.id for n in graph.get_location("loc_well_bottom").npcs] == ["goblin_01"]
+
+    def test_structure_is_read_only(self, template: WorldGraph):
+        with pytest.raises(RuntimeError):
+            SessionWorld(template).remove_journey("j_bottom_to_tunnel")
+
+    def test_to_dict_merges(self, template: WorldGraph):
+        session = SessionWorld(template)
+        session.update_location("loc_tunnel", description="Collapsed.")
+        data = session.to_dict()
+        restored = WorldGraph.from_dict(data)
+        assert restored.get_location("loc_tunnel").description == "Collapsed."
+        assert len(restored.all_journeys()) == len(template.all_journeys())
+
+
+    def test_fork_is_independent(self, template: WorldGraph):
+        session = SessionWorld(template)
+        session.update_npc("loc_well_bottom", "goblin_01", hp=4)
+        session.move_npc("goblin_01", "loc_tunnel")
+        fork = session.fork()
+        assert fork.locate_npc("goblin_01").id == "loc_tunnel"
+        fork.update_npc("loc_tunnel", "goblin_01", hp=1)
+        fork.remove_item("loc_well_top", "frayed_rope")
+        assert session.locate_npc("goblin_01").npcs[-1].hp == 4
+        assert session.get_location("loc_well_top").inventory == ["frayed_rope"]
+        assert fork.template is template
+
+    def test_fork_copies_npc_patches(self, template: WorldGraph):
+        session = SessionWorld(template)
+        session.update_npc("loc_well_bottom", "goblin_01", hp=4)
+        fork = session.fork()
+        fork.update_npc("loc_well_bottom", "goblin_01", hp=1, hostile=True)
+        npc = session.get_location("loc_well_bottom").npcs[0]
+        assert (npc.hp, npc.hostile) == (4, False)
+
+    def test_overlay_round_trip(self, template: WorldGraph):
+        session = SessionWorld(template)
+        session.update_npc("loc_well_bottom", "goblin_01", hp=4)
+        session.move_npc("goblin_01", "loc_tunnel")
+        session.remove_item("loc_well_top", "frayed_rope")
+        session.update_location("loc_tunnel", description="Collapsed.")
+        data = codec.loads(codec.dumps(session.overlay_to_dict()))
+        restored = SessionWorld.from_overlay(template, data)
+        assert restored.template is template
+        assert restored.to_dict() == session.to_dict()
+        assert restored.locate_npc("goblin_01").id == "loc_tunnel"
+        assert restored.patched_locations == session.patched_locations
+        # Only what changed is saved
+        assert set(data["locations"]) == {"loc_well_bottom", "loc_tunnel", "loc_well_top"}
+
+    def test_overlay_for_other_region(self, template: WorldGraph):
+        data = SessionWorld(template).overlay_to_dict()
+        with pytest.raises(ValueError):
+            SessionWorld.from_overlay(WorldGraph(region="Elsewhere"), data)
+
+
+class TestEngineOnSession:
+    def test_attack_and_save(self, template: WorldGraph, tmp_path: Path):
+        engine = StateEngine(SessionWorld(template))
+        engine.set_character(Character.create("Hero", CharacterClass.WARRIOR))
+        engine.set_location("loc_well_bottom")
+        with patch.object(engine._rng, "randint", return_value=2):
+            result = engine.interact("goblin_01", "attack")
+        assert result.damage_dealt == 2
+        assert "HP: 3" in result.message
+        assert template.get_location("loc_well_bottom").npcs[0].hp == 5
+
+        engine.save(tmp_path / "save.json")
+        loaded = StateEngine.load(tmp_path / "save.json")
+        assert loaded.current_location.npcs[0].hp == 3
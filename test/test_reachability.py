@@ -0,0 +1,85 @@
+"""Tests for ReachabilityIndex — SCC condensation and closure queries."""
+
+import pytest
+from pathlib import Path
+
+from totm.engine.graph import WorldGraph
+from totm.engine.models import Location, Journey
+from totm.engine.reachability import ReachabilityIndex
+
+WELL_PATH = Path(__file__).resolve().parent.parent / "src" / "totm" / "engine" / "worlds" / "well.json"
+
+
+def _graph(edges: list[tuple[str, str]], nodes: str = "abcdef") -> WorldGraph:
+    g = WorldGraph(region="R")
+    for lid in nodes:
+        g.add_location(Location(id=lid, name=lid))
+    for a, b in edges:
+        g.add_journey(Journey(id=f"{a}{b}", from_id=a, to_id=b))
+    return g
+
+
+def _brute(g: WorldGraph, a: str) -> set[str]:
+    seen, todo = {a}, [a]
+    while todo:
+        for j in g.exits(todo.pop()):
+            if j.to_id not in seen:
+                seen.add(j.to_id)
+                todo.append(j.to_id)
+    return seen
+
+
+class TestReachabilityIndex:
+    def test_components_and_closure(self):
+        g = _graph([("a", "b"), ("b", "a"), ("b", "c"), ("c", "d"), ("d", "c"), ("e", "a")])
+        idx = ReachabilityIndex(g)
+        assert idx.same_component("a", "b")
+        assert idx.same_component("c", "d")
+        assert not idx.same_component("a", "c")
+        assert idx.can_reach("a", "d")
+        assert not idx.can_reach("d", "a")
+        assert idx.reachable_from("e") == {"e", "a", "b", "c", "d"}
+        assert idx.unreachable_from("a") == {"e", "f"}
+        assert idx.dead_ends() == {"f"}
+
+    def test_well_world(self):
+        idx = ReachabilityIndex(WorldGraph.load(WELL_PATH))
+        assert idx.unreachable_from("loc_well_top") == set()
+        assert idx.is_dead_end("loc_tunnel")
+        assert not idx.can_reach("loc_tunnel", "loc_well_top")
+
+    def test_incremental_add(self):
+        g = _graph([("a", "b")])
+        idx = ReachabilityIndex(g)
+        assert not idx.can_reach("a", "c")
+        g.add_journey(Journey(id="bc", from_id="b", to_id="c"))
+        assert not idx._stale
+        assert idx.can_reach("a", "c")
+        g.add_location(Location(id="z", name="z"))
+        g.add_journey(Journey(id="cz", from_id="c", to_id="z"))
+        assert not idx._stale
+        assert idx.can_reach("a", "z") and idx.is_dead_end("z")
+        assert not idx.is_dead_end("c")
+
+    def test_cycle_and_removal_rebuild(self):
+        g = _graph([("a", "b"), ("b", "c")])
+        idx = ReachabilityIndex(g)
+        g.add_journey(Journey(id="ca", from_id="c", to_id="a"))
+        assert idx.same_component("a", "c")
+        g.remove_journey("bc")
+        assert not idx.can_reach("a", "c")
+        assert idx.can_reach("c", "b")
+        g.remove_location("a")
+        assert not idx.can_reach("c", "b")
+        assert idx.reachable_from("a") == set()
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_matches_brute_force(self, seed: int):
+        import random
+        rng = random.Random(seed)
+        nodes = "abcdefghij"
+        edges = {(rng.choice(nodes), rng.choice(nodes)) for _ in range(15)}
+        g = _graph(sorted(edges), nodes)
+        idx = ReachabilityIndex(g)
+        for a in nodes:
+            assert idx.reachable_from(a) == _brute(g, a)
@@ -0,0 +1,121 @@
+"""Tests for per-engine RNG, roll logs and session record/replay."""
+
+from pathlib import Path
+
+import pytest
+
+from totm.engine.graph import WorldGraph
+from totm.engine.models import Character, CharacterClass
+from totm.engine.store import StateEngine
+from totm.tools.api import ArbiterTools
+from totm.tools.replay import Recording, ReplayError, SessionRecorder, main, replay
+
+WELL_PATH = Path(__file__).resolve().parent.parent / "src" / "totm" / "engine" / "worlds" / "well.json"
+
+
+def _engine(seed: int) -> StateEngine:
+    engine = StateEngine(WorldGraph.load(WELL_PATH), seed=seed)
+    engine.set_character(Character.create("Hero", CharacterClass.WARRIOR))
+    engine.set_location("loc_well_top")
+    return engine
+
+
+def _play(tools: SessionRecorder | ArbiterTools, turns: int = 30) -> None:
+    """Wander the well, attacking whatever is there."""
+    call = tools.call if isinstance(tools, SessionRecorder) else (
+        lambda name, **args: getattr(tools, name)(**args))
+    for _ in range(turns):
+        here = call("get_location")
+        for npc in here["npcs"]:
+            call("interact", npc_id=npc["id"], action="attack")
+        exits = call("get_exits")["exits"]
+        if exits:
+            call("traverse", journey_id=exits[0]["journey_id"])
+    call("get_character")
+
+
+@pytest.fixture
+def recording() -> Recording:
+    recorder = SessionRecorder(ArbiterTools(_engine(seed=7)))
+    _play(recorder)
+    return recorder.recording
+
+
+class TestEngineRNG:
+    def test_same_seed_same_rolls(self):
+        a, b = _engine(seed=3), _engine(seed=3)
+        _play(ArbiterTools(a))
+        _play(ArbiterTools(b))
+        assert a.roll_log.tolist() == b.roll_log.tolist()
+        assert len(a.roll_log) > 0
+
+    def test_sessions_do_not_share_a_stream(self):
+        a, b = _engine(seed=3), _engine(seed=3)
+        b._roll(6)  # another session rolling in between
+        _play(ArbiterTools(a))
+        assert a.roll_log.tolist() == _replayed_rolls(seed=3)
+
+    def test_save_resumes_stream(self, tmp_path: Path):
+        engine = _engine(seed=5)
+        engine._roll(20)
+        engine.save(tmp_path / "save.json")
+        loaded = StateEngine.load(tmp_path / "save.json")
+        assert loaded.seed == 5
+        assert [loaded._roll(20) for _ in range(5)] == [engine._roll(20) for _ in range(5)]
+
+    def test_legacy_save_without_rng(self, tmp_path: Path):
+        state = _engine(seed=5).to_state()
+        del state["rng"]
+        engine = StateEngine.from_state(state)
+        assert 1 <= engine._roll(6) <= 6
+
+
+def _replayed_rolls(seed: int) -> list[int]:
+    engine = _engine(seed)
+    _play(ArbiterTools(engine))
+    return engine.roll_log.tolist()
+
+
+class TestReplay:
+    def test_round_trip_file(self, recording: Recording, tmp_path: Path):
+        recording.save(tmp_path / "session.json")
+        loaded = Recording.load(tmp_path / "session.json")
+        assert loaded.to_dict() == recording.to_dict()
+
+    @pytest.mark.parametrize("rolls", ["log", "seed"])
+    def test_replay_matches(self, recording: Recording, tmp_path: Path, rolls: str):
+        recording.save(tmp_path / "session.json")
+        report = replay(Recording.load(tmp_path / "session.json"), rolls=rolls)
+        assert report.ok, report.divergences
+        assert report.calls == len(recording.calls)
+        assert report.rolls == len(recording.rolls)
+
+    def test_detects_changed_result(self, recording: Recording):
+        traverse = next(c for c in recording.calls if c.tool == "traverse")
+        traverse.result["character_hp"] = "999/999"
+        report = replay(recording)
+        assert [d.tool for d in report.divergences] == ["traverse"]
+
+    def test_detects_changed_roll_in_seed_mode(self, recording: Recording):
+        call = next(c for c in recording.calls if c.rolls)
+        call.rolls[0] = 0
+        report = replay(recording, rolls="seed", stop_on_divergence=True)
+        assert len(report.divergences) == 1
+
+    def test_missing_rolls(self, recording: Recording):
+        for call in recording.calls:
+            call.rolls = []
+        with pytest.raises(ReplayError):
+            replay(recording)
+
+    def test_unknown_tool(self, recording: Recording):
+        recording.calls[0].tool = "_sync_indexes"
+        with pytest.raises(ReplayError):
+            replay(recording)
+
+    def test_cli(self, recording: Recording, tmp_path: Path, capsys):
+        recording.save(tmp_path / "session.json")
+        with pytest.raises(SystemExit) as exc:
+            main([str(tmp_path / "session.json"), "--repeat", "2"])
+        assert exc.value.code == 0
+        assert "calls/s" in capsys.readouterr().out
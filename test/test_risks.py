@@ -0,0 +1,147 @@
+"""Tests for the compiled risk keyword matcher and per-journey stat cache."""
+
+import random
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from totm.engine.binary import compile_world, open_world
+from totm.engine.graph import WorldGraph
+from totm.engine.loader import stream_load
+from totm.engine.models import Character, CharacterClass, Journey, Location
+from totm.engine.overlay import SessionWorld
+from totm.engine.risks import DEFAULT_RISK_STATS, RiskMatcher
+from totm.engine.store import StateEngine
+
+
+def _nested_loop(table: dict[str, str], risks: list[str]) -> str | None:
+    """The original per-traverse scan the matcher replaces."""
+    for risk in risks:
+        for keyword, stat_name in table.items():
+            if keyword in risk.lower():
+                return stat_name
+    return None
+
+
+@pytest.fixture
+def world() -> WorldGraph:
+    g = WorldGraph(region="R")
+    g.add_location(Location(id="a", name="A"))
+    g.add_location(Location(id="b", name="B"))
+    g.add_journey(Journey(id="j", from_id="a", to_id="b", difficulty=3, risks=["Slippery stones"]))
+    return g
+
+
+class TestRiskMatcher:
+    def test_table_order_beats_text_order(self):
+        # "trap" comes first in the text, "darkness" first in the table
+        assert RiskMatcher(DEFAULT_RISK_STATS).match(["A trap in darkness"]) == "brains"
+
+    def test_overlapping_keywords(self):
+        assert RiskMatcher({"rapid": "speed", "trap": "brawn"}).match(["Trapids"]) == "speed"
+
+    def test_first_matching_risk_wins(self):
+        matcher = RiskMatcher(DEFAULT_RISK_STATS)
+        assert matcher.match(["Fog", "Undead", "Slippery"]) == "faith"
+        assert matcher.match(["Fog"]) is None
+        assert matcher.match([]) is None
+
+    def test_case_insensitive_substring(self):
+        assert RiskMatcher(DEFAULT_RISK_STATS).match(["UNCLIMBABLE wall"]) == "brawn"
+
+    def test_agrees_with_nested_loop(self):
+        rng = random.Random(3)
+        words = list(DEFAULT_RISK_STATS) + ["fog", "Mud", "CURSED", "x.y*", "", "climber"]
+        for _ in range(2000):
+            risks = [" ".join(rng.choices(words, k=rng.randint(0, 3))) for _ in range(rng.randint(0, 3))]
+            assert RiskMatcher(DEFAULT_RISK_STATS).match(risks) == _nested_loop(DEFAULT_RISK_STATS, risks)
+
+    def test_keywords_are_literal(self):
+        assert RiskMatcher({"a.b": "faith"}).match(["axb"]) is None
+        assert RiskMatcher({"a.b": "faith"}).match(["A.B"]) == "faith"
+
+    def test_empty_table(self):
+        assert RiskMatcher({}).match(["Slippery"]) is None
+
+    def test_invalid_tables(self):
+        with pytest.raises(ValueError):
+            RiskMatcher({"mud": "luck"})
+        with pytest.raises(ValueError):
+            RiskMatcher({"": "speed"})
+
+
+class TestJourneyStat:
+    def test_resolved_when_added(self, world: WorldGraph):
+        assert world.journey_stat(world.get_journey("j")) == "speed"
+
+    def test_replaced_journey_is_re_resolved(self, world: WorldGraph):
+        world.add_journey(Journey(id="j", from_id="a", to_id="b", risks=["Ancient curse"]))
+        assert world.journey_stat(world.get_journey("j")) == "faith"
+
+    def test_foreign_journey_matched_on_the_spot(self, world: WorldGraph):
+        portal = Journey(id="j", from_id="a", to_id="elsewhere", risks=["Magic gate"])
+        assert world.journey_stat(portal) == "brains"
+
+    def test_traverse_does_no_string_matching(self, world: WorldGraph):
+        engine = StateEngine(world)
+        engine.set_character(Character.create("Hero", CharacterClass.THIEF))
+        engine.set_location("a")
+        with patch.object(RiskMatcher, "match", side_effect=AssertionError("matched on traverse")), \
+                patch.object(engine._rng, "randint", return_value=8):
+            result = engine.traverse("j")
+        assert result.stat_used == "speed"
+
+    def test_custom_table(self, world: WorldGraph):
+        version = world.version
+        world.set_risk_stats({"stones": "brawn"})
+        assert world.journey_stat(world.get_journey("j")) == "brawn"
+        assert world.version > version
+
+    def test_custom_table_round_trips(self, world: WorldGraph, tmp_path: Path):
+        world.set_risk_stats({"stones": "brawn"})
+        path = tmp_path / "w.json"
+        world.save(path)
+        for loaded in (WorldGraph.load(path), stream_load(path)):
+            assert loaded.risk_stats == {"stones": "brawn"}
+            assert loaded.journey_stat(loaded.get_journey("j")) == "brawn"
+
+    def test_custom_table_saved_incrementally(self, world: WorldGraph, tmp_path: Path):
+        engine = StateEngine(world, seed=1)
+        engine.set_character(Character.create("Hero", CharacterClass.THIEF))
+        engine.set_location("a")
+        path = tmp_path / "save.json"
+        engine.save(path)
+        world.set_risk_stats({"stones": "brawn"})
+        assert engine.save_incremental(path) != path
+        loaded = StateEngine.load(path)
+        assert loaded.world.risk_stats == {"stones": "brawn"}
+        assert loaded.world.journey_stat(loaded.world.get_journey("j")) == "brawn"
+
+    def test_default_table_not_written(self, world: WorldGraph):
+        assert "risk_stats" not in world.to_dict()
+
+    def test_frozen_world_rejects_new_table(self, world: WorldGraph):
+        world.freeze()
+        with pytest.raises(RuntimeError):
+            world.set_risk_stats({})
+
+    def test_session_world_uses_template(self, world: WorldGraph):
+        world.set_risk_stats({"stones": "faith"})
+        world.freeze()
+        session = SessionWorld(world)
+        assert session.journey_stat(session.get_journey("j")) == "faith"
+        assert session.risk_stats == {"stones": "faith"}
+
+    def test_compiled_world(self, world: WorldGraph, tmp_path: Path):
+        compile_world(world, tmp_path / "w.totm")
+        mapped = open_world(tmp_path / "w.totm")
+        try:
+            assert mapped.journey_stat(mapped.get_journey("j")) == "speed"
+        finally:
+            mapped.close()
+
+    def test_compiled_world_rejects_custom_table(self, world: WorldGraph, tmp_path: Path):
+        world.set_risk_stats({"stones": "brawn"})
+        with pytest.raises(ValueError):
+            compile_world(world, tmp_path / "w.totm")
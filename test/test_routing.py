@@ -0,0 +1,96 @@
+"""Tests for RoutePlanner — weighted routing over WorldGraph journeys."""
+
+import pytest
+
+from totm.engine.models import Location, Journey
+from totm.engine.graph import WorldGraph
+from totm.engine.routing import RoutePlanner
+from totm.engine.store import expected_damage, success_probability
+
+WARRIOR = (8, 3, 2, 4)  # brawn, brains, faith, speed
+
+
+@pytest.fixture
+def graph() -> WorldGraph:
+    """a -> b -> d is easy; a -> c -> d is short on hops but a hard climb."""
+    g = WorldGraph(region="Routes")
+    for lid in "abcde":
+        g.add_location(Location(id=lid, name=lid.upper()))
+    g.add_journey(Journey(id="j_ab", from_id="a", to_id="b", difficulty=1))
+    g.add_journey(Journey(id="j_bd", from_id="b", to_id="d", difficulty=2))
+    g.add_journey(Journey(id="j_ac", from_id="a", to_id="c", difficulty=1))
+    g.add_journey(Journey(id="j_cd", from_id="c", to_id="d", difficulty=7, risks=["Steep climb"]))
+    g.add_journey(Journey(id="j_de", from_id="d", to_id="e", difficulty=3, risks=["Magic ward"]))
+    return g
+
+
+class TestOdds:
+    def test_success_probability(self):
+        assert success_probability(8, 1) == 1.0
+        assert success_probability(8, 3) == pytest.approx(6 / 8)
+        assert success_probability(3, 9) == 0.0
+        assert success_probability(0, 1) == 1.0
+
+    def test_expected_damage(self):
+        # stat 4, difficulty 3: rolls 1,2 miss for 2 and 1 damage
+        assert expected_damage(4, 3) == pytest.approx(3 / 4)
+        assert expected_damage(8, 1) == 0.0
+        # stat 2, difficulty 5: both rolls miss for 4 and 3 damage
+        assert expected_damage(2, 5) == pytest.approx(7 / 2)
+
+
+class TestRoutePlanner:
+    def test_prefers_safer_path(self, graph: WorldGraph):
+        route = RoutePlanner(graph).route("a", "d", WARRIOR)
+        assert route is not None
+        assert [s.journey.id for s in route.steps] == ["j_ab", "j_bd"]
+        assert route.success_chance == pytest.approx(7 / 8)
+
+    def test_uses_risk_stat(self, graph: WorldGraph):
+        # The climb checks brawn; a mage (brawn 2) cannot pass difficulty 7
+        route = RoutePlanner(graph).route("c", "d", (2, 8, 3, 4))
+        assert route is None
+        route = RoutePlanner(graph).route("c", "d", WARRIOR)
+        assert route is not None
+        assert route.steps[0].stat_used == "brawn"
+
+    def test_unreachable(self, graph: WorldGraph):
+        assert RoutePlanner(graph).route("d", "a", WARRIOR) is None
+
+    def test_same_location(self, graph: WorldGraph):
+        route = RoutePlanner(graph).route("a", "a", WARRIOR)
+        assert route is not None and route.steps == [] and route.cost == 0.0
+
+    def test_unknown_location(self, graph: WorldGraph):
+        with pytest.raises(ValueError):
+            RoutePlanner(graph).route("a", "zzz", WARRIOR)
+
+    def test_astar_matches_dijkstra(self, graph: WorldGraph):
+        planner = RoutePlanner(graph)
+        plain = planner.route("a", "e", WARRIOR)
+        guided = planner.route("a", "e", WARRIOR, heuristic=lambda lid: 0.0 if lid == "e" else 1.0)
+        assert plain is not None and guided is not None
+        assert [s.journey.id for s in guided.steps] == [s.journey.id for s in plain.steps]
+        assert guided.cost == pytest.approx(plain.cost)
+
+    def test_cache_invalidated_on_mutation(self, graph: WorldGraph):
+        planner = RoutePlanner(graph)
+        assert planner.route("d", "a", WARRIOR) is None
+        graph.add_journey(Journey(id="j_da", from_id="d", to_id="a", difficulty=1))
+        route = planner.route("d", "a", WARRIOR)
+        assert route is not None
+        assert [s.journey.id for s in route.steps] == ["j_da"]
+
+    def test_cache_kept_across_content_changes(self, graph: WorldGraph):
+        planner = RoutePlanner(graph)
+        planner.route("a", "e", WARRIOR)
+        graph.add_item("a", "coin")
+        assert len(planner._trees) == 1
+        graph.set_risk_stats({"stones": "brawn"})
+        assert len(planner._trees) == 0
+        planner.close()
+
+    def test_cache_keyed_by_profile(self, graph: WorldGraph):
+        planner = RoutePlanner(graph)
+        assert planner.route("c", "d", WARRIOR) is not None
+        assert planner.route("c", "d", (2, 8, 3, 4)) is None
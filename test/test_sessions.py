@@ -0,0 +1,341 @@
+"""Tests for the multi-session SessionManager."""
+
+import os
+import shutil
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from unittest.mock import patch
+
+from totm.engine import codec
+from totm.engine.atlas import WorldAtlas
+from totm.engine.graph import WorldGraph
+from totm.engine.models import Character, CharacterClass
+from totm.engine.overlay import SessionWorld, load_template
+from totm.engine.store import StateEngine
+from totm.sessions import SessionManager, _save, _session_bytes
+
+WELL_PATH = Path(__file__).resolve().parent.parent / "src" / "totm" / "engine" / "worlds" / "well.json"
+
+
+def new_engine(session_id: str) -> StateEngine:
+    engine = StateEngine(SessionWorld(load_template(WELL_PATH)), seed=len(session_id))
+    engine.set_character(Character.create(session_id, CharacterClass.WARRIOR))
+    engine.set_location("loc_well_top")
+    return engine
+
+
+class FakeAgent:
+    def __init__(self, tools):
+        self.tools = tools
+        self.history = [{"role": "system", "content": "You are the GM."}]
+
+
+@pytest.fixture
+def manager(tmp_path: Path) -> SessionManager:
+    return SessionManager(tmp_path / "sessions", new_engine, new_agent=FakeAgent)
+
+
+def _advance(session) -> None:
+    exits = session.tools.get_exits()["exits"]
+    session.tools.traverse(exits[0]["journey_id"])
+
+
+class TestSessionManager:
+    def test_creates_then_hits(self, manager: SessionManager):
+        with manager.session("a") as s:
+            assert s.engine.character.name == "a"
+        with manager.session("a") as again:
+            assert again is s
+        stats = manager.stats()
+        assert (stats.created, stats.hits, stats.misses) == (1, 1, 0)
+
+    def test_sessions_are_independent(self, manager: SessionManager):
+        with manager.session("a") as a:
+            a.engine.character.hp = 1
+        with manager.session("b") as b:
+            assert b.engine.character.hp == b.engine.character.max_hp
+
+    def test_evicted_session_rehydrates(self, manager: SessionManager):
+        with manager.session("a") as s:
+            _advance(s)
+            s.agent.history.append({"role": "user", "content": "hello"})
+            state = s.engine.to_state()
+        assert manager.evict("a")
+        assert not manager.is_resident("a")
+        assert "a" in manager
+
+        with manager.session("a") as back:
+            assert back.engine.to_state() == state
+            assert back.agent.history[-1]["content"] == "hello"
+        assert manager.stats().misses == 1
+
+    def test_memory_ceiling_evicts_lru(self, tmp_path: Path):
+        probe = SessionManager(tmp_path / "probe", new_engine)
+        with probe.session("x") as s:
+            one = s.nbytes
+        manager = SessionManager(tmp_path / "s", new_engine, max_bytes=int(one * 2.5))
+        for sid in ("a", "b", "c"):
+            with manager.session(sid):
+                pass
+        assert not manager.is_resident("a")
+        assert manager.is_resident("b") and manager.is_resident("c")
+        assert manager.resident_bytes <= manager.max_bytes
+        assert manager.stats().evictions == 1
+
+    def test_pinned_sessions_are_not_evicted(self, tmp_path: Path):
+        manager = SessionManager(tmp_path / "s", new_engine, max_bytes=1)
+        a = manager.acquire("a")
+        with manager.session("b"):
+            assert manager.is_resident("a")
+        assert manager.is_resident("a")
+        manager.release(a)
+        assert not manager.is_resident("a")
+        with pytest.raises(RuntimeError):
+            manager.release(a)
+
+    def test_evicting_in_use_session_raises(self, manager: SessionManager):
+        manager.acquire("a")
+        with pytest.raises(RuntimeError):
+            manager.evict("a")
+
+    def test_rehydrates_over_shared_template(self, manager: SessionManager):
+        with manager.session("a") as s:
+            _advance(s)
+            s.engine.world.update_npc("loc_well_bottom", "goblin_01", hp=1)
+            state = s.engine.to_state()
+        manager.evict("a")
+        saved = codec.read_json(manager.directory / "a" / "overlay.json")
+        assert set(saved["overlay"]["locations"]) | set(saved["overlay"]["npcs"]) == {"loc_well_bottom"}
+        assert not (manager.directory / "a" / "save.json").exists()
+        with manager.session("a") as s:
+            assert isinstance(s.engine.world, SessionWorld)
+            assert s.engine.world.template is load_template(WELL_PATH)
+            assert s.engine.to_state() == state
+
+    def test_reevict_writes_patch(self, tmp_path: Path):
+        # Sessions over a private world save it whole, then in patches
+        def private_engine(session_id: str) -> StateEngine:
+            engine = new_engine(session_id)
+            engine.world = WorldGraph.from_dict(engine.world.to_dict())
+            return engine
+
+        manager = SessionManager(tmp_path / "s", private_engine)
+        with manager.session("a"):
+            pass
+        manager.evict("a")
+        with manager.session("a") as s:
+            _advance(s)
+            state = s.engine.to_state()
+        manager.evict("a")
+        path = manager.directory / "a" / "save.json"
+        assert path.with_name("save.json.p1").exists()
+        with manager.session("a") as s:
+            assert s.engine.to_state() == state
+
+    def test_memory_report(self, manager: SessionManager):
+        for sid in ("a", "b"):
+            with manager.session(sid):
+                pass
+        report = manager.memory()
+        assert set(report) == {"a", "b"}
+        assert all(n > 0 for n in report.values())
+        assert sum(report.values()) == manager.resident_bytes
+
+    def test_release_does_not_rewalk(self, manager: SessionManager):
+        with patch("totm.sessions._session_bytes", wraps=_session_bytes) as walk:
+            for _ in range(3):
+                with manager.session("a") as s:
+                    _advance(s)
+        assert walk.call_count == 1
+
+    def test_estimate_follows_changes(self, manager: SessionManager):
+        with manager.session("a") as s:
+            opened = s.nbytes
+            for i in range(20):
+                s.engine.world.add_item("loc_tunnel", f"pebble_{i}")
+                s.agent.history.append({"role": "user", "content": "hello " * i})
+            _advance(s)
+        assert s.nbytes > opened
+        assert s.nbytes == manager.resident_bytes
+        assert s.nbytes == pytest.approx(_session_bytes(s), rel=0.15)
+
+    def test_replaced_world_is_remeasured(self, manager: SessionManager):
+        with manager.session("a") as s:
+            overlay = s.nbytes
+            s.engine.world = WorldGraph.from_dict(s.engine.world.to_dict())
+        assert s.nbytes > overlay
+        assert s.nbytes == manager.resident_bytes
+
+    def test_template_not_counted(self, manager: SessionManager):
+        with manager.session("a") as s:
+            overlay = s.nbytes
+            # The same world, no longer behind an overlay, counts in full
+            s.engine.world = load_template(WELL_PATH)
+            assert _session_bytes(s) > overlay
+
+    def test_close_writes_everything(self, manager: SessionManager):
+        for sid in ("a", "b"):
+            with manager.session(sid):
+                pass
+        manager.close()
+        stats = manager.stats()
+        assert (stats.resident, stats.sessions) == (0, 2)
+
+    def test_drop(self, manager: SessionManager):
+        with manager.session("a"):
+            pass
+        manager.evict("a")
+        manager.drop("a")
+        assert "a" not in manager
+
+    def test_dropping_in_use_session_raises(self, manager: SessionManager):
+        session = manager.acquire("a")
+        with pytest.raises(RuntimeError):
+            manager.drop("a")
+        assert manager.is_resident("a")
+        manager.release(session)
+        manager.drop("a")
+        assert "a" not in manager
+
+    def test_drop_waits_for_write_out(self, manager: SessionManager):
+        with manager.session("a"):
+            pass
+        writing, resume = threading.Event(), threading.Event()
+
+        def slow_save(engine, path):
+            writing.set()
+            assert resume.wait(5)
+            _save(engine, path)
+
+        with patch("totm.sessions._save", side_effect=slow_save):
+            evicting = threading.Thread(target=manager.evict, args=("a",))
+            evicting.start()
+            assert writing.wait(5)
+            dropping = threading.Thread(target=manager.drop, args=("a",))
+            dropping.start()
+            dropping.join(timeout=0.2)
+            assert dropping.is_alive()
+            resume.set()
+            evicting.join(timeout=5)
+            dropping.join(timeout=5)
+        # The write finished first, and the drop removed what it wrote
+        assert not (manager.directory / "a").exists()
+
+    def test_disk_io_outside_manager_lock(self, manager: SessionManager):
+        with manager.session("a") as a:
+            _advance(a)
+            state = a.engine.to_state()
+        writing, resume = threading.Event(), threading.Event()
+
+        def slow_save(engine, path):
+            writing.set()
+            assert resume.wait(5)
+            _save(engine, path)
+
+        with patch("totm.sessions._save", side_effect=slow_save):
+            evicting = threading.Thread(target=manager.evict, args=("a",))
+            evicting.start()
+            assert writing.wait(5)
+            # Other sessions and reports don't wait for the write
+            with manager.session("b"):
+                pass
+            assert manager.stats().sessions == 2
+            assert "a" in manager
+            # The session being written waits for it, then loads what was written
+            reloading = threading.Thread(target=lambda: manager.release(manager.acquire("a")))
+            reloading.start()
+            reloading.join(timeout=0.2)
+            assert reloading.is_alive()
+            resume.set()
+            evicting.join(timeout=5)
+            reloading.join(timeout=5)
+        assert not reloading.is_alive()
+        with manager.session("a") as a:
+            assert a.engine.to_state() == state
+        assert manager.stats().misses == 1
+
+    def test_failed_write_keeps_session(self, manager: SessionManager):
+        with manager.session("a") as a:
+            pass
+        with patch("totm.sessions._save", side_effect=OSError("disk full")):
+            with pytest.raises(OSError):
+                manager.evict("a")
+        assert manager.is_resident("a")
+        assert manager.resident_bytes == a.nbytes
+        with manager.session("a") as again:
+            assert again is a
+
+    def test_evicted_session_leaves_atlas(self, tmp_path: Path):
+        world = tmp_path / "regions"
+        world.mkdir()
+        shutil.copy(WELL_PATH, world / "well.json")
+        atlas = WorldAtlas.from_directory(world, memory_budget=1)
+        region = atlas.regions()[0]
+
+        def engine_in_atlas(session_id: str) -> StateEngine:
+            engine = StateEngine(WorldGraph(region="Nowhere"), seed=len(session_id))
+            engine.set_character(Character.create(session_id, CharacterClass.WARRIOR))
+            atlas.enter(engine, region, "loc_well_top")
+            return engine
+
+        manager = SessionManager(tmp_path / "sessions", engine_in_atlas, atlas=atlas)
+        for session_id in ("a", "b"):
+            with manager.session(session_id):
+                pass
+        manager.evict("a")
+        assert atlas.is_loaded(region)
+        manager.drop("b")
+        assert not atlas.is_loaded(region)
+
+    @pytest.mark.parametrize("bad", ["", "..", "a/b", "x" * 200])
+    def test_invalid_session_id(self, manager: SessionManager, bad: str):
+        with pytest.raises(ValueError):
+            manager.acquire(bad)
+
+
+class TestSharedTemplate:
+    def test_sessions_on_threads_share_fresh_template(self, tmp_path: Path):
+        world = tmp_path / "well.json"
+        shutil.copy(WELL_PATH, world)
+        os.utime(world, (1, time.time() + 10))  # a template no test has loaded yet
+
+        def engine_over_copy(session_id: str) -> StateEngine:
+            engine = StateEngine(SessionWorld(load_template(world)), seed=len(session_id))
+            engine.set_character(Character.create(session_id, CharacterClass.WARRIOR))
+            engine.set_location("loc_well_top")
+            return engine
+
+        manager = SessionManager(tmp_path / "sessions", engine_over_copy)
+        templates = []
+        barrier = threading.Barrier(8)
+        errors: list[BaseException] = []
+
+        def play(i: int):
+            try:
+                barrier.wait()
+                for round in range(5):
+                    session_id = f"s{i}_{round % 2}"
+                    with manager.session(session_id) as s:
+                        templates.append(s.engine.world.template)
+                    manager.evict(session_id)
+            except BaseException as exc:  # noqa: BLE001 - reported below
+                errors.append(exc)
+
+        threads = [threading.Thread(target=play, args=(i,)) for i in range(8)]
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)  # switch threads inside the cache, if it lets them
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(interval)
+        assert errors == []
+        assert len({id(t) for t in templates}) == 1
+        # Every session was saved as an overlay of that template
+        assert all((p / "overlay.json").exists() for p in (tmp_path / "sessions").iterdir())
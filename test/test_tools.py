@@ -63,6 +63,25 @@ class TestGetExits:
         assert ex["destination_name"] == "Well Bottom"
         assert ex["difficulty"] == 3
 
+    def test_exit_odds_hint(self, tools: ArbiterTools):
+        ex = tools.get_exits()["exits"][0]
+        # Slippery stones -> speed 4 vs difficulty 3: rolls 3-4 pass, 1-2 deal 2 or 1
+        assert ex["success_chance"] == 0.5
+        assert ex["expected_damage"] == 0.75
+
+    def test_exit_odds_follow_journey_changes(self, tools: ArbiterTools):
+        tools.get_exits()
+        world = tools.engine.world
+        world.add_journey(Journey(id="j_down", from_id="top", to_id="bottom", difficulty=9))
+        ex = tools.get_exits()["exits"][0]
+        assert ex["success_chance"] == 0.0
+
+    def test_exit_odds_without_character(self, tools: ArbiterTools):
+        tools.engine.set_character(None)  # type: ignore[arg-type]
+        ex = tools.get_exits()["exits"][0]
+        assert ex["success_chance"] is None
+        assert ex["expected_damage"] is None
+
     def test_no_location_returns_error(self):
         g = WorldGraph(region="T")
         e = StateEngine(g)
@@ -73,14 +92,14 @@ class TestGetExits:
 
 class TestTraverse:
     def test_success(self, tools: ArbiterTools):
-        with patch("totm.engine.store.random.randint", return_value=8):
+        with patch.object(tools._engine._rng, "randint", return_value=8):
             result = tools.traverse("j_down")
         assert result["success"] is True
         assert result["new_location_name"] == "Well Bottom"
         assert result["character_hp"] == "12/12"
 
     def test_failure(self, tools: ArbiterTools):
-        with patch("totm.engine.store.random.randint", return_value=1):
+        with patch.object(tools._engine._rng, "randint", return_value=1):
             result = tools.traverse("j_down")
         assert result["success"] is False
         assert result["damage"] == 2
@@ -95,7 +114,7 @@ class TestInteract:
         assert "conversation" in result["message"]
 
     def test_attack(self, tools: ArbiterTools):
-        with patch("totm.engine.store.random.randint", return_value=5):
+        with patch.object(tools._engine._rng, "randint", return_value=5):
             result = tools.interact("goblin", "attack")
         assert result["success"] is True
         assert result["damage_dealt"] == 5
@@ -140,6 +159,32 @@ class TestGetCharacter:
         assert result["error"] is True
 
 
+class TestRewind:
+    def test_takes_back_a_turn(self, tools: ArbiterTools):
+        from totm.engine.undo import UndoLog
+
+        UndoLog(tools.engine)
+        tools.engine.undo_log.mark()
+        with patch.object(tools.engine._rng, "randint", return_value=3):
+            tools.traverse("j_down")
+        result = tools.rewind()
+        assert result["changes_reverted"] == 1
+        assert result["location_id"] == "top"
+        assert result["character_hp"] == "12/12"
+        assert tools.rewind()["message"] == "Nothing to take back."
+
+    def test_without_undo_log(self, tools: ArbiterTools):
+        result = tools.rewind()
+        assert result["error"] is True
+        assert result["tool"] == "rewind"
+
+    def test_bad_turns(self, tools: ArbiterTools):
+        from totm.engine.undo import UndoLog
+
+        UndoLog(tools.engine)
+        assert tools.rewind(0)["error"] is True
+
+
 class TestIntegration:
     """End-to-end: create character, check location, traverse, interact."""
 
@@ -153,7 +198,7 @@ class TestIntegration:
         assert len(exits["exits"]) == 1
 
         # Traverse down
-        with patch("totm.engine.store.random.randint", return_value=8):
+        with patch.object(tools._engine._rng, "randint", return_value=8):
             result = tools.traverse("j_down")
         assert result["success"] is True
 
@@ -164,3 +209,64 @@ class TestIntegration:
         # No exits from bottom (no journeys defined from bottom)
         exits2 = tools.get_exits()
         assert len(exits2["exits"]) == 0
+
+
+class TestPlanRoute:
+    def test_route_to_bottom(self, tools: ArbiterTools):
+        result = tools.plan_route("bottom")
+        assert result["reachable"] is True
+        assert [s["journey_id"] for s in result["steps"]] == ["j_down"]
+        assert result["steps"][0]["stat_used"] == "speed"
+        assert result["steps"][0]["success_chance"] == 0.5
+
+    def test_unreachable(self, tools: ArbiterTools):
+        tools._engine.set_location("bottom")
+        result = tools.plan_route("top")
+        assert result["reachable"] is False
+
+    def test_unknown_destination(self, tools: ArbiterTools):
+        result = tools.plan_route("nowhere")
+        assert result["error"] is True
+
+    def test_unreachable_after_collapse(self, tools: ArbiterTools):
+        assert tools.plan_route("bottom")["reachable"] is True
+        tools._engine.world.remove_journey("j_down")
+        assert tools.plan_route("bottom")["reachable"] is False
+
+
+class TestLocate:
+    def test_npc(self, tools: ArbiterTools):
+        result = tools.locate("goblin")
+        assert result["kind"] == "npc"
+        assert result["locations"] == [{"id": "top", "name": "Well Top"}]
+
+    def test_item(self, tools: ArbiterTools):
+        result = tools.locate("rope")
+        assert result["kind"] == "item"
+        assert [l["id"] for l in result["locations"]] == ["top"]
+
+    def test_nothing(self, tools: ArbiterTools):
+        result = tools.locate("dragon")
+        assert result["kind"] == ""
+        assert result["locations"] == []
+
+
+class TestGetNeighborhood:
+    def test_contents(self, tools: ArbiterTools):
+        result = tools.get_neighborhood(1)
+        assert result["location_id"] == "top"
+        assert [(l["id"], l["depth"]) for l in result["locations"]] == [("top", 0), ("bottom", 1)]
+        assert result["locations"][0]["npcs"][0]["id"] == "goblin"
+        assert result["journeys"][0]["journey_id"] == "j_down"
+        assert result["journeys"][0]["destination_name"] == "Well Bottom"
+
+    def test_refreshed_after_attack(self, tools: ArbiterTools):
+        before = tools.get_neighborhood()
+        assert tools.get_neighborhood() is before
+        with patch.object(tools._engine._rng, "randint", return_value=20):
+            tools.interact("goblin", "attack")
+        after = tools.get_neighborhood()
+        assert after["locations"][0]["npcs"][0]["hp"] < 5
+
+    def test_k_out_of_range(self, tools: ArbiterTools):
+        assert tools.get_neighborhood(9)["error"] is True
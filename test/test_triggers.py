@@ -30,6 +30,13 @@ class TestTriggerParser:
         assert p.parse("exits").tool == "get_exits"
         assert p.parse("directions").tool == "get_exits"
     
+    def test_rewind(self):
+        p = TriggerParser()
+        assert p.parse("undo").tool == "rewind"
+        assert p.parse("undo").args == {}
+        assert p.parse("/rewind 3").args == {"turns": "3"}
+        assert p.parse("undo the spell") is None
+
     def test_narrative_input(self):
         p = TriggerParser()
         assert p.parse("I climb down the well") is None
@@ -0,0 +1,221 @@
+"""Tests for the UndoLog — inverse changes, turns, bounds and spill."""
+
+import random
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from totm.engine.graph import WorldGraph
+from totm.engine.journal import Journal
+from totm.engine.models import NPC, Character, CharacterClass, Journey, Location
+from totm.engine.overlay import SessionWorld
+from totm.engine.store import StateEngine
+from totm.engine.undo import UndoLog
+
+ACTIONS = [
+    ("traverse", "j_down"), ("traverse", "j_up"),
+    ("interact", "goblin", "attack"), ("interact", "goblin", "talk"),
+]
+
+
+def build_world() -> WorldGraph:
+    g = WorldGraph(region="Test")
+    g.add_location(Location(
+        id="top", name="Top",
+        npcs=[NPC(id="goblin", name="Goblin", hp=50, hostile=True)],
+    ))
+    g.add_location(Location(id="bottom", name="Bottom"))
+    g.add_journey(Journey(id="j_down", from_id="top", to_id="bottom", difficulty=3, risks=["Slippery stones"]))
+    g.add_journey(Journey(id="j_up", from_id="bottom", to_id="top", difficulty=5, risks=["Climb"]))
+    return g
+
+
+@pytest.fixture
+def engine() -> StateEngine:
+    e = StateEngine(build_world(), seed=3)
+    e.set_character(Character.create("Hero", CharacterClass.WARRIOR))
+    e.set_location("top")
+    UndoLog(e)
+    return e
+
+
+def _play(engine: StateEngine, turns: int, seed: int = 0) -> None:
+    rng = random.Random(seed)
+    for _ in range(turns):
+        engine.undo_log.mark()
+        engine.apply_actions([rng.choice(ACTIONS) for _ in range(rng.randint(1, 3))])
+
+
+class TestUndo:
+    def test_traverse_success(self, engine: StateEngine):
+        with patch.object(engine._rng, "randint", return_value=3):
+            engine.traverse("j_down")
+        assert engine.undo() == 1
+        assert engine.current_location_id == "top"
+        # The dice stay rolled
+        assert len(engine.roll_log) == 1
+
+    def test_traverse_failure(self, engine: StateEngine):
+        with patch.object(engine._rng, "randint", return_value=1):
+            engine.traverse("j_down")
+        assert engine.character.hp == 10
+        engine.undo()
+        assert engine.character.hp == 12
+
+    def test_attack(self, engine: StateEngine):
+        with patch.object(engine._rng, "randint", return_value=2):
+            engine.interact("goblin", "attack")
+        assert (engine.current_location.npcs[0].hp, engine.character.hp) == (48, 10)
+        engine.undo()
+        assert (engine.current_location.npcs[0].hp, engine.character.hp) == (50, 12)
+
+    def test_talk_is_not_a_change(self, engine: StateEngine):
+        engine.interact("goblin", "talk")
+        assert engine.undo_log.depth == 0
+        assert engine.undo() == 0
+
+    def test_set_character_and_location(self, engine: StateEngine):
+        hero = engine.character
+        engine.set_character(Character.create("Other", CharacterClass.MAGE))
+        engine.set_location("bottom")
+        assert engine.undo(2) == 2
+        assert engine.current_location_id == "top"
+        assert engine.character == hero
+
+    def test_back_to_empty_engine(self):
+        engine = StateEngine(build_world(), seed=1)
+        UndoLog(engine)
+        engine.set_character(Character.create("Hero", CharacterClass.WARRIOR))
+        engine.set_location("top")
+        assert engine.undo(5) == 2
+        assert engine.character is None
+        assert engine.current_location_id is None
+
+    def test_undo_everything_restores_start(self, engine: StateEngine):
+        start = engine.to_state()
+        start.pop("rng")
+        _play(engine, 40)
+        engine.undo(10**6)
+        state = engine.to_state()
+        state.pop("rng")
+        assert state == start
+
+    def test_session_world(self):
+        engine = StateEngine(SessionWorld(build_world()), seed=2)
+        engine.set_character(Character.create("Hero", CharacterClass.WARRIOR))
+        engine.set_location("top")
+        UndoLog(engine)
+        engine.interact("goblin", "attack")
+        engine.undo()
+        assert engine.current_location.npcs[0].hp == 50
+
+    def test_without_undo_log(self):
+        with pytest.raises(RuntimeError, match="No undo log"):
+            StateEngine(build_world()).undo()
+
+
+class TestRewind:
+    def test_rewinds_whole_turns(self, engine: StateEngine):
+        engine.undo_log.mark()
+        engine.set_location("bottom")
+        engine.undo_log.mark()
+        engine.set_location("top")
+        engine.set_location("bottom")
+        assert engine.rewind() == 2
+        assert engine.current_location_id == "bottom"
+        assert engine.rewind() == 1
+        assert engine.current_location_id == "top"
+
+    def test_empty_turns_dont_count(self, engine: StateEngine):
+        engine.undo_log.mark()
+        engine.set_location("bottom")
+        engine.undo_log.mark()
+        engine.interact("goblin", "talk")
+        engine.undo_log.mark()
+        assert engine.rewind(1) == 1
+        assert engine.current_location_id == "top"
+
+    def test_matches_state_before_turn(self, engine: StateEngine):
+        _play(engine, 10, seed=1)
+        before = engine.to_state()
+        _play(engine, 3, seed=2)
+        engine.rewind(3)
+        after = engine.to_state()
+        before.pop("rng"), after.pop("rng")
+        assert after == before
+
+
+class TestBounds:
+    def test_drops_oldest_without_spill(self, engine: StateEngine):
+        log = UndoLog(engine, limit=10)
+        for _ in range(30):
+            engine.set_location("bottom")
+            engine.set_location("top")
+        assert len(log._entries) <= 10
+        assert log.dropped + log.depth == 60
+        depth = log.depth
+        assert engine.undo(100) == depth
+        assert log.depth == 0
+
+    def test_spill_round_trip(self, engine: StateEngine, tmp_path: Path):
+        spill = tmp_path / "undo.log"
+        log = UndoLog(engine, limit=8, spill=spill)
+        start = engine.to_state()
+        start.pop("rng")
+        _play(engine, 60, seed=3)
+        assert len(log._entries) <= 8
+        assert spill.stat().st_size > 0
+        assert log.dropped == 0
+
+        engine.undo(log.depth)
+        state = engine.to_state()
+        state.pop("rng")
+        assert state == start
+        assert spill.stat().st_size == 0
+
+    def test_spill_rewind_crosses_chunks(self, engine: StateEngine, tmp_path: Path):
+        log = UndoLog(engine, limit=4, spill=tmp_path / "undo.log")
+        for i in range(20):
+            log.mark()
+            engine.set_location("bottom" if i % 2 == 0 else "top")
+        before = log.depth
+        assert engine.rewind(15) == 15
+        assert log.depth == before - 15
+        assert engine.current_location_id == "bottom"
+
+    def test_clear_and_close(self, engine: StateEngine, tmp_path: Path):
+        spill = tmp_path / "undo.log"
+        log = UndoLog(engine, limit=4, spill=spill)
+        _play(engine, 10)
+        log.clear()
+        assert log.depth == 0
+        assert engine.undo() == 0
+        log.close()
+        assert engine.undo_log is None
+        assert not spill.exists()
+
+    def test_invalid_limit(self, engine: StateEngine):
+        with pytest.raises(ValueError):
+            UndoLog(engine, limit=1)
+
+
+class TestPersistence:
+    def test_reverts_are_journaled(self, engine: StateEngine, tmp_path: Path):
+        Journal.create(engine, tmp_path / "journal")
+        _play(engine, 10, seed=4)
+        engine.rewind(4)
+        engine.undo(2)
+        engine.journal.close()
+        loaded = Journal.load(tmp_path / "journal")
+        loaded.journal.close()
+        assert loaded.to_state() == engine.to_state()
+
+    def test_reverts_are_saved(self, engine: StateEngine, tmp_path: Path):
+        path = tmp_path / "save.json"
+        engine.save(path)
+        _play(engine, 5, seed=5)
+        engine.save_incremental(path)
+        engine.rewind(3)
+        engine.save_incremental(path)
+        assert StateEngine.load(path).to_state() == engine.to_state()